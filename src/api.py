@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -5,44 +7,71 @@ from fastapi import FastAPI
 
 
 from . import dependencies
+from .compression import CompressionMiddleware
 from .routes.router import router as api_router
 from .core.logger import LoggerFactory
 from .config import config_manager
 from .database.repository import DatabaseRepository
-from .database.seeders import seed_predict_tasks, seed_datasets, seed_mlmodels
+from .database.seeders import seed_database
+from .inference_pool import get_inference_pool
+from .model_watcher import ModelWatcher
 
 app_logger = LoggerFactory.get_logger("APP")
 
 
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):
+    watcher_task = None
     try:
         # Проверим подключчение к базе данных
         async with dependencies.get_database_session_builder().get_async_session() as session:
             await DatabaseRepository(session).ping()
         # Заполним базу данных начальными значениями
-        sc = config_manager.seeding_config
         async with dependencies.get_database_session_builder().get_async_session() as session:
-            for seeder, config_path in (
-                (seed_predict_tasks, sc.predict_tasks_seeding_config),
-                (seed_datasets, sc.datasets_seeding_config),
-                (seed_mlmodels, sc.mlmodels_seeding_config),
-            ):
-                await seeder(config_path, session=session)
+            await seed_database(session)
+        # Запустим пул процессов выполнения предсказаний или подключимся к пулу, запущенному другим процессом
+        if config_manager.inference_config.workers > 0:
+            if config_manager.inference_config.external:
+                await get_inference_pool().connect()
+            else:
+                await get_inference_pool().start()
+        # Запустим отслеживание изменений весов моделей и файлов автозаполнения
+        if config_manager.cache_config.model_watch_interval > 0:
+            watcher_task = asyncio.create_task(ModelWatcher().run())
         yield
     finally:
         # Остановка приложения
-        pass
+        if watcher_task is not None:
+            watcher_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await watcher_task
+        if get_inference_pool().running:
+            await get_inference_pool().stop()
 
 
 app = FastAPI(openapi_url="/api/v1/openapi.json", lifespan=lifespan)
 app.include_router(api_router, prefix=config_manager.api_config.prefix)
 
+compression_config = config_manager.compression_config
+if compression_config.enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=compression_config.minimum_size,
+        offload_size=compression_config.offload_size,
+        levels={
+            "gzip": compression_config.gzip_level,
+            "zstd": compression_config.zstd_level,
+            "br": compression_config.brotli_quality,
+        },
+        encodings=compression_config.encodings,
+    )
+
 
 if __name__ == "__main__":
     uvicorn.run(
         f"{__name__}:app",
         host=config_manager.run_config.host,
         port=config_manager.run_config.port,
+        loop=config_manager.run_config.loop,
         log_level="info",
     )
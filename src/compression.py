@@ -0,0 +1,240 @@
+"""
+Сжатие ответов API с согласованием способа сжатия по заголовку `Accept-Encoding`.
+
+Поддерживаются zstd, brotli и gzip. Сжимаются только
+текстовые ответы (JSON, .csv и т.п.) не меньше порогового размера. Сжатие больших тел ответа
+выполняется в отдельном потоке, чтобы не блокировать цикл событий. Потоковые ответы сжимаются
+по частям: каждая часть передаётся клиенту сразу после сжатия.
+"""
+
+import asyncio
+import zlib
+
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .core.decompress import GZIP_ENCODING, ZSTD_ENCODING
+
+BROTLI_ENCODING = "br"
+
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+}
+
+
+class _Compressor:
+    """Потоковое сжатие тела ответа одним из способов"""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == GZIP_ENCODING:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = compressor.compress
+            self._flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = compressor.flush
+        elif encoding == ZSTD_ENCODING:
+            compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._process = compressor.compress
+            self._flush = lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            self._finish = compressor.flush
+        elif encoding == BROTLI_ENCODING:
+            compressor = brotli.Compressor(quality=level)
+            self._process = compressor.process
+            self._flush = compressor.flush
+            self._finish = compressor.finish
+        else:
+            raise ValueError(f"Unsupported content encoding '{encoding}'")
+
+    def compress(self, data: bytes, more: bool) -> bytes:
+        """
+        Сжатие очередной части тела ответа
+
+        Args:
+            data (bytes): Часть тела ответа
+            more (bool): Будут ли ещё части. Если да - сжатые данные сбрасываются, чтобы клиент мог их разобрать
+
+        Returns:
+            (bytes): Сжатые данные
+        """
+        return self._process(data) + (self._flush() if more else self._finish())
+
+
+def select_encoding(accept_encoding: str | None, encodings: list[str]) -> str | None:
+    """
+    Выбор способа сжатия по заголовку `Accept-Encoding`
+
+    Выбирается способ с наибольшим весом `q`; при равных весах - способ, указанный раньше в `encodings`.
+
+    Args:
+        accept_encoding (str | None): Значение заголовка `Accept-Encoding`
+        encodings (list[str]): Доступные способы сжатия в порядке предпочтения сервера
+
+    Returns:
+        (str | None): Способ сжатия или None, если клиент не принимает ни один из доступных способов
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.strip().split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Проверка, имеет ли смысл сжимать ответ с типом содержимого `content_type`"""
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+class CompressionMiddleware:
+    """ASGI middleware сжатия ответов"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+        levels: dict[str, int] | None = None,
+        encodings: list[str] | None = None,
+    ) -> None:
+        """
+        Args:
+            app (ASGIApp): Приложение
+            minimum_size (int): Минимальный размер (в байтах) тела ответа для сжатия
+            offload_size (int): Размер (в байтах) части тела ответа, начиная с которого сжатие выполняется в отдельном потоке
+            levels (dict[str, int], optional): Уровни сжатия по способам сжатия
+            encodings (list[str], optional): Способы сжатия в порядке предпочтения сервера
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.levels = {GZIP_ENCODING: 6, ZSTD_ENCODING: 3, BROTLI_ENCODING: 4}
+        self.levels.update(levels or {})
+        self.encodings = encodings or [ZSTD_ENCODING, BROTLI_ENCODING, GZIP_ENCODING]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding"), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding, send).run(scope, receive)
+
+
+class _CompressionResponder:
+    """Сжатие одного ответа"""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, send: Send
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_with_compression)
+
+    async def _compress(self, data: bytes, more: bool) -> bytes:
+        if len(data) >= self.middleware.offload_size:
+            return await asyncio.to_thread(self.compressor.compress, data, more)
+        return self.compressor.compress(data, more)
+
+    def _start_compression(self, streaming: bool) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if streaming:
+            del headers["Content-Length"]
+        # Сжатое представление не совпадает побайтно с исходным - ETag становится слабым
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self.compressor = _Compressor(
+            self.encoding, self.middleware.levels[self.encoding]
+        )
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] < 200
+                or message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Заголовки отправляются вместе с первой частью тела ответа
+                self.start_message = {**message, "headers": list(message["headers"])}
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more: bool = message.get("more_body", False)
+        if self.start_message is not None:
+            if not more and len(body) < self.middleware.minimum_size:
+                # Небольшой ответ передаётся без сжатия
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            self._start_compression(streaming=more)
+            if not more:
+                body = await self._compress(body, more=False)
+                headers = MutableHeaders(raw=self.start_message["headers"])
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                self.start_message = None
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start_message)
+            self.start_message = None
+
+        await self.send(
+            {
+                "type": "http.response.body",
+                "body": await self._compress(body, more=more),
+                "more_body": more,
+            }
+        )
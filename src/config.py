@@ -1,5 +1,6 @@
 from functools import cache
 import os
+from typing import Literal
 
 from pydantic import BaseModel, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,6 +13,14 @@ class RunConfig(BaseModel):
     """ Имя хоста для доступа к приложению """
     port: int = 8000
     """ Порт для доступа к приложению """
+    workers: int = 1
+    """ Количество процессов обработки запросов. При значении больше 1 запускается gunicorn (см. `src.server`) """
+    worker_class: str = "src.server.AutoMLUvicornWorker"
+    """ Класс процесса обработки запросов gunicorn """
+    loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    """ Реализация цикла событий uvicorn """
+    preload_models: bool = True
+    """ Загрузить ML модели каталога в главном процессе до запуска процессов обработки запросов (не выполняется при включённом пуле процессов выполнения предсказаний) """
 
 
 class StorageConfig(BaseModel):
@@ -21,6 +30,25 @@ class StorageConfig(BaseModel):
     weights_root: str = "data/weights"
 
 
+class TrainConfig(BaseModel):
+    """Настройки обучения моделей"""
+
+    dataset_cache_root: str | None = "data/cache/datasets"
+    """ Каталог кеша подготовленных наборов данных для обучения. Значение None отключает кеш """
+    evaluation_cache_path: str | None = "data/cache/evaluations.sqlite"
+    """ Путь до файла кеша оценок pipeline, общего для всех запусков обучения. Значение None отключает кеш """
+    evaluation_cache_max_entries: int = 100000
+    """ Максимальное количество оценок pipeline в кеше """
+    job_max_attempts: int = 3
+    """ Максимальное количество запусков задачи обучения из очереди (с учётом перезапусков после сбоев) """
+    job_lease: float = 120.0
+    """ Время (в секундах) без подтверждения работы, после которого задача обучения считается прерванной """
+    job_heartbeat_interval: float = 15.0
+    """ Интервал (в секундах) подтверждения работы обработчиком задачи обучения """
+    job_poll_interval: float = 5.0
+    """ Интервал (в секундах) проверки очереди задач обучения при её отсутствии """
+
+
 class SeedingConfig(BaseModel):
     """Настройки автозаполнения базы данных"""
 
@@ -38,6 +66,7 @@ class ApiPrefixConfig(BaseModel):
     mlmodels: str = "/mlmodels"
     predict: str = "/predict"
     tasks: str = "/tasks"
+    train_jobs: str = "/train-jobs"
 
 
 class DatabaseConfig(BaseModel):
@@ -55,6 +84,88 @@ class DatabaseConfig(BaseModel):
     """ Пароль для доступа к базе данных """
     database: str = ""
     """ Имя базы в базе данных """
+    pool_size: int = 5
+    """ Количество постоянно удерживаемых соединений в пуле """
+    max_overflow: int = 10
+    """ Максимальное количество временных соединений сверх размера пула """
+    pool_timeout: float = 30.0
+    """ Время ожидания (в секундах) свободного соединения перед ошибкой """
+    pool_recycle: int = 1800
+    """ Время жизни (в секундах) соединения, после которого оно пересоздаётся. Значение -1 отключает пересоздание """
+    pool_disconnect_strategy: Literal["pessimistic", "optimistic"] = "optimistic"
+    """
+    Стратегия обработки разорванных соединений:
+    - pessimistic - проверка соединения запросом при каждой выдаче из пула (дополнительный запрос к базе);
+    - optimistic - разорванное соединение обнаруживается при выполнении запроса, после чего пул сбрасывается
+    """
+    prepared_statement_cache_size: int = 100
+    """ Размер кеша подготовленных выражений на соединение (только для драйвера asyncpg). Значение 0 отключает кеш """
+
+
+class CacheConfig(BaseModel):
+    """Настройки кеширования данных приложения"""
+
+    catalog_ttl: float = 300.0
+    """ Время жизни (в секундах) записей кеша метаданных каталога. Значение 0 отключает кеш """
+    catalog_max_size: int = 10000
+    """ Максимальное количество записей в кеше метаданных каталога """
+    catalog_max_age: int = 0
+    """ Время (в секундах), в течение которого клиент может использовать ответ каталога без перепроверки ETag """
+    model_cache_size: int = 8
+    """ Максимальное количество загруженных ML моделей в кеше моделей для предсказаний """
+    model_memory_budget: float = 0.0
+    """ Бюджет памяти (в MiB) загруженных ML моделей. Значение 0 отключает ограничение """
+    model_watch_interval: float = 10.0
+    """ Период (в секундах) проверки изменений весов моделей и файлов автозаполнения. Значение 0 отключает проверку """
+
+
+class InferenceConfig(BaseModel):
+    """Настройки пула процессов выполнения предсказаний"""
+
+    workers: int = 0
+    """ Количество процессов выполнения предсказаний. Значение 0 - предсказания выполняются в процессе API """
+    replicas: int = 1
+    """ Количество процессов, за которыми закреплена каждая ML модель """
+    virtual_nodes: int = 64
+    """ Количество точек каждого процесса на кольце согласованного хеширования """
+    socket_dir: str | None = None
+    """ Каталог Unix сокетов процессов, общий для всех процессов API. По умолчанию создаётся временный каталог (обязателен при `external`) """
+    external: bool = False
+    """ Пул запущен другим процессом (отдельной службой `python -m src.inference_pool`): процессы API только подключаются к нему через `socket_dir`. При запуске через gunicorn пул запускает главный процесс """
+    start_timeout: float = 60.0
+    """ Время ожидания (в секундах) готовности запущенного процесса """
+    monitor_interval: float = 1.0
+    """ Период (в секундах) проверки работоспособности процессов """
+
+
+class UploadConfig(BaseModel):
+    """Настройки приёма данных для предсказаний"""
+
+    max_decompression_ratio: float = 100.0
+    """ Максимальное отношение размера распакованных данных к размеру сжатых. Значение 0 отключает ограничение """
+    max_decompressed_size: float = 0.0
+    """ Максимальный размер (в MiB) распакованных данных. Значение 0 отключает ограничение """
+    stream_parsers: int = 8
+    """ Максимальное количество одновременно разбираемых потоковых загрузок. При превышении загрузка отклоняется с кодом 503 """
+
+
+class CompressionConfig(BaseModel):
+    """Настройки сжатия ответов API"""
+
+    enabled: bool = True
+    """ Сжимать ответы, если клиент принимает сжатые данные (заголовок `Accept-Encoding`) """
+    minimum_size: int = 1024
+    """ Минимальный размер (в байтах) тела ответа для сжатия """
+    offload_size: int = 256 * 1024
+    """ Размер (в байтах) тела ответа, начиная с которого сжатие выполняется вне цикла событий """
+    encodings: list[Literal["zstd", "br", "gzip"]] = ["zstd", "br", "gzip"]
+    """ Способы сжатия в порядке предпочтения """
+    gzip_level: int = 6
+    """ Уровень сжатия gzip (1-9) """
+    zstd_level: int = 3
+    """ Уровень сжатия zstd (1-22) """
+    brotli_quality: int = 4
+    """ Уровень сжатия brotli (0-11) """
 
 
 class Settings(BaseSettings):
@@ -72,6 +183,11 @@ class Settings(BaseSettings):
     db: DatabaseConfig = DatabaseConfig()
     storage: StorageConfig = StorageConfig()
     seeding: SeedingConfig = SeedingConfig()
+    train: TrainConfig = TrainConfig()
+    cache: CacheConfig = CacheConfig()
+    inference: InferenceConfig = InferenceConfig()
+    upload: UploadConfig = UploadConfig()
+    compression: CompressionConfig = CompressionConfig()
 
 
 class ConfigManager:
@@ -110,5 +226,25 @@ class ConfigManager:
     def seeding_config(self) -> SeedingConfig:
         return self.get_settings().seeding
 
+    @property
+    def train_config(self) -> TrainConfig:
+        return self.get_settings().train
+
+    @property
+    def cache_config(self) -> CacheConfig:
+        return self.get_settings().cache
+
+    @property
+    def inference_config(self) -> InferenceConfig:
+        return self.get_settings().inference
+
+    @property
+    def upload_config(self) -> UploadConfig:
+        return self.get_settings().upload
+
+    @property
+    def compression_config(self) -> CompressionConfig:
+        return self.get_settings().compression
+
 
 config_manager = ConfigManager()
@@ -0,0 +1,221 @@
+"""
+Упакованный формат модели AutoML: один файл с отображением массивов в память.
+
+Сохранённая средствами FEDOT модель - это каталог с описанием графа и множеством небольших pickle файлов
+обученных операций и предобработки. Упакованный формат содержит весь обученный pipeline в одном файле:
+
+    [MAGIC (8 байт)][версия, размер заголовка (uint32, uint32)][заголовок json][данные]
+
+Данные состоят из pickle (протокол 5) объекта pipeline и крупных буферов (массивов numpy), вынесенных
+из pickle и выровненных по `ARTIFACT_ALIGNMENT` байт. При загрузке файл отображается в память
+(копирование при записи), а массивы создаются поверх отображения без копирования: загрузка сводится
+к разбору небольшого pickle, а страницы с массивами разделяются между процессами, загрузившими модель.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import uuid
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+ARTIFACT_MAGIC = b"AMLPACK\x00"
+""" Сигнатура файла упакованной модели """
+ARTIFACT_VERSION = 1
+""" Версия формата упакованной модели """
+ARTIFACT_ALIGNMENT = 64
+""" Выравнивание (в байтах) данных в файле упакованной модели """
+ARTIFACT_MIN_BUFFER_SIZE = 1 << 16
+""" Минимальный размер (в байтах) буфера, выносимого из pickle для отображения в память """
+PACKED_MODEL_FILENAME = "model.pack"
+""" Имя файла упакованной модели в каталоге весов модели """
+
+_PREFIX = struct.Struct("<8sII")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ARTIFACT_ALIGNMENT) * ARTIFACT_ALIGNMENT
+
+
+def save_packed_artifact(
+    obj: Any, path: str | PathLike, meta: dict[str, Any] | None = None
+) -> Path:
+    """
+    Сохранение объекта в упакованном формате
+
+    Файл записывается атомарно: читатели видят либо прежнюю, либо полностью записанную версию.
+
+    Args:
+        obj (Any): Сохраняемый объект (обученный pipeline)
+        path (str | PathLike): Путь до файла
+        meta (dict[str, Any], optional): Дополнительная информация, сохраняемая в заголовке
+
+    Returns:
+        (Path): Путь до сохранённого файла
+    """
+    buffers: list[pickle.PickleBuffer] = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        # Небольшие буферы остаются в pickle (True), крупные выносятся для отображения в память
+        if buffer.raw().nbytes < ARTIFACT_MIN_BUFFER_SIZE:
+            return True
+        buffers.append(buffer)
+        return False
+
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffer_callback)
+
+    # Смещения указываются относительно начала данных и не зависят от размера заголовка
+    sections = []
+    offset = 0
+    for size in (len(payload), *(buffer.raw().nbytes for buffer in buffers)):
+        sections.append([offset, size])
+        offset = _align(offset + size)
+    header = json.dumps(
+        {"pickle": sections[0], "buffers": sections[1:], "meta": meta or {}}
+    ).encode()
+    data_start = _align(_PREFIX.size + len(header))
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(_PREFIX.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, len(header)))
+            file.write(header)
+            for (section_offset, _), data in zip(
+                sections, (payload, *(buffer.raw() for buffer in buffers))
+            ):
+                file.seek(data_start + section_offset)
+                file.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def read_artifact_header(path: str | PathLike) -> dict[str, Any]:
+    """
+    Чтение заголовка упакованного файла без загрузки данных
+
+    Raises:
+        ValueError: Если файл не является упакованной моделью поддерживаемой версии
+    """
+    with open(path, "rb") as file:
+        return _parse_header(file.read(_PREFIX.size), file)[0]
+
+
+def _parse_header(prefix: bytes, file) -> tuple[dict[str, Any], int]:
+    if len(prefix) < _PREFIX.size:
+        raise ValueError("File is too short to be a packed artifact")
+    magic, version, header_size = _PREFIX.unpack(prefix)
+    if magic != ARTIFACT_MAGIC:
+        raise ValueError("File is not a packed artifact")
+    if version != ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported packed artifact version {version}, expected {ARTIFACT_VERSION}"
+        )
+    header = json.loads(file.read(header_size))
+    return header, _align(_PREFIX.size + header_size)
+
+
+def load_packed_artifact(path: str | PathLike) -> Any:
+    """
+    Загрузка объекта из упакованного файла с отображением крупных массивов в память
+
+    Отображение выполняется с копированием при записи: изменение массивов загруженного объекта
+    не изменяет файл и не влияет на другие процессы.
+
+    Args:
+        path (str | PathLike): Путь до файла
+
+    Returns:
+        (Any): Загруженный объект
+
+    Raises:
+        ValueError: Если файл не является упакованной моделью поддерживаемой версии
+    """
+    with open(path, "rb") as file:
+        header, data_start = _parse_header(file.read(_PREFIX.size), file)
+        if not header["buffers"]:
+            file.seek(data_start + header["pickle"][0])
+            return pickle.loads(file.read(header["pickle"][1]))
+        # Отображение остаётся открытым, пока на него ссылаются созданные поверх него массивы
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    view = memoryview(mapping)
+
+    def section(offset: int, size: int) -> memoryview:
+        return view[data_start + offset : data_start + offset + size]
+
+    return pickle.loads(
+        section(*header["pickle"]),
+        buffers=[section(*buffer) for buffer in header["buffers"]],
+    )
+
+
+def describe_saved_model(weight_path: str | PathLike) -> dict[str, Any]:
+    """
+    Сведения о модели, сохранённой средствами FEDOT, по которым упакованная модель сопоставляется с ней
+
+    Сохраняются в заголовке упакованной модели. Упакованная модель, сведения которой не совпадают со сведениями
+    модели в её каталоге весов, устарела (модель пересохранена без упаковки) или создана другой версией FEDOT
+    и не должна загружаться.
+
+    Args:
+        weight_path (str | PathLike): Путь до каталога весов модели
+
+    Returns:
+        (dict[str, Any]): Версия FEDOT и хеш (sha256) описания pipeline
+    """
+    from fedot import __version__ as fedot_version
+
+    digest = hashlib.sha256()
+    # Описание pipeline сохраняется FEDOT в json файл в корне каталога весов
+    for description_path in sorted(Path(weight_path).glob("*.json")):
+        digest.update(description_path.name.encode())
+        digest.update(description_path.read_bytes())
+    return {"fedot_version": fedot_version, "pipeline_hash": digest.hexdigest()}
+
+
+def pack_saved_model(weight_path: str | PathLike) -> Path:
+    """
+    Упаковка модели, сохранённой средствами FEDOT, в файл `PACKED_MODEL_FILENAME` её каталога весов
+
+    Args:
+        weight_path (str | PathLike): Путь до каталога весов модели
+
+    Returns:
+        (Path): Путь до упакованной модели
+    """
+    # FEDOT импортируется только при упаковке, чтобы не загружать его при импорте модуля
+    from fedot.core.pipelines.pipeline import Pipeline
+
+    pipeline = Pipeline().load(str(weight_path))
+    return save_packed_artifact(
+        pipeline,
+        Path(weight_path, PACKED_MODEL_FILENAME),
+        meta=describe_saved_model(weight_path),
+    )
+
+
+def parse_opt():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "weight_paths",
+        type=str,
+        nargs="+",
+        help="Paths to saved model weights to pack into a single file",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    opt = parse_opt()
+
+    for weight_path in opt.weight_paths:
+        print(f"Packed model saved to {pack_saved_model(weight_path)}")
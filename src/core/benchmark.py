@@ -0,0 +1,461 @@
+"""
+Оценка соотношения времени обучения и качества моделей AutoML.
+
+Для каждого набора данных перебираются комбинации параметров обучения (пресет выбора моделей, время поиска
+решения, количество процессов). Каждый запуск выполняется в отдельном процессе, чтобы измерения времени
+процессора и пикового потребления памяти не смешивались между запусками. Результаты дописываются в таблицу
+.csv (повторный запуск продолжает прерванный перебор), по ним строится отчёт с границей Парето
+"время - качество" для выбора самых дешёвых параметров, удовлетворяющих требованиям к качеству.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from src.core.logger import LoggerFactory
+from src.utils import read_yaml
+
+BENCHMARK_LOGGER = LoggerFactory.get_logger("Benchmark")
+
+BENCHMARK_PRESETS = ("fast_train", "stable", "best_quality", "auto")
+""" Пресеты выбора моделей, перебираемые по умолчанию """
+HIGHER_IS_BETTER_METRICS = {"roc_auc", "accuracy", "f1", "r2", "precision"}
+""" Метрики, для которых большее значение лучше (для остальных лучше меньшее) """
+
+RESULT_COLUMNS = (
+    "dataset",
+    "preset",
+    "timeout",
+    "n_jobs",
+    "repeat",
+    "status",
+    "wall_time",
+    "cpu_time",
+    "peak_rss_mb",
+    "train_time",
+    "evaluated_pipelines",
+    "target_metric",
+    "target_value",
+    "metrics",
+    "pipeline",
+    "error",
+)
+""" Колонки таблицы результатов """
+
+
+@dataclass(frozen=True)
+class BenchmarkTrial:
+    """Параметры одного запуска обучения"""
+
+    dataset: str
+    """ Название набора данных (имя каталога) """
+    data_root: str
+    """ Путь до каталога набора данных с файлом 'config.yaml' """
+    preset: str
+    """ Пресет выбора моделей """
+    timeout: float
+    """ Максимально допустимое время (в минутах) поиска решения """
+    n_jobs: int
+    """ Количество процессов для обучения """
+    repeat: int
+    """ Номер повтора запуска с одинаковыми параметрами """
+
+    @property
+    def key(self) -> tuple[str, str, str, str, str]:
+        """Ключ запуска в таблице результатов"""
+        return (
+            self.dataset,
+            self.preset,
+            str(self.timeout),
+            str(self.n_jobs),
+            str(self.repeat),
+        )
+
+
+def _peak_rss_mb(usage: resource.struct_rusage) -> float:
+    # ru_maxrss задаётся в килобайтах в Linux и в байтах в macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return usage.ru_maxrss * scale / 2**20
+
+
+def _run_trial(trial: BenchmarkTrial, use_evaluation_cache: bool) -> dict[str, Any]:
+    """Выполнение запуска обучения в отдельном процессе с измерением затраченных ресурсов"""
+    # Импорт выполняется внутри процесса запуска, чтобы библиотеки не загружались в основной процесс
+    from src.config import config_manager
+    from src.core.train import TargetTrainMetricEnum, train_from_data_root
+
+    if not use_evaluation_cache:
+        # Оценки из общего кеша ускоряют повторные запуски и искажают сравнение параметров
+        config_manager.train_config.evaluation_cache_path = None
+
+    task = read_yaml(Path(trial.data_root, "config.yaml"))["task"]
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as save_dir:
+        model_info = train_from_data_root(
+            data_root=trial.data_root,
+            save_dir=save_dir,
+            save_name=trial.dataset,
+            timeout=trial.timeout,
+            composition_preset=trial.preset,
+            n_jobs=trial.n_jobs,
+        )
+    wall_time = time.perf_counter() - started
+
+    # Процессы оценки pipeline завершаются вместе с пулом FEDOT и учитываются в RUSAGE_CHILDREN
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    target_metric = TargetTrainMetricEnum[task].value
+    return {
+        "wall_time": wall_time,
+        "cpu_time": sum(
+            usage.ru_utime + usage.ru_stime for usage in (usage_self, usage_children)
+        ),
+        "peak_rss_mb": max(_peak_rss_mb(usage_self), _peak_rss_mb(usage_children)),
+        "train_time": model_info["train_time"],
+        "evaluated_pipelines": model_info["evaluated_pipelines"],
+        "target_metric": target_metric,
+        "target_value": model_info["metrics"].get(target_metric),
+        "metrics": json.dumps(model_info["metrics"]),
+        "pipeline": model_info["pipeline"],
+    }
+
+
+def find_data_roots(datasets_root: PathLike) -> list[Path]:
+    """Поиск каталогов наборов данных с файлом 'config.yaml'"""
+    return sorted(path.parent for path in Path(datasets_root).glob("*/config.yaml"))
+
+
+def build_trials(
+    data_roots: list[PathLike],
+    presets: list[str],
+    timeouts: list[float],
+    n_jobs: list[int],
+    repeats: int = 1,
+) -> list[BenchmarkTrial]:
+    """Формирование всех комбинаций параметров запусков"""
+    return [
+        BenchmarkTrial(
+            dataset=Path(data_root).name,
+            data_root=str(data_root),
+            preset=preset,
+            timeout=timeout,
+            n_jobs=jobs,
+            repeat=repeat,
+        )
+        for data_root, preset, timeout, jobs, repeat in itertools.product(
+            data_roots, presets, timeouts, n_jobs, range(repeats)
+        )
+    ]
+
+
+def read_results(results_path: PathLike) -> list[dict[str, str]]:
+    """Чтение таблицы результатов (пустой список, если таблица ещё не создана)"""
+    if not Path(results_path).exists():
+        return []
+    with open(results_path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def run_benchmark(
+    trials: list[BenchmarkTrial],
+    results_path: PathLike,
+    use_evaluation_cache: bool = False,
+) -> list[dict[str, str]]:
+    """
+    Последовательное выполнение запусков с дописыванием результатов в таблицу
+
+    Запуски, уже присутствующие в таблице, пропускаются. Запуски выполняются последовательно,
+    чтобы не конкурировать за процессор и не искажать измерения.
+
+    Args:
+        trials (list[BenchmarkTrial]): Запуски обучения
+        results_path (PathLike): Путь до таблицы результатов в формате .csv
+        use_evaluation_cache (bool): Использовать общий кеш оценок pipeline
+
+    Returns:
+        (list[dict[str, str]]): Все строки таблицы результатов
+    """
+    results_path = Path(results_path)
+    done = {
+        (row["dataset"], row["preset"], row["timeout"], row["n_jobs"], row["repeat"])
+        for row in read_results(results_path)
+    }
+    pending = [trial for trial in trials if trial.key not in done]
+    BENCHMARK_LOGGER.info(
+        f"Run {len(pending)} benchmark trials ({len(trials) - len(pending)} already done)"
+    )
+
+    results_path.parent.mkdir(exist_ok=True, parents=True)
+    is_new_table = not results_path.exists()
+    with open(results_path, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_COLUMNS)
+        if is_new_table:
+            writer.writeheader()
+        for index, trial in enumerate(pending, start=1):
+            BENCHMARK_LOGGER.info(f"[{index}/{len(pending)}] Run trial {trial}")
+            row: dict[str, Any] = {
+                name: value
+                for name, value in asdict(trial).items()
+                if name in RESULT_COLUMNS
+            }
+            # Новый процесс на каждый запуск: измерения ресурсов начинаются с нуля
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                try:
+                    row.update(
+                        executor.submit(
+                            _run_trial, trial, use_evaluation_cache
+                        ).result(),
+                        status="ok",
+                    )
+                except Exception as e:
+                    row.update(status="failed", error=f"({type(e).__name__}) {e}")
+                    BENCHMARK_LOGGER.error(f"Trial {trial} failed: {row['error']}")
+            writer.writerow(row)
+            file.flush()
+    return read_results(results_path)
+
+
+def pareto_frontier(points: list[dict[str, Any]], higher_is_better: bool) -> list[dict]:
+    """
+    Граница Парето "время - качество": параметры, для которых нет более быстрых и не менее качественных
+
+    Args:
+        points (list[dict[str, Any]]): Точки с ключами 'wall_time' и 'target_value'
+        higher_is_better (bool): Большее значение метрики лучше
+
+    Returns:
+        (list[dict]): Точки границы в порядке возрастания времени
+    """
+    sign = 1 if higher_is_better else -1
+    frontier = []
+    best_quality = None
+    for point in sorted(
+        points, key=lambda point: (point["wall_time"], -sign * point["target_value"])
+    ):
+        quality = sign * point["target_value"]
+        if best_quality is None or quality > best_quality:
+            frontier.append(point)
+            best_quality = quality
+    return frontier
+
+
+def summarize_results(rows: list[dict[str, str]]) -> dict[str, list[dict[str, Any]]]:
+    """
+    Усреднение успешных запусков по повторам для каждого набора данных и комбинации параметров
+
+    Returns:
+        (dict[str, list[dict[str, Any]]]): Сводные строки по наборам данных
+    """
+    groups: dict[tuple, list[dict[str, str]]] = {}
+    for row in rows:
+        if row["status"] != "ok" or row["target_value"] in ("", None):
+            continue
+        key = (row["dataset"], row["preset"], row["timeout"], row["n_jobs"])
+        groups.setdefault(key, []).append(row)
+
+    def mean(group: list[dict[str, str]], column: str) -> float | None:
+        values = [float(row[column]) for row in group if row[column] not in ("", None)]
+        return sum(values) / len(values) if values else None
+
+    summary: dict[str, list[dict[str, Any]]] = {}
+    for (dataset, preset, timeout, n_jobs), group in groups.items():
+        summary.setdefault(dataset, []).append(
+            {
+                "preset": preset,
+                "timeout": float(timeout),
+                "n_jobs": int(n_jobs),
+                "repeats": len(group),
+                "wall_time": mean(group, "wall_time"),
+                "cpu_time": mean(group, "cpu_time"),
+                "peak_rss_mb": mean(group, "peak_rss_mb"),
+                "evaluated_pipelines": mean(group, "evaluated_pipelines"),
+                "target_metric": group[0]["target_metric"],
+                "target_value": mean(group, "target_value"),
+            }
+        )
+    return summary
+
+
+def write_frontier_report(
+    rows: list[dict[str, str]],
+    report_path: PathLike,
+    targets: dict[str, float] | None = None,
+) -> str:
+    """
+    Формирование отчёта с границей Парето "время - качество" в формате markdown
+
+    Args:
+        rows (list[dict[str, str]]): Строки таблицы результатов
+        report_path (PathLike): Путь для сохранения отчёта
+        targets (dict[str, float], optional): Требуемые значения целевой метрики по наборам данных.
+            Для набора данных с требованием отмечаются самые дешёвые параметры, удовлетворяющие ему
+
+    Returns:
+        (str): Текст отчёта
+    """
+    targets = targets or {}
+    lines = ["# AutoML training benchmark", ""]
+    for dataset, points in sorted(summarize_results(rows).items()):
+        metric = points[0]["target_metric"]
+        higher_is_better = metric in HIGHER_IS_BETTER_METRICS
+        frontier = pareto_frontier(points, higher_is_better)
+        frontier_ids = {id(point) for point in frontier}
+
+        lines += [
+            f"## {dataset}",
+            "",
+            f"Target metric: `{metric}` ({'higher' if higher_is_better else 'lower'} is better)",
+            "",
+            "| frontier | preset | timeout, min | n_jobs | wall time, s | cpu time, s "
+            f"| peak RSS, MB | pipelines | {metric} |",
+            "|---|---|---|---|---|---|---|---|---|",
+        ]
+        for point in sorted(points, key=lambda point: point["wall_time"]):
+            pipelines = point["evaluated_pipelines"]
+            lines.append(
+                f"| {'*' if id(point) in frontier_ids else ''} | {point['preset']} "
+                f"| {point['timeout']:g} | {point['n_jobs']} | {point['wall_time']:.1f} "
+                f"| {point['cpu_time']:.1f} | {point['peak_rss_mb']:.0f} "
+                f"| {'-' if pipelines is None else f'{pipelines:.0f}'} "
+                f"| {point['target_value']:.4f} |"
+            )
+        lines.append("")
+
+        if dataset in targets:
+            target = targets[dataset]
+            satisfying = [
+                point
+                for point in frontier
+                if (
+                    point["target_value"] >= target
+                    if higher_is_better
+                    else point["target_value"] <= target
+                )
+            ]
+            if satisfying:
+                cheapest = satisfying[0]
+                lines.append(
+                    f"Cheapest parameters with `{metric}` meeting {target}: preset "
+                    f"`{cheapest['preset']}`, timeout {cheapest['timeout']:g} min, "
+                    f"n_jobs {cheapest['n_jobs']} ({cheapest['wall_time']:.1f} s)"
+                )
+            else:
+                lines.append(f"No parameters reach `{metric}` target {target}")
+            lines.append("")
+
+    report = "\n".join(lines)
+    Path(report_path).parent.mkdir(exist_ok=True, parents=True)
+    Path(report_path).write_text(report, encoding="utf-8")
+    return report
+
+
+def parse_target(value: str) -> tuple[str, float]:
+    dataset, _, target = value.partition("=")
+    return dataset, float(target)
+
+
+def parse_opt():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "data_roots",
+        type=str,
+        nargs="*",
+        help="Root paths to datasets with 'config.yaml' file (by default all datasets in --datasets-root)",
+    )
+    parser.add_argument(
+        "--datasets-root",
+        type=str,
+        help="root dir with datasets",
+        default="data/datasets",
+    )
+    parser.add_argument(
+        "-p",
+        "--presets",
+        type=str,
+        nargs="+",
+        help="composition presets to compare",
+        default=list(BENCHMARK_PRESETS),
+    )
+    parser.add_argument(
+        "-t",
+        "--timeouts",
+        type=float,
+        nargs="+",
+        help="search timeouts (in minutes) to compare",
+        default=[1, 5],
+    )
+    parser.add_argument(
+        "-j",
+        "--n-jobs",
+        type=int,
+        nargs="+",
+        help="numbers of parallel jobs to compare",
+        default=[-1],
+    )
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        help="number of repeats of each trial",
+        default=1,
+    )
+    parser.add_argument(
+        "--target",
+        dest="targets",
+        type=parse_target,
+        action="append",
+        help="target metric value for a dataset in the form 'dataset=value'",
+        default=[],
+    )
+    parser.add_argument(
+        "--use-evaluation-cache",
+        action="store_true",
+        help="use the shared pipeline evaluation cache (speeds up repeated trials but skews timings)",
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        help="path to the results table in csv format (existing trials are skipped)",
+        default="runs/benchmark/results.csv",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        help="path to save the time-quality frontier report in markdown format",
+        default="runs/benchmark/report.md",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    opt = parse_opt()
+
+    data_roots = opt.data_roots or find_data_roots(opt.datasets_root)
+    if not data_roots:
+        raise FileNotFoundError("Not found datasets with 'config.yaml' file")
+    trials = build_trials(
+        data_roots=data_roots,
+        presets=opt.presets,
+        timeouts=opt.timeouts,
+        n_jobs=opt.n_jobs,
+        repeats=opt.repeats,
+    )
+    results = run_benchmark(
+        trials, opt.results, use_evaluation_cache=opt.use_evaluation_cache
+    )
+    write_frontier_report(results, opt.report, targets=dict(opt.targets))
+    BENCHMARK_LOGGER.info(f"Save benchmark report to {opt.report}")
@@ -1,7 +1,242 @@
+import copy
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import uuid
 from os import PathLike
+from pathlib import Path
 
+import numpy as np
+from sklearn.model_selection import train_test_split
 from fedot.core.data.data import InputData
 from fedot.core.data.data_split import train_test_data_setup
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task, TaskTypesEnum
+
+from src.core.logger import LoggerFactory
+
+DATALOADER_LOGGER = LoggerFactory.get_logger("DataLoader")
+
+DATASET_CACHE_VERSION = 1
+""" Версия формата кеша наборов данных. Изменение версии делает недействительными ранее созданные кеши """
+DATASET_CACHE_ARRAYS = ("idx", "features", "target", "train_index", "test_index")
+""" Массивы, сохраняемые в кеше набора данных """
+SPLIT_RANDOM_SEED = 42
+""" Зерно генератора случайных чисел для разбиения данных на train и test """
+
+
+def compute_file_hash(path: PathLike) -> str:
+    """Вычисление хеша (sha256) содержимого файла"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_data_hash(data: InputData) -> str:
+    """Вычисление хеша (sha256) содержимого данных: индекса, признаков и целевых значений"""
+    digest = hashlib.sha256()
+    for array in (data.idx, data.features, data.target):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        if array.dtype.hasobject:
+            digest.update(repr(array.tolist()).encode())
+        else:
+            digest.update(array.data)
+    return digest.hexdigest()
+
+
+def _take_rows(data: InputData, index: np.ndarray) -> InputData:
+    """
+    Выборка строк данных по позициям
+
+    Сведения о данных (типы признаков, индексы категориальных и числовых признаков, дополнительные данные)
+    переносятся в результат без изменений.
+    """
+    categorical_features = data.categorical_features
+    if categorical_features is not None:
+        categorical_features = np.take(categorical_features, index, 0)
+    return dataclasses.replace(
+        data,
+        idx=np.take(data.idx, index, 0),
+        features=np.take(data.features, index, 0),
+        target=np.take(data.target, index, 0) if data.target is not None else None,
+        categorical_features=categorical_features,
+        task=copy.deepcopy(data.task),
+    )
+
+
+def _split_by_positions(
+    data: InputData, train_index: np.ndarray, test_index: np.ndarray
+) -> tuple[InputData, InputData]:
+    """Разбиение данных на train и test по позициям строк"""
+    return _take_rows(data, train_index), _take_rows(data, test_index)
+
+
+def _split_data(data: InputData, task: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Получение позиций строк train и test разбиения
+
+    Разбиение выполняется средствами FEDOT над копией данных, в которой индекс заменён на номера строк,
+    поэтому результат совпадает с `train_test_data_setup` над исходными данными.
+    """
+    positional_data = copy.copy(data)
+    positional_data.idx = np.arange(len(data.idx))
+    train_data, test_data = train_test_data_setup(
+        positional_data, shuffle=task != "ts", random_seed=SPLIT_RANDOM_SEED
+    )  # type: ignore
+    return np.asarray(train_data.idx), np.asarray(test_data.idx)
+
+
+def _save_dataset_cache(
+    cache_path: Path,
+    data: InputData,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    meta: dict,
+) -> None:
+    """Атомарное сохранение набора данных в кеш"""
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid.uuid4().hex[:8]}")
+    tmp_path.mkdir(parents=True)
+    try:
+        arrays = {
+            "idx": data.idx,
+            "features": data.features,
+            "target": data.target,
+            "train_index": train_index,
+            "test_index": test_index,
+        }
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            # Массивы объектов (например, строковые признаки) не отображаются в память и сохраняются через pickle
+            np.save(
+                Path(tmp_path, f"{name}.npy"), array, allow_pickle=array.dtype.hasobject
+            )
+        meta = {
+            **meta,
+            "features_names": (
+                [str(name) for name in data.features_names]
+                if data.features_names is not None
+                else None
+            ),
+        }
+        with open(Path(tmp_path, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Кеш уже создан конкурентным процессом
+        if not cache_path.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _prune_dataset_cache(cache_root: Path, meta: dict, keep: Path) -> None:
+    """
+    Удаление устаревших кешей того же файла данных
+
+    Кеш устаревает при изменении содержимого файла или версии формата кеша. Кеши того же файла
+    с другими параметрами загрузки (например, целевым столбцом) сохраняются.
+    """
+    for cache_path in cache_root.iterdir():
+        if cache_path == keep or cache_path.name.startswith("."):
+            continue
+        try:
+            with open(Path(cache_path, "meta.json"), encoding="utf-8") as file:
+                cached_meta = json.load(file)
+        except (OSError, ValueError):
+            continue
+        if cached_meta.get("source") != meta["source"]:
+            continue
+        if (
+            cached_meta.get("version") != meta["version"]
+            or cached_meta.get("source_hash") != meta["source_hash"]
+        ):
+            # Открытые отображения файлов удаляемого кеша остаются доступными до их закрытия
+            shutil.rmtree(cache_path, ignore_errors=True)
+            DATALOADER_LOGGER.debug(f"Remove stale dataset cache {cache_path}")
+
+
+def _load_dataset_cache(cache_path: Path, task: str) -> tuple[InputData, InputData]:
+    """Загрузка набора данных из кеша с отображением массивов в память"""
+    with open(Path(cache_path, "meta.json"), encoding="utf-8") as file:
+        meta = json.load(file)
+    arrays = {}
+    for name in DATASET_CACHE_ARRAYS:
+        array_path = Path(cache_path, f"{name}.npy")
+        try:
+            # Копирование при записи: предобработка FEDOT может изменять массивы на месте
+            arrays[name] = np.load(array_path, mmap_mode="c")
+        except ValueError:
+            arrays[name] = np.load(array_path, allow_pickle=True)
+
+    features_names = meta.get("features_names")
+    data = InputData(
+        idx=arrays["idx"],
+        features=arrays["features"],
+        target=arrays["target"],
+        task=Task(TaskTypesEnum(task)),
+        data_type=DataTypesEnum.table,
+        features_names=(
+            np.asarray(features_names) if features_names is not None else None
+        ),
+    )
+    return _split_by_positions(data, arrays["train_index"], arrays["test_index"])
+
+
+def subsample_train_data(
+    data: InputData,
+    size: float | int,
+    task: str,
+    random_seed: int = SPLIT_RANDOM_SEED,
+) -> InputData:
+    """
+    Получение подвыборки данных для ускоренного поиска решения
+
+    Для классификации подвыборка стратифицируется по классам (если в каждом классе не менее двух записей),
+    для временных рядов берётся последний непрерывный участок, для остальных задач - случайные записи.
+    Порядок записей исходных данных сохраняется.
+
+    Args:
+        data (InputData): Исходные данные
+        size (float | int): Доля записей (число из интервала (0, 1]) или количество записей (целое число > 1)
+        task (str): Тип прогнозируемой задачи
+        random_seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        (InputData): Подвыборка данных или исходные данные, если подвыборка не меньше их
+    """
+    n_samples = len(data.target)
+    n_subsample = int(round(size * n_samples)) if size <= 1 else int(size)
+    if n_subsample >= n_samples:
+        return data
+    if n_subsample < 1:
+        raise ValueError(f"Subsample size must be positive, got {size}")
+
+    if task == "ts":
+        index = np.arange(n_samples - n_subsample, n_samples)
+    else:
+        stratify = None
+        if task == "classification":
+            _, counts = np.unique(np.asarray(data.target).ravel(), return_counts=True)
+            # Стратификация требует хотя бы одну запись каждого класса в подвыборке и в остатке
+            n_classes = len(counts)
+            if (
+                counts.min() >= 2
+                and min(n_subsample, n_samples - n_subsample) >= n_classes
+            ):
+                stratify = np.asarray(data.target).ravel()
+        index, _ = train_test_split(
+            np.arange(n_samples),
+            train_size=n_subsample,
+            random_state=random_seed,
+            stratify=stratify,
+        )
+        index = np.sort(index)
+    return _take_rows(data, index)
 
 
 def load_fedot_train_data_from_csv(
@@ -9,9 +244,49 @@ def load_fedot_train_data_from_csv(
     task: str,
     target_columns: str | list[str | int],
     index_col: str | None = None,
+    cache_root: PathLike | None = None,
 ) -> tuple[InputData, InputData]:
-    """Загрузить данные для обучения и разбить их на train и test"""
+    """
+    Загрузить данные для обучения и разбить их на train и test
+
+    Args:
+        data_path (PathLike): Путь до .csv файла с данными
+        task (str): Тип прогнозируемой задачи
+        target_columns (str | list[str | int]): Целевые столбцы в данных
+        index_col (str, optional): Колонка индекса в данных
+        cache_root (PathLike, optional): Каталог кеша наборов данных. Если задан, то при первой загрузке
+            данные и разбиение сохраняются в бинарном формате (npy), а последующие загрузки того же файла
+            с теми же параметрами отображают сохранённые массивы в память без разбора .csv файла.
+            При изменении файла устаревшие кеши удаляются. Кеширование поддерживается только для табличных задач
+    """
+    if cache_root is None or task == "ts":
+        data = InputData.from_csv(
+            data_path, task=task, index_col=index_col, target_columns=target_columns
+        )
+        return train_test_data_setup(data, shuffle=task != "ts", random_seed=SPLIT_RANDOM_SEED)  # type: ignore
+
+    # Ключ кеша зависит от содержимого файла и от параметров загрузки и разбиения
+    meta = {
+        "version": DATASET_CACHE_VERSION,
+        "source_hash": compute_file_hash(data_path),
+        "task": task,
+        "target_columns": target_columns,
+        "index_col": index_col,
+        "split_random_seed": SPLIT_RANDOM_SEED,
+    }
+    cache_key = hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+    cache_path = Path(cache_root, cache_key[:32])
+
+    if cache_path.exists():
+        DATALOADER_LOGGER.debug(f"Load dataset '{data_path}' from cache {cache_path}")
+        return _load_dataset_cache(cache_path, task)
+
     data = InputData.from_csv(
         data_path, task=task, index_col=index_col, target_columns=target_columns
     )
-    return train_test_data_setup(data, shuffle=task != "ts", random_seed=42)  # type: ignore
+    train_index, test_index = _split_data(data, task)
+    meta["source"] = str(Path(data_path).resolve())
+    _save_dataset_cache(cache_path, data, train_index, test_index, meta=meta)
+    DATALOADER_LOGGER.debug(f"Save dataset '{data_path}' to cache {cache_path}")
+    _prune_dataset_cache(Path(cache_root), meta, keep=cache_path)
+    return _split_by_positions(data, train_index, test_index)
@@ -0,0 +1,200 @@
+"""
+Потоковая распаковка сжатых табличных данных (gzip, zstd).
+
+Распаковка выполняется по мере чтения: разбор .csv получает распакованные данные небольшими частями,
+а распакованный файл целиком не сохраняется ни в память, ни на диск. Для защиты от архивов-бомб
+размер распакованных данных ограничивается относительно размера прочитанных сжатых данных.
+"""
+
+import gzip
+import io
+import zlib
+from pathlib import PurePath
+from typing import BinaryIO
+
+import zstandard
+
+GZIP_ENCODING = "gzip"
+ZSTD_ENCODING = "zstd"
+
+DEFAULT_MAX_RATIO = 100.0
+""" Максимальное отношение размера распакованных данных к размеру сжатых """
+RATIO_MIN_INPUT = 1 << 16
+""" Размер (в байтах) сжатых данных, ниже которого ограничение отношения считается от этого значения """
+
+_ENCODING_ALIASES = {
+    "gzip": GZIP_ENCODING,
+    "x-gzip": GZIP_ENCODING,
+    "zstd": ZSTD_ENCODING,
+}
+_EXTENSIONS = {
+    ".gz": GZIP_ENCODING,
+    ".gzip": GZIP_ENCODING,
+    ".zst": ZSTD_ENCODING,
+    ".zstd": ZSTD_ENCODING,
+}
+_CONTENT_TYPES = {
+    "application/gzip": GZIP_ENCODING,
+    "application/x-gzip": GZIP_ENCODING,
+    "application/zstd": ZSTD_ENCODING,
+}
+_DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error, zstandard.ZstdError)
+
+
+class UnsupportedEncodingError(ValueError):
+    """Неподдерживаемый способ сжатия данных"""
+
+
+class DecompressionError(ValueError):
+    """Ошибка распаковки данных (повреждённые данные или превышение ограничений)"""
+
+
+def get_encoding(
+    content_encoding: str | None = None,
+    filename: str | None = None,
+    content_type: str | None = None,
+) -> str | None:
+    """
+    Определение способа сжатия данных
+
+    Заголовок `Content-Encoding` имеет приоритет над типом содержимого и расширением файла.
+
+    Args:
+        content_encoding (str, optional): Значение заголовка `Content-Encoding`
+        filename (str, optional): Имя файла (например, `data.csv.gz`)
+        content_type (str, optional): Тип содержимого файла
+
+    Returns:
+        (str | None): Способ сжатия или None, если данные не сжаты
+
+    Raises:
+        UnsupportedEncodingError: Если способ сжатия не поддерживается
+    """
+    encoding = None
+    if content_encoding:
+        codings = [
+            coding.strip().lower()
+            for coding in content_encoding.split(",")
+            if coding.strip().lower() not in ("", "identity")
+        ]
+        if len(codings) > 1:
+            raise UnsupportedEncodingError(
+                f"Multiple content encodings are not supported: '{content_encoding}'"
+            )
+        if codings:
+            encoding = _ENCODING_ALIASES.get(codings[0])
+            if encoding is None:
+                raise UnsupportedEncodingError(
+                    f"Unsupported content encoding '{codings[0]}'"
+                )
+    if encoding is None and content_type:
+        encoding = _CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    if encoding is None and filename:
+        encoding = _EXTENSIONS.get(PurePath(filename).suffix.lower())
+    return encoding
+
+
+class _CountingReader(io.RawIOBase):
+    """Чтение сжатых данных с подсчётом прочитанных байт"""
+
+    def __init__(self, file: BinaryIO) -> None:
+        super().__init__()
+        self._file = file
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if hasattr(self._file, "readinto"):
+            size = self._file.readinto(buffer)
+        else:
+            data = self._file.read(len(buffer))
+            size = len(data)
+            buffer[:size] = data
+        self.bytes_read += size or 0
+        return size
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Чтение распакованных данных с ограничением их размера"""
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        source: _CountingReader,
+        max_ratio: float,
+        max_size: int,
+    ) -> None:
+        super().__init__()
+        self._stream = stream
+        self._source = source
+        self._max_ratio = max_ratio
+        self._max_size = max_size
+        self.bytes_written = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        try:
+            size = self._stream.readinto(buffer)
+        except _DECOMPRESSION_ERRORS as e:
+            raise DecompressionError(f"Couldn't decompress data: {e}") from e
+        self.bytes_written += size
+        if self._max_size > 0 and self.bytes_written > self._max_size:
+            raise DecompressionError(
+                f"Decompressed data exceeds the limit of {self._max_size} bytes"
+            )
+        if self._max_ratio > 0 and self.bytes_written > self._max_ratio * max(
+            self._source.bytes_read, RATIO_MIN_INPUT
+        ):
+            raise DecompressionError(
+                f"Decompression ratio exceeds the limit of {self._max_ratio:g}"
+            )
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def open_decompressed(
+    file: BinaryIO,
+    encoding: str | None,
+    max_ratio: float = DEFAULT_MAX_RATIO,
+    max_size: int = 0,
+) -> BinaryIO:
+    """
+    Открытие потока распакованных данных
+
+    Args:
+        file (BinaryIO): Поток сжатых данных
+        encoding (str | None): Способ сжатия (см. `get_encoding`). Значение None - данные не сжаты
+        max_ratio (float): Максимальное отношение размера распакованных данных к размеру сжатых.
+            Значение 0 отключает ограничение
+        max_size (int): Максимальный размер (в байтах) распакованных данных. Значение 0 отключает ограничение
+
+    Returns:
+        (BinaryIO): Поток распакованных данных
+
+    Raises:
+        UnsupportedEncodingError: Если способ сжатия не поддерживается
+        DecompressionError: При чтении повреждённых данных или превышении ограничений
+    """
+    if encoding is None:
+        return file
+    source = _CountingReader(file)
+    if encoding == GZIP_ENCODING:
+        stream = gzip.GzipFile(fileobj=source, mode="rb")
+    elif encoding == ZSTD_ENCODING:
+        stream = zstandard.ZstdDecompressor().stream_reader(
+            source, read_across_frames=True, closefd=False
+        )
+    else:
+        raise UnsupportedEncodingError(f"Unsupported content encoding '{encoding}'")
+    return io.BufferedReader(
+        _DecompressingReader(stream, source, max_ratio=max_ratio, max_size=max_size),
+        1 << 16,
+    )
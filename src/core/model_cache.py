@@ -0,0 +1,395 @@
+"""
+Кеш загруженных ML моделей для предсказаний.
+
+Загрузка модели занимает заметно больше времени, чем предсказание на небольших данных, поэтому загруженные
+модели хранятся в памяти процесса. Новая версия модели загружается в фоне и подменяет прежнюю атомарно:
+запросы, получившие прежнюю версию, завершаются на ней, а последующие запросы получают новую версию.
+
+Суммарный размер загруженных моделей ограничен бюджетом памяти. При превышении бюджета из памяти удаляются
+наименее ценные модели (GreedyDual-Size-Frequency): ценность модели растёт с частотой её использования
+и временем загрузки и убывает с размером, а давно не использовавшиеся модели постепенно теряют ценность.
+Удалённая модель остаётся на диске и загружается заново при следующем запросе.
+"""
+
+import gc
+import hashlib
+import logging
+import mmap
+import pickle
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from functools import cache
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from fedot.api.main import Fedot
+
+from src.config import config_manager
+from src.core.logger import LoggerFactory
+from src.core.predict import load_model
+
+MODEL_CACHE_LOGGER = LoggerFactory.get_logger("ModelCache")
+
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    logging.Logger,
+)
+""" Типы объектов, разделяемых между моделями (классы, модули, функции), которые не входят в размер модели """
+
+
+def get_model_version(weight_path: str | PathLike) -> str:
+    """
+    Вычисление версии сохранённой модели по именам, размерам и времени изменения файлов её каталога весов
+
+    Содержимое файлов не читается, поэтому проверка версии выполняется быстро для моделей любого размера.
+    """
+    digest = hashlib.sha256()
+    weight_path = Path(weight_path)
+    for path in sorted(weight_path.rglob("*")):
+        # Временные файлы атомарной записи (см. `src.core.artifact`) не относятся к модели
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(weight_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode()
+        )
+    return digest.hexdigest()
+
+
+def _get_array_owner(array: np.ndarray) -> Any:
+    """Получение объекта, владеющего данными массива (исходного массива, файла, расширения)"""
+    owner: Any = array
+    while True:
+        if isinstance(owner, np.ndarray) and owner.base is not None:
+            owner = owner.base
+        elif isinstance(owner, pickle.PickleBuffer):
+            owner = owner.raw()
+        elif isinstance(owner, memoryview) and owner.obj is not None:
+            owner = owner.obj
+        else:
+            return owner
+
+
+def estimate_deep_size(obj: Any) -> int:
+    """
+    Оценка объёма памяти (в байтах), занимаемого объектом и всеми достижимыми из него объектами
+
+    Массивы numpy учитываются вместе с данными. Данные, отображённые в память из файла (см. `src.core.artifact`),
+    не учитываются: страницы файла разделяются между процессами и могут быть освобождены системой.
+    """
+    size = 0
+    seen: set[int] = set()
+    # Временные объекты (состояния объектов расширений) удерживаются до конца обхода, чтобы их id не переиспользовались
+    temporaries: list[Any] = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                owner = _get_array_owner(item)
+                if isinstance(owner, np.ndarray):
+                    # Размер массива, владеющего данными, уже включает их
+                    stack.append(owner)
+                elif not isinstance(owner, mmap.mmap):
+                    # Данные принадлежат объекту расширения (например, дереву решений sklearn)
+                    size += item.nbytes
+            if item.dtype.hasobject:
+                stack.extend(item.ravel().tolist())
+            continue
+        stack.extend(gc.get_referents(item))
+        if (
+            not hasattr(item, "__dict__")
+            and type(item).__getstate__ is not object.__getstate__
+        ):
+            # Объекты расширений (например, деревья sklearn) хранят данные вне объектов Python
+            # и раскрывают их только через состояние для сериализации
+            try:
+                state = item.__getstate__()
+            except Exception:
+                continue
+            temporaries.append(state)
+            stack.append(state)
+    return size
+
+
+def estimate_model_size(model: Fedot) -> int:
+    """Оценка объёма памяти (в байтах), занимаемого обученным pipeline модели с предобработкой"""
+    pipeline = getattr(model, "current_pipeline", None)
+    return estimate_deep_size(pipeline if pipeline is not None else model)
+
+
+@dataclass
+class CachedModel:
+    """Загруженная версия ML модели"""
+
+    name: str
+    """ Системное название модели """
+    task: str
+    """ Тип прогнозируемой задачи """
+    path: Path
+    """ Путь до весов модели """
+    version: str
+    """ Версия весов модели на момент загрузки (см. `get_model_version`) """
+    model: Fedot
+    """ Загруженная модель """
+    load_time: float
+    """ Время (в секундах) загрузки модели """
+    size: int = 0
+    """ Оценка объёма памяти (в байтах), занимаемого моделью """
+    loaded_at: float = field(default_factory=time.time)
+    """ Время (unix timestamp) загрузки модели """
+    hits: int = 1
+    """ Количество обращений к модели с момента загрузки """
+    priority: float = 0.0
+    """ Ценность модели для вытеснения из памяти: модели с наименьшей ценностью удаляются первыми """
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    """ Блокировка модели на время предобработки данных и предсказания: модель FEDOT хранит состояние """
+
+
+@dataclass(frozen=True)
+class ResidentModelMetrics:
+    """Состояние загруженной модели"""
+
+    name: str
+    """ Системное название модели """
+    version: str
+    """ Версия весов модели """
+    size: int
+    """ Оценка объёма памяти (в байтах), занимаемого моделью """
+    hits: int
+    """ Количество обращений к модели с момента загрузки """
+    load_time: float
+    """ Время (в секундах) загрузки модели """
+    loaded_at: float
+    """ Время (unix timestamp) загрузки модели """
+
+
+@dataclass(frozen=True)
+class ModelCacheMetrics:
+    """Снимок состояния кеша загруженных моделей"""
+
+    memory_budget: int
+    """ Бюджет памяти (в байтах) загруженных моделей. Значение 0 - без ограничения """
+    max_size: int
+    """ Максимальное количество загруженных моделей """
+    resident_size: int
+    """ Оценка объёма памяти (в байтах), занимаемого загруженными моделями """
+    hits: int
+    """ Количество запросов, получивших уже загруженную модель """
+    loads: int
+    """ Количество загрузок моделей (включая повторные загрузки и обновления версий) """
+    reloads: int
+    """ Количество повторных загрузок моделей, ранее удалённых из памяти """
+    evictions: int
+    """ Количество удалений моделей из памяти """
+    load_time_total: float
+    """ Суммарное время (в секундах) загрузки моделей """
+    models: list[ResidentModelMetrics]
+    """ Загруженные модели """
+
+
+class ModelCache:
+    """
+    Потокобезопасный кеш загруженных ML моделей.
+
+    Каждая модель загружается не более одного раза одновременно: конкурентные запросы той же модели
+    ожидают завершения загрузки. При превышении количества моделей или бюджета памяти удаляются модели
+    с наименьшей ценностью. Запрошенная модель остаётся в памяти, даже если её размер превышает бюджет.
+    """
+
+    def __init__(self, max_size: int = 8, memory_budget: int = 0) -> None:
+        """
+        Args:
+            max_size (int): Максимальное количество загруженных моделей. Значение <= 0 отключает кеширование
+            memory_budget (int): Бюджет памяти (в байтах) загруженных моделей. Значение <= 0 отключает ограничение
+        """
+        self.max_size = max_size
+        self.memory_budget = max(memory_budget, 0)
+        self._lock = threading.Lock()
+        self._items: dict[str, CachedModel] = {}
+        self._loading: dict[str, threading.Lock] = {}
+        # Ценность последней удалённой модели: новые обращения получают ценность не ниже неё
+        self._clock = 0.0
+        self._evicted: set[str] = set()
+        self._hits = 0
+        self._loads = 0
+        self._reloads = 0
+        self._evictions = 0
+        self._load_time_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._items
+
+    def _get_loading_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._loading.setdefault(name, threading.Lock())
+
+    def _load(self, name: str, task: str, path: Path) -> CachedModel:
+        # Версия вычисляется до загрузки: изменение весов во время загрузки будет обнаружено при следующей проверке
+        version = get_model_version(path)
+        started = time.perf_counter()
+        model = load_model(task, path)
+        load_time = time.perf_counter() - started
+        size = estimate_model_size(model)
+        with self._lock:
+            self._loads += 1
+            self._load_time_total += load_time
+        MODEL_CACHE_LOGGER.info(
+            f"Load model '{name}' version {version[:8]} in {load_time:.2f} s "
+            f"({size / 1024 ** 2:.1f} MiB)"
+        )
+        return CachedModel(
+            name=name,
+            task=task,
+            path=path,
+            version=version,
+            model=model,
+            load_time=load_time,
+            size=size,
+        )
+
+    def _update_priority(self, entry: CachedModel) -> None:
+        # Стоимость повторной загрузки на байт памяти, умноженная на частоту обращений
+        entry.priority = self._clock + entry.hits * entry.load_time / max(entry.size, 1)
+
+    def _evict_excess(self, keep: str) -> None:
+        """Удаление наименее ценных моделей при превышении ограничений (вызывается под блокировкой)"""
+        resident_size = sum(entry.size for entry in self._items.values())
+        while len(self._items) > 1 and (
+            len(self._items) > self.max_size
+            or (self.memory_budget and resident_size > self.memory_budget)
+        ):
+            victim = min(
+                (entry for entry in self._items.values() if entry.name != keep),
+                key=lambda entry: entry.priority,
+            )
+            self._clock = victim.priority
+            del self._items[victim.name]
+            self._evicted.add(victim.name)
+            self._evictions += 1
+            resident_size -= victim.size
+            MODEL_CACHE_LOGGER.info(
+                f"Evict model '{victim.name}' ({victim.size / 1024 ** 2:.1f} MiB) from memory"
+            )
+
+    def get(self, name: str, task: str, path: str | PathLike) -> CachedModel:
+        """
+        Получить загруженную модель, загрузив её при отсутствии в кеше
+
+        Args:
+            name (str): Системное название модели
+            task (str): Тип прогнозируемой задачи
+            path (str | PathLike): Путь до весов модели
+        """
+        with self._lock:
+            entry = self._items.get(name)
+            if entry is not None:
+                self._hits += 1
+                entry.hits += 1
+                self._update_priority(entry)
+                return entry
+        if not self.enabled:
+            return self._load(name, task, Path(path))
+
+        with self._get_loading_lock(name):
+            with self._lock:
+                entry = self._items.get(name)
+            if entry is not None:
+                # Модель загружена конкурентным запросом
+                return entry
+            entry = self._load(name, task, Path(path))
+            with self._lock:
+                if name in self._evicted:
+                    self._evicted.discard(name)
+                    self._reloads += 1
+                self._update_priority(entry)
+                self._items[name] = entry
+                self._evict_excess(keep=name)
+            return entry
+
+    def reload(self, name: str) -> CachedModel | None:
+        """
+        Загрузить новую версию модели, если она находится в кеше, и заменить ею прежнюю версию
+
+        Прежняя версия используется для предсказаний до завершения загрузки новой.
+
+        Returns:
+            (CachedModel | None): Новая версия модели или None, если модель отсутствует в кеше
+                или её версия не изменилась
+        """
+        with self._get_loading_lock(name):
+            with self._lock:
+                current = self._items.get(name)
+            if current is None or get_model_version(current.path) == current.version:
+                return None
+            entry = self._load(name, current.task, current.path)
+            with self._lock:
+                # Модель могла быть удалена из кеша во время загрузки - не будем возвращать её
+                if name not in self._items:
+                    return None
+                # Новая версия наследует частоту обращений прежней
+                entry.hits = current.hits
+                self._update_priority(entry)
+                self._items[name] = entry
+                self._evict_excess(keep=name)
+            MODEL_CACHE_LOGGER.info(
+                f"Model '{name}' reloaded: version {current.version[:8]} -> {entry.version[:8]}"
+            )
+            return entry
+
+    def evict(self, name: str) -> None:
+        """Удалить модель из кеша. Запросы, получившие модель ранее, завершаются на ней"""
+        with self._lock:
+            self._items.pop(name, None)
+
+    def get_metrics(self) -> ModelCacheMetrics:
+        """Получить текущее состояние кеша"""
+        with self._lock:
+            return ModelCacheMetrics(
+                memory_budget=self.memory_budget,
+                max_size=self.max_size,
+                resident_size=sum(entry.size for entry in self._items.values()),
+                hits=self._hits,
+                loads=self._loads,
+                reloads=self._reloads,
+                evictions=self._evictions,
+                load_time_total=self._load_time_total,
+                models=[
+                    ResidentModelMetrics(
+                        name=entry.name,
+                        version=entry.version,
+                        size=entry.size,
+                        hits=entry.hits,
+                        load_time=entry.load_time,
+                        loaded_at=entry.loaded_at,
+                    )
+                    for entry in self._items.values()
+                ],
+            )
+
+
+@cache
+def get_model_cache() -> ModelCache:
+    """Получение общего для процесса кеша загруженных моделей"""
+    cache_config = config_manager.cache_config
+    return ModelCache(
+        max_size=cache_config.model_cache_size,
+        memory_budget=int(cache_config.model_memory_budget * 1024**2),
+    )
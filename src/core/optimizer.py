@@ -0,0 +1,232 @@
+"""
+Оптимизатор поиска решения AutoML с постоянным кешем оценок pipeline и остановкой по сходимости.
+
+Оценка pipeline (обучение с кросс-валидацией) занимает основное время поиска решения. При регулярном
+переобучении на тех же данных оптимизатор рассматривает многие pipeline повторно, поэтому результаты
+оценок сохраняются на диск и переиспользуются между запусками обучения.
+
+Поиск решения останавливается досрочно, если лучшая метрика перестала значимо улучшаться,
+и не расходует всё отведённое время на простых наборах данных.
+"""
+
+import datetime
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from golem.core.dag.graph import Graph
+from golem.core.optimisers.fitness import Fitness
+from golem.core.optimisers.genetic.gp_optimizer import EvoGraphOptimizer
+
+EVALUATION_CACHE_VERSION = 1
+""" Версия формата ключей кеша оценок. Изменение версии делает недействительными ранее сохранённые оценки """
+
+
+class EvaluationCache:
+    """
+    Постоянный кеш оценок pipeline на основе sqlite.
+
+    Кеш может использоваться одновременно несколькими процессами (процессами оценки pipeline одного обучения
+    и параллельными обучениями), поэтому соединение открывается в каждом процессе отдельно.
+    Размер кеша ограничен: при превышении удаляются записи, которые дольше всего не использовались.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100000) -> None:
+        """
+        Args:
+            path (str | Path): Путь до файла базы данных кеша
+            max_entries (int): Максимальное количество записей в кеше
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._connection: sqlite3.Connection | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Соединение не передаётся в процессы оценки pipeline и открывается в них заново
+        return {**self.__dict__, "_connection": None}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, fitness BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_evaluations_accessed_at ON evaluations (accessed_at)"
+            )
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def build_key(*parts: Any) -> str:
+        """Формирование ключа записи из частей (набор данных, структура pipeline, параметры оценки)"""
+        raw = json.dumps([EVALUATION_CACHE_VERSION, *parts], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Fitness | None:
+        """Получить оценку по ключу или None, если запись отсутствует"""
+        row = self.connection.execute(
+            "SELECT fitness FROM evaluations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute(
+            "UPDATE evaluations SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return pickle.loads(row[0])
+
+    def set(self, key: str, fitness: Fitness) -> None:
+        """Сохранить оценку и удалить давно не используемые записи при превышении размера кеша"""
+        connection = self.connection
+        connection.execute(
+            "INSERT OR REPLACE INTO evaluations (key, fitness, accessed_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(fitness), time.time()),
+        )
+        (count,) = connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()
+        if count > self.max_entries:
+            connection.execute(
+                "DELETE FROM evaluations WHERE key IN ("
+                "SELECT key FROM evaluations ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+class CachedObjective:
+    """Функция оценки pipeline, использующая постоянный кеш оценок"""
+
+    def __init__(
+        self,
+        objective: Callable[[Graph], Fitness],
+        cache: EvaluationCache,
+        namespace: list[Any],
+    ) -> None:
+        """
+        Args:
+            objective (Callable[[Graph], Fitness]): Исходная функция оценки pipeline
+            cache (EvaluationCache): Кеш оценок
+            namespace (list[Any]): Параметры оценки, входящие в ключ кеша (набор данных, метрики, фолды)
+        """
+        self.objective = objective
+        self.cache = cache
+        self.namespace = namespace
+
+    def __call__(self, graph: Graph) -> Fitness:
+        key = self.cache.build_key(*self.namespace, graph.descriptive_id)
+        fitness = self.cache.get(key)
+        if fitness is not None:
+            return fitness
+        fitness = self.objective(graph)
+        # Неудачные оценки (например, прерванные по времени) не сохраняются
+        if fitness.valid:
+            self.cache.set(key, fitness)
+        return fitness
+
+
+class AutoMLEvoGraphOptimizer(EvoGraphOptimizer):
+    """
+    Эволюционный оптимизатор GOLEM с постоянным кешем оценок pipeline и остановкой по сходимости.
+
+    Передаётся в FEDOT через `FedotBuilder.setup_evolution(optimizer=...)` с помощью `functools.partial`
+    для указания кеша, идентификатора данных и порога значимого улучшения.
+
+    Стандартная остановка GOLEM по стагнации (`early_stopping_iterations`, `early_stopping_timeout`)
+    считает улучшением любое изменение лучшей метрики, поэтому поиск продолжается при сколь угодно малых
+    улучшениях. Оптимизатор дополнительно останавливает поиск, если за то же количество поколений или время
+    лучшая метрика улучшилась не более чем на `convergence_epsilon` относительно последнего значимого улучшения.
+    """
+
+    def __init__(
+        self,
+        *args,
+        evaluation_cache: EvaluationCache | None = None,
+        data_key: str = "",
+        convergence_epsilon: float = 0.0,
+        progress_callback: Callable[[int, float], None] | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            evaluation_cache (EvaluationCache, optional): Кеш оценок pipeline. Если не задан, кеш не используется
+            data_key (str): Идентификатор (хеш) данных, на которых оцениваются pipeline
+            convergence_epsilon (float): Минимальное относительное улучшение лучшей метрики, которое считается
+                значимым. Значение 0 оставляет только стандартную остановку по стагнации
+            progress_callback (Callable[[int, float], None], optional): Функция, вызываемая после каждого поколения
+                с номером поколения и взвешенным значением лучшей метрики
+        """
+        super().__init__(*args, **kwargs)
+        self.evaluation_cache = evaluation_cache
+        self.data_key = data_key
+        self.convergence_epsilon = convergence_epsilon
+        self.progress_callback = progress_callback
+        self._converged_fitness: Fitness | None = None
+        self._convergence_iter_count = 0
+        self._convergence_start_time = datetime.datetime.now()
+
+        max_iterations = self.requirements.early_stopping_iterations
+        max_time = self.requirements.early_stopping_timeout
+        if convergence_epsilon > 0 and not self.objective.is_multi_objective:
+            self.stop_optimization.add_condition(
+                lambda: (
+                    max_iterations is not None
+                    and self._convergence_iter_count >= max_iterations
+                ),
+                f"Optimisation finished: no improvement above {convergence_epsilon} "
+                f"for {max_iterations} generations",
+            ).add_condition(
+                lambda: (
+                    max_time is not None and self.convergence_time_duration >= max_time
+                ),
+                f"Optimisation finished: no improvement above {convergence_epsilon} "
+                f"for {max_time} minutes",
+            )
+
+    @property
+    def convergence_time_duration(self) -> float:
+        """Время (в минутах) с последнего значимого улучшения лучшей метрики"""
+        return (
+            datetime.datetime.now() - self._convergence_start_time
+        ).total_seconds() / 60
+
+    def _is_significant_improvement(self, fitness: Fitness) -> bool:
+        """Проверка, улучшает ли оценка последнее значимое значение лучшей метрики более чем на порог"""
+        reference = self._converged_fitness
+        if reference is None or not reference.valid:
+            return True
+        if not fitness.valid or not fitness > reference:
+            return False
+        # Взвешенные значения метрик FEDOT могут быть отрицательными, поэтому порог считается по модулю
+        return abs(fitness.value - reference.value) > self.convergence_epsilon * max(
+            abs(reference.value), 1e-12
+        )
+
+    def _update_population(self, next_population, label=None, metadata=None):
+        super()._update_population(next_population, label, metadata)
+        if not self.best_individuals:
+            return
+        best_fitness = self.best_individuals[0].fitness
+        if self._is_significant_improvement(best_fitness):
+            self._converged_fitness = best_fitness
+            self._convergence_iter_count = 0
+            self._convergence_start_time = datetime.datetime.now()
+        else:
+            self._convergence_iter_count += 1
+        if self.progress_callback is not None and best_fitness.valid:
+            self.progress_callback(self.current_generation_num, best_fitness.value)
+
+    def optimise(self, objective: Callable[[Graph], Fitness]):
+        if self.evaluation_cache is not None:
+            namespace = [
+                self.data_key,
+                list(self.objective.metric_names),
+                getattr(self.requirements, "cv_folds", None),
+            ]
+            objective = CachedObjective(objective, self.evaluation_cache, namespace)
+        return super().optimise(objective)
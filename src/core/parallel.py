@@ -0,0 +1,53 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from threadpoolctl import threadpool_limits
+
+THREAD_LIMIT_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+""" Переменные окружения, ограничивающие количество потоков вычислительных библиотек """
+
+
+def set_thread_limit_env(threads: int) -> None:
+    """
+    Ограничение количества потоков BLAS/OpenMP через переменные окружения.
+
+    Учитывается библиотеками, загружаемыми после вызова, и дочерними процессами.
+    """
+    for env_var in THREAD_LIMIT_ENV_VARS:
+        os.environ[env_var] = str(threads)
+
+
+@contextmanager
+def limit_threads(threads: int | None) -> Iterator[None]:
+    """
+    Ограничение количества потоков BLAS/OpenMP в рамках контекста
+
+    Ограничение применяется как к уже загруженным библиотекам текущего процесса (через threadpoolctl),
+    так и к дочерним процессам, создаваемым внутри контекста (через переменные окружения).
+
+    Args:
+        threads (int, optional): Максимальное количество потоков. None - без ограничений
+    """
+    if threads is None:
+        yield
+        return
+    previous_env = {
+        env_var: os.environ.get(env_var) for env_var in THREAD_LIMIT_ENV_VARS
+    }
+    set_thread_limit_env(threads)
+    try:
+        with threadpool_limits(limits=threads):
+            yield
+    finally:
+        for env_var, value in previous_env.items():
+            if value is None:
+                os.environ.pop(env_var, None)
+            else:
+                os.environ[env_var] = value
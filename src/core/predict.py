@@ -7,15 +7,64 @@ import numpy as np
 import pandas as pd
 from fedot.api.main import Fedot, InputData, MultiModalData
 
+from src.core.artifact import (
+    PACKED_MODEL_FILENAME,
+    describe_saved_model,
+    load_packed_artifact,
+    read_artifact_header,
+)
+from src.core.decompress import DEFAULT_MAX_RATIO, get_encoding, open_decompressed
 from src.core.logger import LoggerFactory
 
 PREDICT_LOGGER = LoggerFactory.get_logger("Predict")
 
 
+def load_model(
+    task: str | Literal["classification", "regression"],
+    weight_path: str | Path,
+) -> Fedot:
+    """
+    Загрузка модели AutoML
+
+    Если в каталоге весов есть упакованная модель, соответствующая сохранённой средствами FEDOT модели
+    (см. `describe_saved_model`), то она загружается с отображением массивов в память,
+    иначе модель загружается средствами FEDOT.
+
+    Args:
+        task (str): Тип прогнозируемой задачи - 'classification' или 'regression'
+        weight_path (str | Path): Путь до весов модели
+
+    Returns:
+        (Fedot): Модель с загруженным pipeline
+    """
+    model = Fedot(task)
+    packed_path = Path(weight_path, PACKED_MODEL_FILENAME)
+    if packed_path.exists():
+        try:
+            packed_meta = read_artifact_header(packed_path)["meta"]
+            saved_meta = describe_saved_model(weight_path)
+            if any(packed_meta.get(key) != value for key, value in saved_meta.items()):
+                raise ValueError(
+                    f"Packed model doesn't match the saved model: {saved_meta}"
+                )
+            # Повторяет `Fedot.load` для pipeline из упакованного файла
+            model.current_pipeline = load_packed_artifact(packed_path)
+            model.data_processor.preprocessor = model.current_pipeline.preprocessor
+            return model
+        except Exception as e:
+            PREDICT_LOGGER.warning(
+                f"Couldn't load packed model '{packed_path}', fallback to FEDOT format: "
+                f"({type(e).__name__}) {e}"
+            )
+    model.load(weight_path)
+    return model
+
+
 def prepare_data_for_predict(
     data: pd.DataFrame,
     task: str | Literal["classification", "regression"],
     weight_path: str | Path,
+    model: Fedot | None = None,
 ) -> InputData | MultiModalData:
     """
     Функция подготовки данных для предсказания моделью AutoML. Служит для предобработки данных вне
@@ -26,13 +75,14 @@ def prepare_data_for_predict(
         task (str): Тип прогнозируемой задачи - 'classification' или 'regression'
         weight_path (str | list[str]): Путь до весов модели, используемой для предсказания.
             Модель должна быть обучена на том же наборе данных, откуда и `data`
+        model (Fedot, optional): Ранее загруженная модель. Если задана, то модель не загружается из `weight_path`
 
     Returns:
         (np.ndarray[N]): Массив предсказанных значений для каждой строки из data
     """
     # Загрузим модель вместе с pipeline
-    model = Fedot(task)
-    model.load(weight_path)
+    if model is None:
+        model = load_model(task, weight_path)
     # Предобработаем данные
     try:
         prepared_data = model.data_processor.define_data(
@@ -51,6 +101,7 @@ def predict(
     data: pd.DataFrame | InputData | MultiModalData,
     task: str | Literal["classification", "regression"],
     weight_path: str | Path,
+    model: Fedot | None = None,
 ) -> np.ndarray:
     """
     Функция предсказания для модели AutoML
@@ -60,6 +111,7 @@ def predict(
         task (str): Тип прогнозируемой задачи - 'classification' или 'regression'
         weight_path (str | list[str]): Путь до весов модели, используемой для предсказания.
             Модель должна быть обучена на том же наборе данных, откуда и `data`
+        model (Fedot, optional): Ранее загруженная модель. Если задана, то модель не загружается из `weight_path`
 
     Returns:
         (np.ndarray[N]): Массив предсказанных значений для каждой строки из data
@@ -67,9 +119,9 @@ def predict(
     predict_task_id = str(uuid.uuid4())[:8]
 
     # Загрузим модель
-    model = Fedot(task)
-    model.load(weight_path)
-    PREDICT_LOGGER.debug(f"<{predict_task_id}> Load model from '{weight_path}'")
+    if model is None:
+        model = load_model(task, weight_path)
+        PREDICT_LOGGER.debug(f"<{predict_task_id}> Load model from '{weight_path}'")
     # Сделаем предсказание
     pred_values = model.predict(data)
     PREDICT_LOGGER.debug(
@@ -78,6 +130,125 @@ def predict(
     return pred_values
 
 
+class ModelClassesUnavailable(RuntimeError):
+    """Метки классов модели классификации не удалось определить"""
+
+
+def get_model_classes(model: Fedot, n_classes: int) -> np.ndarray:
+    """
+    Получение меток классов в порядке столбцов вероятностей модели классификации
+
+    Нечисловые метки кодируются FEDOT при обучении номерами в порядке столбцов вероятностей
+    и восстанавливаются его кодировщиком целевого атрибута. Числовые метки не кодируются:
+    они берутся из обученной операции выходного узла pipeline (атрибут `classes_` моделей sklearn).
+
+    Args:
+        model (Fedot): Модель с загруженным pipeline
+        n_classes (int): Количество столбцов вероятностей
+
+    Returns:
+        (np.ndarray[C]): Метки классов
+
+    Raises:
+        ModelClassesUnavailable: Если метки классов не удалось определить
+    """
+    pipeline = model.current_pipeline
+    preprocessor = getattr(pipeline, "preprocessor", None)
+    if getattr(preprocessor, "target_encoders", None):
+        classes = np.ravel(
+            preprocessor.apply_inverse_target_encoding(np.arange(n_classes))  # type: ignore
+        )
+    else:
+        fitted_operation = getattr(
+            getattr(pipeline, "root_node", None), "fitted_operation", None
+        )
+        classes = getattr(fitted_operation, "classes_", None)
+        if classes is None:
+            # Операции, реализованные в FEDOT, хранят обученную модель в атрибуте `model`
+            classes = getattr(
+                getattr(fitted_operation, "model", None), "classes_", None
+            )
+    if classes is None:
+        raise ModelClassesUnavailable("Couldn't determine class labels of the model")
+    if len(classes) != n_classes:
+        raise ModelClassesUnavailable(
+            f"Model has {len(classes)} class labels for {n_classes} probability columns"
+        )
+    return np.asarray(classes)
+
+
+def predict_proba(
+    data: pd.DataFrame | InputData | MultiModalData,
+    task: str | Literal["classification", "regression"],
+    weight_path: str | Path,
+    model: Fedot | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Функция предсказания вероятностей классов для модели AutoML классификации
+
+    Args:
+        data (pd.DataFrame | InputData | MultiModalData): Данные для предсказания в виде таблице или подготовленные с помощью `prepare_data_for_predict`
+        task (str): Тип прогнозируемой задачи - только 'classification'
+        weight_path (str | list[str]): Путь до весов модели, используемой для предсказания.
+            Модель должна быть обучена на том же наборе данных, откуда и `data`
+        model (Fedot, optional): Ранее загруженная модель. Если задана, то модель не загружается из `weight_path`
+
+    Returns:
+        (tuple[np.ndarray[N, C], np.ndarray[C]]): Вероятности классов для каждой строки из data и метки классов
+
+    Raises:
+        ValueError: Если модель решает задачу не классификации
+        ModelClassesUnavailable: Если метки классов модели не удалось определить
+    """
+    if task != "classification":
+        raise ValueError(
+            f"Class probabilities are available only for classification, not '{task}'"
+        )
+    predict_task_id = str(uuid.uuid4())[:8]
+
+    # Загрузим модель
+    if model is None:
+        model = load_model(task, weight_path)
+        PREDICT_LOGGER.debug(f"<{predict_task_id}> Load model from '{weight_path}'")
+    # Сделаем предсказание вероятностей всех классов (для бинарной классификации - обоих классов)
+    probabilities = np.asarray(model.predict_proba(data, probs_for_all_classes=True))
+    if probabilities.ndim == 1:
+        probabilities = np.column_stack([1 - probabilities, probabilities])
+    PREDICT_LOGGER.debug(
+        f"<{predict_task_id}> Successfully predict probabilities of '{probabilities.shape[1]}' "
+        f"classes for '{len(probabilities)}' rows"
+    )
+    return probabilities, get_model_classes(model, probabilities.shape[1])
+
+
+def get_top_k(
+    probabilities: np.ndarray, classes: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Выбор `k` наиболее вероятных классов для каждой строки
+
+    Классы отбираются частичной сортировкой (`np.argpartition`) за линейное время по количеству классов,
+    после чего сортируются только `k` отобранных.
+
+    Args:
+        probabilities (np.ndarray[N, C]): Вероятности классов
+        classes (np.ndarray[C]): Метки классов
+        k (int): Количество классов. Ограничивается количеством классов модели
+
+    Returns:
+        (tuple[np.ndarray[N, k], np.ndarray[N, k]]): Метки и вероятности классов по убыванию вероятности
+    """
+    k = min(k, probabilities.shape[1])
+    if k < probabilities.shape[1]:
+        indexes = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+    else:
+        indexes = np.broadcast_to(np.arange(k), probabilities.shape)
+    scores = np.take_along_axis(probabilities, indexes, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    indexes = np.take_along_axis(indexes, order, axis=1)
+    return classes[indexes], np.take_along_axis(scores, order, axis=1)
+
+
 def parse_opt():
     parser = argparse.ArgumentParser()
     parser.add_argument("task", type=str, help="Type of prediction task")
@@ -85,9 +256,22 @@ def parse_opt():
         "-d",
         "--data-file",
         type=str,
-        help="Path to .csv file for prediction",
+        help="Path to .csv file for prediction (.csv.gz and .csv.zst are decompressed on the fly)",
         required=True,
     )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        choices=["auto", "none", "gzip", "zstd"],
+        help="Compression of the data file (auto - by the file extension)",
+        default="auto",
+    )
+    parser.add_argument(
+        "--max-decompression-ratio",
+        type=float,
+        help="Max ratio of decompressed to compressed data size (0 - no limit)",
+        default=DEFAULT_MAX_RATIO,
+    )
     parser.add_argument(
         "-w", "--weight_path", type=str, help="Path to model weights", required=True
     )
@@ -107,8 +291,17 @@ def parse_opt():
 if __name__ == "__main__":
     opt = vars(parse_opt())
 
-    # Считаем файл данных
-    data = pd.read_csv(opt["data_file"])
+    # Считаем файл данных, распаковывая его при чтении
+    if opt["compression"] == "auto":
+        encoding = get_encoding(filename=opt["data_file"])
+    else:
+        encoding = None if opt["compression"] == "none" else opt["compression"]
+    with open(opt["data_file"], "rb") as data_file:
+        data = pd.read_csv(
+            open_decompressed(
+                data_file, encoding, max_ratio=opt["max_decompression_ratio"]
+            )
+        )
 
     predictions = predict(
         data=data,
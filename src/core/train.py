@@ -1,22 +1,38 @@
 import argparse
+import functools
 import logging
 from os import PathLike
 import shutil
+import time
 import uuid
 from enum import Enum
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Literal
 from datetime import datetime
 
 from fedot.api.builder import FedotBuilder
+from fedot.api.main import Fedot
 from fedot.core.repository.metrics_repository import (
     ClassificationMetricsEnum,
     RegressionMetricsEnum,
 )
+from fedot.core.data.data import InputData
 from fedot.core.pipelines.pipeline import Pipeline
 
-from src.core.dataloaders import load_fedot_train_data_from_csv
+from src.config import config_manager
+from src.core.artifact import (
+    PACKED_MODEL_FILENAME,
+    describe_saved_model,
+    save_packed_artifact,
+)
+from src.core.dataloaders import (
+    compute_data_hash,
+    load_fedot_train_data_from_csv,
+    subsample_train_data,
+)
 from src.core.logger import LoggerFactory
+from src.core.optimizer import AutoMLEvoGraphOptimizer, EvaluationCache
+from src.core.parallel import limit_threads
 from src.utils import read_yaml, write_yaml
 
 TRAIN_LOGGER = LoggerFactory.get_logger("Train")
@@ -36,6 +52,14 @@ class AvailableMetricsEnum(Enum):
     regression = list(metric.value for metric in RegressionMetricsEnum)
 
 
+def _report_target_metric(
+    callback: Callable[[int, float], None], generation: int, fitness_value: float
+) -> None:
+    """Передача хода поиска решения со значением целевой метрики вместо взвешенного значения FEDOT"""
+    # FEDOT минимизирует метрики, поэтому roc_auc оптимизируется с обратным знаком (mape неотрицательна)
+    callback(generation, abs(fitness_value))
+
+
 class AutoMLTrainer:
     """Класс для автоматического обучения моделей AutoML"""
 
@@ -48,6 +72,17 @@ class AutoMLTrainer:
         timeout: float = 5,
         task_id: str | None = None,
         composition_preset: str | None = None,
+        n_jobs: int = -1,
+        parallel_evaluation: bool = True,
+        blas_threads: int | None = None,
+        composition_subsample: float | None = None,
+        early_stopping_iterations: int | None = None,
+        early_stopping_timeout: float | None = None,
+        convergence_epsilon: float = 1e-3,
+        warm_start_path: PathLike | None = None,
+        reference_metrics: dict[str, float] | None = None,
+        refit_drift_threshold: float | None = None,
+        progress_callback: Callable[[int, float], None] | None = None,
     ):
         """
         Функция обучения моделей AutoML
@@ -66,9 +101,31 @@ class AutoMLTrainer:
                     Например, нет полиномиальных функций и операций one-hot кодирования
                 - ``stable`` -> Самая надежная предустановка, в которую включены наиболее стабильные операции
                 - ``auto`` (По умолчанию) -> Автоматически определяет, какой пресет следует использовать
+            n_jobs (int): Количество процессов для обучения. Значение -1 использует все доступные ядра
+            parallel_evaluation (bool): Параллельная оценка pipeline популяции (иначе параллельно выполняется
+                только обучение внутри pipeline)
+            blas_threads (int, optional): Максимальное количество потоков BLAS/OpenMP
+            composition_subsample (float, optional): Размер подвыборки обучающих данных для поиска решения: доля
+                (число из интервала (0, 1]) или количество записей. Найденный pipeline затем обучается на всех
+                обучающих данных
+            early_stopping_iterations (int, optional): Количество поколений без значимого улучшения лучшей метрики,
+                после которого поиск решения останавливается. По умолчанию определяется FEDOT по `timeout`
+            early_stopping_timeout (float, optional): Время (в минутах) без значимого улучшения лучшей метрики,
+                после которого поиск решения останавливается
+            convergence_epsilon (float): Минимальное относительное улучшение лучшей метрики, которое считается
+                значимым. Значение 0 считает значимым любое улучшение
+            warm_start_path (PathLike, optional): Путь до ранее сохранённой модели. Если задан, то её pipeline
+                используется как начальное приближение для поиска решения
+            reference_metrics (dict[str, float], optional): Метрики ранее сохранённой модели
+            refit_drift_threshold (float, optional): Допустимое относительное ухудшение метрики ранее сохранённой
+                модели на новых тестовых данных. Если ухудшение не превышает порог, то поиск решения не выполняется,
+                а pipeline ранее сохранённой модели дообучается на новых данных
+            progress_callback (Callable[[int, float], None], optional): Функция, вызываемая после каждого поколения
+                поиска решения с номером поколения и лучшим значением целевой метрики
 
         Returns:
-            (dict[str, any]): Словарь с информацией о модели и её метриках
+            (tuple[Fedot, dict[str, float], str, float]): Обученная модель, её метрики, режим обучения
+                ('compose', 'warm_start' или 'refit') и фактическое время обучения (в минутах)
         """
         available_tasks = set(metric.name for metric in TargetTrainMetricEnum)
         if task not in available_tasks:
@@ -81,39 +138,189 @@ class AutoMLTrainer:
 
         # Загрузим данные
         train_data, test_data = load_fedot_train_data_from_csv(
-            data_path, task, target_columns=target_columns, index_col=index_col
+            data_path,
+            task,
+            target_columns=target_columns,
+            index_col=index_col,
+            cache_root=config_manager.train_config.dataset_cache_root,
         )
 
+        # Определим режим обучения
+        train_mode = "compose"
+        initial_pipeline = None
+        if warm_start_path is not None:
+            train_mode = "warm_start"
+            if refit_drift_threshold is not None and reference_metrics is not None:
+                drift = self._estimate_drift(
+                    warm_start_path, task, test_data, test_metrics, reference_metrics
+                )
+                TRAIN_LOGGER.info(
+                    f"<{task_id}> Saved model metric drift on new data is {drift:.4f}"
+                )
+                if drift <= refit_drift_threshold:
+                    train_mode = "refit"
+            initial_pipeline = Pipeline().load(str(warm_start_path))
+            # Сбросим обученные операции и предобработку, чтобы pipeline обучился на новых данных
+            initial_pipeline.unfit()
+
+        # Поиск решения может выполняться на подвыборке данных
+        composition_data = train_data
+        if train_mode != "refit" and composition_subsample is not None:
+            composition_data = subsample_train_data(
+                train_data, composition_subsample, task
+            )
+
         # Создадим модель
-        model = (
+        builder = (
             FedotBuilder(problem=task)
             .setup_composition(
                 timeout=timeout, preset=composition_preset or "auto", with_tuning=True
             )
+            .setup_parallelization(
+                n_jobs=n_jobs,
+                parallelization_mode=(
+                    "populational" if parallel_evaluation else "sequential"
+                ),
+            )
             .setup_pipeline_evaluation(metric=target_metric, cv_folds=3)
             .setup_data_preprocessing(use_auto_preprocessing=True)
             .setup_output(
-                logging_level=logging.ERROR, show_progress=False, keep_history=False
+                # История оптимизации нужна для оценки количества рассмотренных pipeline
+                logging_level=logging.ERROR,
+                show_progress=False,
+                keep_history=True,
+            )
+        )
+        if train_mode == "warm_start":
+            builder = builder.setup_evolution(initial_assumption=initial_pipeline)
+        # Остановка поиска решения при отсутствии улучшений (незаданные параметры определяются FEDOT)
+        early_stopping = {
+            "early_stopping_iterations": early_stopping_iterations,
+            "early_stopping_timeout": early_stopping_timeout,
+        }
+        builder = builder.setup_evolution(
+            **{
+                name: value
+                for name, value in early_stopping.items()
+                if value is not None
+            }
+        )
+        train_config = config_manager.train_config
+        evaluation_cache = None
+        data_key = ""
+        if train_config.evaluation_cache_path is not None:
+            # Оценки pipeline переиспользуются между запусками обучения на тех же данных
+            evaluation_cache = EvaluationCache(
+                train_config.evaluation_cache_path,
+                max_entries=train_config.evaluation_cache_max_entries,
+            )
+            # Хеширование данных проходит по всей выборке, поэтому выполняется только для кеша
+            data_key = compute_data_hash(composition_data)
+        builder = builder.setup_evolution(
+            optimizer=functools.partial(
+                AutoMLEvoGraphOptimizer,
+                evaluation_cache=evaluation_cache,
+                data_key=data_key,
+                convergence_epsilon=convergence_epsilon,
+                progress_callback=(
+                    functools.partial(_report_target_metric, progress_callback)
+                    if progress_callback is not None
+                    else None
+                ),
             )
-            .build()
         )
+        model = builder.build()
         # Обучим модель
         TRAIN_LOGGER.info(
-            f"<{task_id}> Start train model from '{data_path}' "
+            f"<{task_id}> Start train model ({train_mode}) from '{data_path}' "
             f"by {len(train_data.target)+len(test_data.target)} samples"  # type: ignore
         )
-        model.fit(features=train_data)
-
-        # Получим метрики
-        model.predict(test_data)
-        model_metrics = model.get_metrics(metric_names=test_metrics)
+        with limit_threads(blas_threads):
+            fit_started = time.perf_counter()
+            if train_mode == "refit":
+                # Обучим сохранённый pipeline без поиска решения
+                model.fit(features=train_data, predefined_model=initial_pipeline)
+            else:
+                model.fit(features=composition_data)
+            fit_time = time.perf_counter() - fit_started
+            self._log_composition_throughput(model, fit_time, task_id)
+
+            if composition_data is not train_data:
+                # Обучим найденный pipeline на всех обучающих данных
+                TRAIN_LOGGER.info(
+                    f"<{task_id}> Refit pipeline found on {len(composition_data.target)} samples "  # type: ignore
+                    f"on full train data"
+                )
+                final_pipeline: Pipeline = model.current_pipeline  # type: ignore
+                final_pipeline.unfit()
+                model.fit(features=train_data, predefined_model=final_pipeline)
+            train_time = (time.perf_counter() - fit_started) / 60
+
+            # Получим метрики
+            model.predict(test_data)
+            model_metrics = model.get_metrics(metric_names=test_metrics)
         TRAIN_LOGGER.info(
-            f"<{task_id}> Finish train model "
+            f"<{task_id}> Finish train model in {train_time:.2f} min "
             f"with pipeline {model.current_pipeline.graph_description} "  # type: ignore
             f"and metrics {model_metrics}"
         )
 
-        return model, model_metrics
+        return model, model_metrics, train_mode, train_time
+
+    @staticmethod
+    def _count_evaluated_pipelines(model: Fedot) -> int | None:
+        """Количество уникальных pipeline, рассмотренных при поиске решения (None, если поиск не выполнялся)"""
+        if model.history is None or model.history.is_empty():
+            return None
+        return len(
+            {
+                individual.uid
+                for generation in model.history.generations
+                for individual in generation
+            }
+        )
+
+    @classmethod
+    def _log_composition_throughput(cls, model: Fedot, fit_time: float, task_id: str):
+        """Логирование количества рассмотренных при поиске решения pipeline в минуту"""
+        evaluated = cls._count_evaluated_pipelines(model)
+        if evaluated is None:
+            return
+        TRAIN_LOGGER.info(
+            f"<{task_id}> Evaluated {evaluated} pipelines in {fit_time / 60:.2f} min "
+            f"({evaluated / max(fit_time / 60, 1e-9):.1f} pipelines/min)"
+        )
+
+    @staticmethod
+    def _estimate_drift(
+        model_path: PathLike,
+        task: str,
+        test_data: InputData,
+        test_metrics: list[str],
+        reference_metrics: dict[str, float],
+    ) -> float:
+        """
+        Оценка дрейфа данных как относительного ухудшения метрики сохранённой модели на новых тестовых данных
+
+        Returns:
+            (float): Относительное ухудшение метрики (отрицательное, если метрика улучшилась)
+        """
+        model = Fedot(problem=task)
+        model.load(model_path)
+        model.predict(test_data)
+        current_metrics = model.get_metrics(metric_names=test_metrics)
+        current_metrics = {name: float(m) for name, m in current_metrics.items()}
+        if "mse" in reference_metrics:
+            reference, current = reference_metrics["mse"], current_metrics["mse"]
+            return (current - reference) / max(abs(reference), 1e-12)
+        elif "roc_auc" in reference_metrics:
+            reference, current = (
+                reference_metrics["roc_auc"],
+                current_metrics["roc_auc"],
+            )
+            return (reference - current) / max(abs(reference), 1e-12)
+        else:
+            raise RuntimeError(f"Metrics dictionary must contain 'mse' or 'roc_auc'")
 
     @staticmethod
     def _compare_metrics(first: dict[str, float], second: dict[str, float]) -> bool:
@@ -140,6 +347,16 @@ class AutoMLTrainer:
         timeout: float = 5,
         if_exist: Literal["best", "last"] = "best",
         composition_preset: str | None = None,
+        n_jobs: int = -1,
+        parallel_evaluation: bool = True,
+        blas_threads: int | None = None,
+        composition_subsample: float | None = None,
+        early_stopping_iterations: int | None = None,
+        early_stopping_timeout: float | None = None,
+        convergence_epsilon: float = 1e-3,
+        warm_start: bool = False,
+        refit_drift_threshold: float | None = None,
+        progress_callback: Callable[[int, float], None] | None = None,
     ):
         """
         Функция обучения моделей AutoML
@@ -161,9 +378,27 @@ class AutoMLTrainer:
                     Например, нет полиномиальных функций и операций one-hot кодирования
                 - ``stable`` -> Самая надежная предустановка, в которую включены наиболее стабильные операции
                 - ``auto`` (По умолчанию) -> Автоматически определяет, какой пресет следует использовать
+            n_jobs (int): Количество процессов для обучения. Значение -1 использует все доступные ядра
+            parallel_evaluation (bool): Параллельная оценка pipeline популяции (иначе параллельно выполняется
+                только обучение внутри pipeline)
+            blas_threads (int, optional): Максимальное количество потоков BLAS/OpenMP
+            composition_subsample (float, optional): Размер подвыборки обучающих данных для поиска решения: доля
+                или количество записей. Найденный pipeline затем обучается на всех обучающих данных
+            early_stopping_iterations (int, optional): Количество поколений без значимого улучшения лучшей метрики,
+                после которого поиск решения останавливается. По умолчанию определяется FEDOT по `timeout`
+            early_stopping_timeout (float, optional): Время (в минутах) без значимого улучшения лучшей метрики,
+                после которого поиск решения останавливается
+            convergence_epsilon (float): Минимальное относительное улучшение лучшей метрики, которое считается
+                значимым
+            warm_start (bool): Начать поиск решения с pipeline модели, ранее сохранённой в save_model_path
+            refit_drift_threshold (float, optional): Допустимое относительное ухудшение метрики ранее сохранённой
+                модели на новых данных, при котором вместо поиска решения её pipeline дообучается
+                (только вместе с warm_start)
+            progress_callback (Callable[[int, float], None], optional): Функция, вызываемая после каждого поколения
+                поиска решения с номером поколения и лучшим значением целевой метрики
 
         Returns:
-            (dict[str, any]): Словарь с информацией о модели и её метриках
+            (dict[str, any]): Словарь с информацией о модели, её метриках и фактическом времени обучения
         """
         save_model_path = Path(save_model_path)
         task_id = str(uuid.uuid4())[:8]
@@ -172,9 +407,14 @@ class AutoMLTrainer:
         old_metrics = None
         if old_metrics_path.exists():
             old_metrics = read_yaml(old_metrics_path)
+        if warm_start and old_metrics is None:
+            TRAIN_LOGGER.warning(
+                f"<{task_id}> No found saved model by path {save_model_path} to warm start, "
+                "the search starts from scratch"
+            )
 
         # Обучим модель
-        model, new_metrics = self._train_model(
+        model, new_metrics, train_mode, train_time = self._train_model(
             data_path=data_path,
             task=task,
             target_columns=target_columns,
@@ -182,6 +422,19 @@ class AutoMLTrainer:
             timeout=timeout,
             task_id=task_id,
             composition_preset=composition_preset,
+            n_jobs=n_jobs,
+            parallel_evaluation=parallel_evaluation,
+            blas_threads=blas_threads,
+            composition_subsample=composition_subsample,
+            early_stopping_iterations=early_stopping_iterations,
+            early_stopping_timeout=early_stopping_timeout,
+            convergence_epsilon=convergence_epsilon,
+            warm_start_path=(
+                save_model_path if warm_start and old_metrics is not None else None
+            ),
+            reference_metrics=old_metrics,
+            refit_drift_threshold=refit_drift_threshold,
+            progress_callback=progress_callback,
         )
         # Избавимся от скаляров
         new_metrics = {name: float(m) for name, m in new_metrics.items()}
@@ -202,10 +455,29 @@ class AutoMLTrainer:
             if is_old_model_exist:
                 shutil.move(save_model_path, cashed_model_path)
             try:
+                # Упакованная модель, оставшаяся в каталоге, относится к прежней модели
+                Path(save_model_path, PACKED_MODEL_FILENAME).unlink(missing_ok=True)
                 # Сохраним модель
                 model_pipeline.save(str(save_model_path), create_subdir=False)
-                # Сохраним метрики
+                # Сохраним упакованную модель для быстрой загрузки при предсказании
+                try:
+                    save_packed_artifact(
+                        model_pipeline,
+                        Path(save_model_path, PACKED_MODEL_FILENAME),
+                        meta={"task": task, **describe_saved_model(save_model_path)},
+                    )
+                except Exception as e:
+                    # Модель остаётся доступной в формате FEDOT
+                    TRAIN_LOGGER.warning(
+                        f"<{task_id}> Couldn't save packed model: ({type(e).__name__}) {e}"
+                    )
+                # Сохраним метрики модели
                 write_yaml(new_metrics, Path(save_model_path, "metrics.yaml"))
+                # Сохраним режим и фактическое время обучения (в минутах) отдельно от метрик
+                write_yaml(
+                    {"mode": train_mode, "train_time": train_time},
+                    Path(save_model_path, "train_info.yaml"),
+                )
                 is_new_model_saving = True
                 TRAIN_LOGGER.info(
                     f"<{task_id}> Successfully save train model to {save_model_path}"
@@ -222,9 +494,106 @@ class AutoMLTrainer:
             "pipeline": model_pipeline.graph_description,
             "metrics": new_metrics,
             "save": is_new_model_saving,
+            "mode": train_mode,
+            "train_time": train_time,
+            "evaluated_pipelines": self._count_evaluated_pipelines(model),
         }
 
 
+def train_from_data_root(
+    data_root: PathLike,
+    save_dir: PathLike = Path("runs"),
+    save_name: str | None = None,
+    timeout: float = 5,
+    composition_preset: str | None = None,
+    n_jobs: int = -1,
+    parallel_evaluation: bool = True,
+    blas_threads: int | None = None,
+    composition_subsample: float | None = None,
+    early_stopping_iterations: int | None = None,
+    early_stopping_timeout: float | None = None,
+    convergence_epsilon: float = 1e-3,
+    warm_start: bool = False,
+    refit_drift_threshold: float | None = None,
+    progress_callback: Callable[[int, float], None] | None = None,
+) -> dict:
+    """
+    Обучение модели AutoML на наборе данных, описанном файлом `config.yaml`
+
+    Args:
+        data_root (PathLike): Путь до каталога набора данных с файлом 'config.yaml'
+        save_dir (PathLike): Каталог для сохранения весов моделей
+        save_name (str, optional): Имя каталога весов модели. По умолчанию формируется из имени набора данных
+            и текущего времени
+        timeout (float): Максимально допустимое время (в минутах) для поиска оптимального решения
+        composition_preset (str, optional): Параметр выбора моделей для подбора решения
+            (см. `AutoMLTrainer.train`)
+        n_jobs (int): Количество процессов для обучения. Значение -1 использует все доступные ядра
+        parallel_evaluation (bool): Параллельная оценка pipeline популяции
+        blas_threads (int, optional): Максимальное количество потоков BLAS/OpenMP
+        composition_subsample (float, optional): Размер подвыборки для поиска решения (см. `AutoMLTrainer.train`)
+        early_stopping_iterations (int, optional): Количество поколений без значимого улучшения для остановки
+            поиска решения (см. `AutoMLTrainer.train`)
+        early_stopping_timeout (float, optional): Время (в минутах) без значимого улучшения для остановки
+            поиска решения (см. `AutoMLTrainer.train`)
+        convergence_epsilon (float): Порог значимого улучшения метрики (см. `AutoMLTrainer.train`)
+        warm_start (bool): Начать поиск решения с ранее сохранённой модели (см. `AutoMLTrainer.train`).
+            Требует задания save_name
+        refit_drift_threshold (float, optional): Порог дрейфа для дообучения ранее сохранённой модели
+            (см. `AutoMLTrainer.train`)
+        progress_callback (Callable[[int, float], None], optional): Функция хода поиска решения
+            (см. `AutoMLTrainer.train`)
+
+    Returns:
+        (dict[str, any]): Словарь с информацией о модели, её метриках и пути сохранения
+
+    Raises:
+        FileNotFoundError: Если не найден файл 'config.yaml'
+        ValueError: Если warm_start задан без save_name
+    """
+    # Без имени каталога модель сохраняется в новый каталог, и продолжать обучение не с чего
+    if warm_start and save_name is None:
+        raise ValueError("Warm start requires the name of the saved model (save_name)")
+
+    # Считаем конфигурацию датасета
+    data_root = Path(data_root)
+    data_config_path = Path(data_root, "config.yaml")
+    if not data_config_path.exists():
+        raise FileNotFoundError(f"Not found 'config.yaml' file by path {data_root}")
+    data_config = read_yaml(data_config_path)
+
+    # Получим путь до данных
+    data_path = Path(data_root, data_config["train_dataset"])
+    # Сформируем путь сохранения модели
+    model_name = (
+        save_name or f"{data_root.name}_{datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}"
+    )
+    save_model_path = Path(save_dir, model_name)
+
+    # Обучим модель
+    trainer = AutoMLTrainer()
+    model_info = trainer.train(
+        data_path=data_path,
+        task=data_config["task"],
+        target_columns=data_config["target_columns"],
+        index_col=data_config.get("index_col"),
+        save_model_path=save_model_path,
+        timeout=timeout,
+        composition_preset=composition_preset,
+        n_jobs=n_jobs,
+        parallel_evaluation=parallel_evaluation,
+        blas_threads=blas_threads,
+        composition_subsample=composition_subsample,
+        early_stopping_iterations=early_stopping_iterations,
+        early_stopping_timeout=early_stopping_timeout,
+        convergence_epsilon=convergence_epsilon,
+        warm_start=warm_start,
+        refit_drift_threshold=refit_drift_threshold,
+        progress_callback=progress_callback,
+    )
+    return {**model_info, "save_model_path": str(save_model_path)}
+
+
 def parse_opt():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -249,7 +618,25 @@ def parse_opt():
         "          For example, there are no polynomial features and one-hot encoding operations"
         "   - ``stable`` -> The most reliable preset in which the most stable operations are included"
         "   - ``auto`` (Default) -> Automatically determine which preset should be used",
-        default="runs",
+        default=None,
+    )
+    parser.add_argument(
+        "-j",
+        "--n-jobs",
+        type=int,
+        help="Number of parallel jobs for composition and cross-validation (-1 means all cores)",
+        default=-1,
+    )
+    parser.add_argument(
+        "--sequential-evaluation",
+        action="store_true",
+        help="evaluate population pipelines one by one, parallelizing only fitting inside a pipeline",
+    )
+    parser.add_argument(
+        "--blas-threads",
+        type=int,
+        help="The maximum number of BLAS/OpenMP threads",
+        default=None,
     )
     parser.add_argument(
         "--save-dir",
@@ -260,38 +647,70 @@ def parse_opt():
     parser.add_argument(
         "--save-name", type=str, help="save result model weights name", default=None
     )
+    parser.add_argument(
+        "--subsample",
+        dest="composition_subsample",
+        type=float,
+        help="subsample of train data used for the search: a fraction in (0, 1] or a number of rows; "
+        "the found pipeline is refitted on the full train data",
+        default=None,
+    )
+    parser.add_argument(
+        "--early-stopping-iterations",
+        type=int,
+        help="stop the search after this number of generations without improvement above epsilon "
+        "(by default it is determined by FEDOT from the timeout)",
+        default=None,
+    )
+    parser.add_argument(
+        "--early-stopping-timeout",
+        type=float,
+        help="stop the search after this time (in minutes) without improvement above epsilon",
+        default=None,
+    )
+    parser.add_argument(
+        "--epsilon",
+        dest="convergence_epsilon",
+        type=float,
+        help="the minimal relative improvement of the best metric considered significant",
+        default=1e-3,
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="start the search from the pipeline of the model already saved by the same path "
+        "(requires --save-name)",
+    )
+    parser.add_argument(
+        "--refit-drift-threshold",
+        type=float,
+        help="with --warm-start: the allowed relative degradation of the saved model metric on new data "
+        "at which the saved pipeline is refitted without search",
+        default=None,
+    )
 
-    return parser.parse_args()
+    opt = parser.parse_args()
+    if opt.warm_start and opt.save_name is None:
+        parser.error("--warm-start requires --save-name of the saved model")
+    return opt
 
 
 if __name__ == "__main__":
     opt = vars(parse_opt())
 
-    # Считаем конфигурацию датасета
-    data_root = Path(opt["data_root"])
-    data_config_path = Path(data_root, "config.yaml")
-    if not data_config_path.exists():
-        raise FileNotFoundError(f"Not found 'config.yaml' file by path {data_root}")
-    data_config = read_yaml(data_config_path)
-
-    # Получим путь до данных
-    data_path = Path(data_root, data_config["train_dataset"])
-    # Сформируем путь сохранения модели
-    model_name = (
-        opt["save_name"]
-        or f"{data_root.name}_{datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}"
-    )
-    save_model_path = Path(opt["save_dir"], model_name)
-
-    # Обучим модель
-    task = data_config["task"]
-    trainer = AutoMLTrainer()
-    model_info = trainer.train(
-        data_path=data_path,
-        task=task,
-        target_columns=data_config["target_columns"],
-        index_col=data_config.get("index_col"),
-        save_model_path=save_model_path,
+    model_info = train_from_data_root(
+        data_root=opt["data_root"],
+        save_dir=opt["save_dir"],
+        save_name=opt["save_name"],
         timeout=opt.get("timeout", 5),
         composition_preset=opt.get("composition_preset"),
+        n_jobs=opt["n_jobs"],
+        parallel_evaluation=not opt["sequential_evaluation"],
+        blas_threads=opt["blas_threads"],
+        composition_subsample=opt["composition_subsample"],
+        early_stopping_iterations=opt["early_stopping_iterations"],
+        early_stopping_timeout=opt["early_stopping_timeout"],
+        convergence_epsilon=opt["convergence_epsilon"],
+        warm_start=opt["warm_start"],
+        refit_drift_threshold=opt["refit_drift_threshold"],
     )
@@ -0,0 +1,355 @@
+"""
+Параллельное обучение моделей AutoML на нескольких наборах данных.
+
+Каждый набор данных обучается в отдельном процессе пула. Процессу выделяется фиксированное количество
+ядер: ограничивается число потоков BLAS/OpenMP и (где поддерживается) привязка процесса к ядрам,
+поэтому задачи не конкурируют за процессор и общее время обучения сокращается пропорционально
+количеству доступных ядер.
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from src.core.logger import LoggerFactory
+from src.core.parallel import set_thread_limit_env
+from src.utils import read_yaml, write_yaml
+
+ORCHESTRATOR_LOGGER = LoggerFactory.get_logger("TrainOrchestrator")
+
+
+@dataclass
+class DatasetTrainJob:
+    """Задача обучения модели на наборе данных"""
+
+    data_root: Path
+    """ Путь до каталога набора данных с файлом 'config.yaml' """
+    save_name: str
+    """ Имя каталога для сохранения весов модели """
+    size: int = 0
+    """ Размер файла обучающих данных (в байтах), используется для упорядочивания задач """
+
+
+def get_available_cpus() -> list[int]:
+    """Получение списка ядер, доступных текущему процессу"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _init_worker(cpu_slices: Any) -> None:
+    """
+    Инициализация процесса пула: ограничение потоков и привязка к выделенным ядрам.
+
+    Выполняется до импорта вычислительных библиотек, иначе ограничения потоков не будут учтены.
+    """
+    cpus: list[int] = cpu_slices.get()
+    set_thread_limit_env(len(cpus))
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+
+def _run_job(
+    job: DatasetTrainJob,
+    save_dir: str,
+    timeout: float,
+    composition_preset: str | None,
+    n_jobs: int,
+) -> dict[str, Any]:
+    """Обучение модели в процессе пула"""
+    # Импорт выполняется внутри процесса пула после ограничения количества потоков
+    from src.core.train import train_from_data_root
+
+    return train_from_data_root(
+        data_root=job.data_root,
+        save_dir=save_dir,
+        save_name=job.save_name,
+        timeout=timeout,
+        composition_preset=composition_preset,
+        n_jobs=n_jobs,
+        # Выделенные ядра заняты параллельной оценкой pipeline - по одному потоку BLAS на процесс оценки
+        blas_threads=1,
+    )
+
+
+def build_jobs(data_roots: list[PathLike]) -> list[DatasetTrainJob]:
+    """
+    Формирование задач обучения по каталогам наборов данных
+
+    Задачи упорядочиваются по убыванию размера обучающих данных: самые долгие задачи запускаются первыми,
+    что уменьшает время простоя процессов в конце обучения.
+
+    Raises:
+        ValueError: Несколько каталогов наборов данных имеют одинаковое имя (веса моделей и результаты
+            в отчёте перезаписывали бы друг друга)
+    """
+    jobs = []
+    data_roots_by_name: dict[str, list[Path]] = {}
+    for data_root in data_roots:
+        data_root = Path(data_root)
+        data_roots_by_name.setdefault(data_root.name, []).append(data_root)
+    duplicates = {
+        name: paths for name, paths in data_roots_by_name.items() if len(paths) > 1
+    }
+    if duplicates:
+        raise ValueError(
+            "Dataset directories must have unique names: "
+            + "; ".join(
+                f"'{name}' is used by {', '.join(map(str, paths))}"
+                for name, paths in duplicates.items()
+            )
+        )
+
+    for data_root in data_roots:
+        data_root = Path(data_root)
+        data_config_path = Path(data_root, "config.yaml")
+        if not data_config_path.exists():
+            raise FileNotFoundError(f"Not found 'config.yaml' file by path {data_root}")
+        data_path = Path(data_root, read_yaml(data_config_path)["train_dataset"])
+        size = data_path.stat().st_size if data_path.exists() else 0
+        jobs.append(
+            DatasetTrainJob(data_root=data_root, save_name=data_root.name, size=size)
+        )
+    return sorted(jobs, key=lambda job: job.size, reverse=True)
+
+
+def get_job_timeout(
+    timeout: float,
+    deadline: float | None,
+    min_timeout: float,
+) -> float | None:
+    """
+    Определение времени (в минутах) поиска решения для очередной задачи
+
+    Args:
+        timeout (float): Максимально допустимое время поиска решения для одной задачи
+        deadline (float, optional): Момент (по `time.monotonic`) исчерпания общего бюджета времени
+        min_timeout (float): Минимальное время поиска решения, при котором задача запускается
+
+    Returns:
+        (float | None): Время поиска решения или None, если остатка бюджета недостаточно для запуска задачи
+    """
+    job_timeout = timeout
+    if deadline is not None:
+        job_timeout = min(timeout, (deadline - time.monotonic()) / 60)
+    if job_timeout < min_timeout:
+        return None
+    return job_timeout
+
+
+def orchestrate_training(
+    data_roots: list[PathLike],
+    save_dir: PathLike = Path("runs"),
+    cpus_per_job: int = 1,
+    max_workers: int | None = None,
+    budget: float | None = None,
+    timeout: float = 5,
+    min_timeout: float = 1,
+    composition_preset: str | None = None,
+    report_path: PathLike | None = None,
+) -> dict[str, Any]:
+    """
+    Параллельное обучение моделей AutoML на нескольких наборах данных
+
+    Args:
+        data_roots (list[PathLike]): Пути до каталогов наборов данных с файлами 'config.yaml'
+        save_dir (PathLike): Каталог для сохранения весов моделей (имя модели совпадает с именем каталога
+            набора данных, поэтому имена каталогов должны быть уникальны)
+        cpus_per_job (int): Количество ядер, выделяемых на одну задачу обучения
+        max_workers (int, optional): Максимальное количество одновременно обучаемых моделей.
+            По умолчанию определяется количеством доступных ядер
+        budget (float, optional): Общий бюджет времени (в минутах) на обучение всех моделей. Время поиска
+            решения для задачи ограничивается оставшимся бюджетом, задачи без достаточного остатка пропускаются
+        timeout (float): Максимально допустимое время (в минутах) поиска решения для одной задачи
+        min_timeout (float): Минимальное время (в минутах) поиска решения, при котором задача запускается
+        composition_preset (str, optional): Параметр выбора моделей для подбора решения
+            (см. `AutoMLTrainer.train`)
+        report_path (PathLike, optional): Путь для сохранения итогового отчёта в формате yaml
+
+    Returns:
+        (dict[str, Any]): Итоговый отчёт с результатами всех задач
+    """
+    jobs = build_jobs(data_roots)
+    available_cpus = get_available_cpus()
+    cpus_per_job = max(1, min(cpus_per_job, len(available_cpus)))
+    workers = max(1, len(available_cpus) // cpus_per_job)
+    if max_workers is not None:
+        workers = max(1, min(workers, max_workers))
+    workers = min(workers, len(jobs)) or 1
+
+    # Разделим ядра между процессами пула
+    context = multiprocessing.get_context("spawn")
+    cpu_slices = context.Queue()
+    for worker_index in range(workers):
+        start = worker_index * cpus_per_job
+        cpu_slices.put(available_cpus[start : start + cpus_per_job])
+
+    started_at = datetime.now()
+    started = time.monotonic()
+    deadline = started + budget * 60 if budget is not None else None
+    ORCHESTRATOR_LOGGER.info(
+        f"Start training {len(jobs)} models by {workers} workers with {cpus_per_job} cpus per job"
+    )
+
+    results: dict[str, dict[str, Any]] = {}
+    pending = deque(jobs)
+    running: dict[Future, tuple[DatasetTrainJob, float, float]] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(cpu_slices,),
+    ) as executor:
+        while pending or running:
+            # Запустим задачи на свободные процессы
+            while pending and len(running) < workers:
+                job = pending.popleft()
+                job_timeout = get_job_timeout(timeout, deadline, min_timeout)
+                if job_timeout is None:
+                    ORCHESTRATOR_LOGGER.warning(
+                        f"Skip training on '{job.data_root}': time budget is exhausted"
+                    )
+                    results[job.save_name] = {
+                        "data_root": str(job.data_root),
+                        "status": "skipped",
+                    }
+                    continue
+                future = executor.submit(
+                    _run_job,
+                    job,
+                    str(save_dir),
+                    job_timeout,
+                    composition_preset,
+                    cpus_per_job,
+                )
+                running[future] = (job, time.monotonic(), job_timeout)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, job_started, job_timeout = running.pop(future)
+                result: dict[str, Any] = {
+                    "data_root": str(job.data_root),
+                    "timeout": job_timeout,
+                    "duration": time.monotonic() - job_started,
+                }
+                try:
+                    result.update(future.result(), status="ok")
+                    ORCHESTRATOR_LOGGER.info(
+                        f"Finish training on '{job.data_root}' with metrics {result['metrics']}"
+                    )
+                except Exception as e:
+                    result.update(status="failed", error=f"({type(e).__name__}) {e}")
+                    ORCHESTRATOR_LOGGER.error(
+                        f"Training on '{job.data_root}' failed: {result['error']}"
+                    )
+                results[job.save_name] = result
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "duration": time.monotonic() - started,
+        "workers": workers,
+        "cpus_per_job": cpus_per_job,
+        "budget": budget,
+        "summary": {
+            status: sum(result["status"] == status for result in results.values())
+            for status in ("ok", "failed", "skipped")
+        },
+        "jobs": {job.save_name: results[job.save_name] for job in jobs},
+    }
+    if report_path is not None:
+        Path(report_path).parent.mkdir(exist_ok=True, parents=True)
+        write_yaml(report, report_path)
+        ORCHESTRATOR_LOGGER.info(f"Save training report to {report_path}")
+    return report
+
+
+def parse_opt():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "data_roots",
+        type=str,
+        nargs="+",
+        help="Root paths to datasets with 'config.yaml' file",
+    )
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="The maximum allowed time (in minutes) to find the optimal solution for one dataset",
+        default=5,
+    )
+    parser.add_argument(
+        "-b",
+        "--budget",
+        type=float,
+        help="The total time budget (in minutes) for training on all datasets",
+        default=None,
+    )
+    parser.add_argument(
+        "--min-timeout",
+        type=float,
+        help="The minimum time (in minutes) to find a solution, otherwise the dataset is skipped",
+        default=1,
+    )
+    parser.add_argument(
+        "-c",
+        "--cpus-per-job",
+        type=int,
+        help="Number of CPU cores allotted to each training job",
+        default=1,
+    )
+    parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        help="The maximum number of simultaneously trained models",
+        default=None,
+    )
+    parser.add_argument(
+        "-p",
+        "--preset",
+        dest="composition_preset",
+        type=str,
+        help="The model selection parameter for selecting a solution (see src.core.train)",
+        default=None,
+    )
+    parser.add_argument(
+        "--save-dir",
+        type=str,
+        help="save result model weights root dir",
+        default="runs",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        help="path to save summary report in yaml format",
+        default=None,
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    opt = vars(parse_opt())
+
+    orchestrate_training(
+        data_roots=opt["data_roots"],
+        save_dir=opt["save_dir"],
+        cpus_per_job=opt["cpus_per_job"],
+        max_workers=opt["max_workers"],
+        budget=opt["budget"],
+        timeout=opt["timeout"],
+        min_timeout=opt["min_timeout"],
+        composition_preset=opt["composition_preset"],
+        report_path=opt["report"] or Path(opt["save_dir"], "train_report.yaml"),
+    )
@@ -0,0 +1,90 @@
+import threading
+import time
+from functools import cache
+from typing import Any, Hashable
+
+from src.config import config_manager
+
+
+class CatalogCache:
+    """
+    Потокобезопасный кеш метаданных каталога с ограниченным временем жизни записей.
+
+    Предназначен для хранения неизменяемых снимков сущностей (см. `src.database.snapshots`), поэтому
+    значения возвращаются без копирования. Любая запись в таблицы каталога должна сопровождаться вызовом
+    `invalidate`, после чего значения, прочитанные из базы до инвалидации, не попадут в кеш.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10000) -> None:
+        """
+        Args:
+            ttl (float): Время жизни записи (в секундах). Значение <= 0 отключает кеширование
+            max_size (int): Максимальное количество записей в кеше
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items: dict[Hashable, tuple[float, Any]] = {}
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    @property
+    def generation(self) -> int:
+        """Номер поколения кеша, увеличивается при каждой инвалидации"""
+        return self._generation
+
+    def get(self, key: Hashable) -> Any | None:
+        """Получить значение по ключу или None, если запись отсутствует или устарела"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Сохранить значение в кеш
+
+        Args:
+            key (Hashable): Ключ записи
+            value (Any): Неизменяемое значение записи
+            generation (int, optional): Поколение кеша на момент начала чтения значения из базы данных.
+                Если с тех пор произошла инвалидация, значение считается устаревшим и не сохраняется
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._items.pop(key, None)
+            while len(self._items) >= self.max_size:
+                # Словарь сохраняет порядок вставки - удалим самую старую запись
+                del self._items[next(iter(self._items))]
+            self._items[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self) -> None:
+        """
+        Сбросить все записи кеша.
+
+        Снимки сущностей содержат связанные сущности (например, ML модель содержит набор данных),
+        поэтому изменение любой таблицы каталога сбрасывает кеш целиком.
+        """
+        with self._lock:
+            self._items.clear()
+            self._generation += 1
+
+
+@cache
+def get_catalog_cache() -> CatalogCache:
+    """Получение общего для процесса кеша метаданных каталога"""
+    cache_config = config_manager.cache_config
+    return CatalogCache(
+        ttl=cache_config.catalog_ttl, max_size=cache_config.catalog_max_size
+    )
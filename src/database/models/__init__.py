@@ -2,3 +2,6 @@ from .base import Base
 from .dataset import Dataset
 from .task import PredictTask
 from .mlmodel import MLModel
+from .catalog_version import CatalogVersion
+from .seed_checksum import SeedChecksum
+from .train_job import TrainJob
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, String
+
+from .base import Base
+
+
+@dataclass
+class CatalogVersion(Base):
+    """Класс-схема таблицы версий таблиц каталога"""
+
+    __tablename__ = "catalog_versions"
+
+    table_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    """ Название таблицы каталога """
+    version: Mapped[int] = mapped_column(BigInteger(), default=0)
+    """ Счётчик изменений таблицы, увеличивается при каждой записи в таблицу """
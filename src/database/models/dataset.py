@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from dataclasses import dataclass
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import Index, String, ForeignKey
 
 from .base import Base
 
@@ -15,6 +15,10 @@ class Dataset(Base):
     """Класс-схема таблицы наборов данных"""
 
     __tablename__ = "datasets"
+    __table_args__ = (
+        # Фильтрация по задаче с постраничной выдачей в порядке идентификатора
+        Index("ix_datasets_task_id_id", "task_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     """ Идентификатор набора данных """
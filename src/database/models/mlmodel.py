@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, DateTime
+from sqlalchemy import Index, String, ForeignKey, DateTime
 
 from .base import Base
 
@@ -16,6 +16,10 @@ class MLModel(Base):
     """Класс-схема таблицы моделей"""
 
     __tablename__ = "mlmodels"
+    __table_args__ = (
+        # Фильтрация по набору данных с постраничной выдачей в порядке идентификатора
+        Index("ix_mlmodels_dataset_id_id", "dataset_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     """ Идентификатор модели """
@@ -0,0 +1,21 @@
+import datetime
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, String
+
+from .base import Base
+
+
+@dataclass
+class SeedChecksum(Base):
+    """Класс-схема таблицы контрольных сумм применённых файлов автозаполнения"""
+
+    __tablename__ = "seed_checksums"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    """ Название набора автозаполнения (таблицы) """
+    checksum: Mapped[str] = mapped_column(String(64))
+    """ Контрольная сумма (sha256) последнего применённого файла автозаполнения """
+    applied_at: Mapped[datetime.datetime] = mapped_column(DateTime())
+    """ Время применения файла автозаполнения """
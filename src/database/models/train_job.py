@@ -0,0 +1,68 @@
+import datetime
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
+
+from .base import Base
+
+
+@dataclass
+class TrainJob(Base):
+    """Класс-схема таблицы задач обучения моделей"""
+
+    __tablename__ = "train_jobs"
+    __table_args__ = (
+        # Выбор следующей задачи из очереди в порядке постановки и поиск зависших задач
+        Index("ix_train_jobs_status_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    """ Идентификатор задачи обучения """
+    dataset_id: Mapped[int] = mapped_column(
+        ForeignKey("datasets.id", ondelete="CASCADE")
+    )
+    """ Идентификатор набора данных, на котором обучается модель """
+    status: Mapped[str] = mapped_column(String(16), default="queued")
+    """ Состояние задачи: queued, running, succeeded или failed """
+    params: Mapped[dict[str, Any]] = mapped_column(JSON(), default=dict)
+    """ Параметры обучения (см. `AutoMLTrainer.train`) """
+    title: Mapped[str] = mapped_column(String(128), default="Untitled")
+    """ Человекочитаемое название обученной модели """
+    description: Mapped[str] = mapped_column(String(512), default="")
+    """ Человекочитаемое описание обученной модели """
+    model_name: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    """ Системное название обученной модели (имя каталога весов), назначается при первом запуске """
+    attempts: Mapped[int] = mapped_column(Integer(), default=0)
+    """ Количество запусков задачи """
+    max_attempts: Mapped[int] = mapped_column(Integer(), default=3)
+    """ Максимальное количество запусков задачи """
+    worker_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    """ Идентификатор обработчика, выполняющего задачу """
+    progress: Mapped[str] = mapped_column(String(512), default="")
+    """ Последнее сообщение о ходе выполнения задачи """
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON(), nullable=True)
+    """ Результат обучения: pipeline, метрики и время обучения """
+    error: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    """ Сообщение о последней ошибке выполнения """
+    mlmodel_id: Mapped[int | None] = mapped_column(
+        ForeignKey("mlmodels.id", ondelete="SET NULL"), nullable=True
+    )
+    """ Идентификатор зарегистрированной ML модели """
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(), default=datetime.datetime.now
+    )
+    """ Время постановки задачи в очередь """
+    started_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(), nullable=True
+    )
+    """ Время последнего запуска задачи """
+    heartbeat_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(), nullable=True
+    )
+    """ Время последнего подтверждения работы обработчиком """
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(), nullable=True
+    )
+    """ Время завершения задачи """
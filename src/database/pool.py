@@ -0,0 +1,77 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+@dataclass(frozen=True)
+class PoolMetrics:
+    """Снимок состояния пула соединений к базе данных"""
+
+    size: int
+    """ Размер пула (количество постоянно удерживаемых соединений) """
+    max_overflow: int
+    """ Максимальное количество соединений сверх размера пула """
+    checked_in: int
+    """ Количество свободных соединений в пуле """
+    checked_out: int
+    """ Количество выданных соединений """
+    overflow: int
+    """ Текущее количество соединений сверх размера пула (отрицательное, если пул ещё не заполнен) """
+    checkouts: int
+    """ Количество выдач соединений с момента создания пула """
+    timeouts: int
+    """ Количество запросов соединения, завершившихся по таймауту """
+    wait_total: float
+    """ Суммарное время ожидания выдачи соединения (в секундах) """
+    wait_max: float
+    """ Максимальное время ожидания выдачи соединения (в секундах) """
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Асинхронный пул соединений с подсчётом времени ожидания выдачи соединения.
+
+    Время ожидания включает как ожидание освобождения соединения при исчерпании пула,
+    так и установку нового соединения с базой данных.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += elapsed
+            self._wait_max = max(self._wait_max, elapsed)
+        return entry
+
+    def get_metrics(self) -> PoolMetrics:
+        """Получить текущее состояние пула"""
+        with self._stats_lock:
+            return PoolMetrics(
+                size=self.size(),
+                max_overflow=self._max_overflow,
+                checked_in=self.checkedin(),
+                checked_out=self.checkedout(),
+                overflow=self.overflow(),
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                wait_total=self._wait_total,
+                wait_max=self._wait_max,
+            )
@@ -1,30 +1,73 @@
-from typing import Generic, Sequence, TypeVar
+from typing import Any, Generic, Sequence, TypeVar
 
 from sqlalchemy import (
     ColumnElement,
     BinaryExpression,
+    event,
+    inspect,
+    or_,
     select,
+    update,
 )
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.orm.interfaces import ORMOption
-from sqlalchemy.orm import InstrumentedAttribute, selectinload
+from sqlalchemy.orm import InstrumentedAttribute, Session, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import DBAPIError
 
 from . import models
+from .cache import CatalogCache, get_catalog_cache
+from .snapshots import SNAPSHOT_TYPES, Snapshot
 
 Model = TypeVar("Model", bound=models.Base)
 
+CATALOG_CHANGED_KEY = "catalog_changed"
+""" Ключ в `Session.info`, отмечающий изменение таблиц каталога в рамках транзакции """
+
+CATALOG_MODELS: tuple[type[models.Base], ...] = (
+    models.PredictTask,
+    models.Dataset,
+    models.MLModel,
+)
+""" Сущности каталога, изменения которых отслеживаются кешем и счётчиком версий """
+
+SNAPSHOT_RELATIONSHIPS: dict[type[models.Base], list[InstrumentedAttribute]] = {
+    models.MLModel: [models.MLModel.dataset],
+}
+""" Связанные сущности, которые требуется загрузить для построения снимка """
+
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+""" Конструкторы `INSERT ... ON CONFLICT` для поддерживаемых диалектов """
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog_cache_after_commit(session: Session) -> None:
+    """Сброс кеша каталога после фиксации транзакции, изменившей таблицы каталога"""
+    if session.info.pop(CATALOG_CHANGED_KEY, False):
+        get_catalog_cache().invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_catalog_changes_after_rollback(session: Session) -> None:
+    session.info.pop(CATALOG_CHANGED_KEY, None)
+
 
 class DatabaseRepository:
     """Репозиторий для работы с базой данных"""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, cache: CatalogCache | None = None
+    ) -> None:
         self.session = session
+        self.cache = cache
 
     def for_model(self, model: type[Model]) -> "ModelRepository[Model]":
         """Возвращает репозиторий для указанной модели"""
-        return ModelRepository(model, session=self.session)
+        return ModelRepository(model, session=self.session, cache=self.cache)
 
     async def ping(self):
         """Проверка подклюения к базе данных (ping)"""
@@ -39,9 +82,37 @@ class DatabaseRepository:
 class ModelRepository(Generic[Model]):
     """Репозиторий для управления сущностями базы данных."""
 
-    def __init__(self, model: type[Model], session: AsyncSession) -> None:
+    def __init__(
+        self,
+        model: type[Model],
+        session: AsyncSession,
+        cache: CatalogCache | None = None,
+    ) -> None:
         self.model = model
         self.session = session
+        self.cache = cache if cache is not None else get_catalog_cache()
+
+    async def _mark_catalog_changed(self) -> None:
+        """
+        Отметить изменение таблицы сущности каталога.
+
+        Версия таблицы увеличивается в рамках текущей транзакции. Кеш сбрасывается сразу (чтобы не отдавать
+        устаревшие данные внутри транзакции) и повторно после фиксации транзакции, чтобы отбросить значения,
+        прочитанные конкурентными запросами.
+        """
+        if self.model not in CATALOG_MODELS:
+            return
+        table_name = self.model.__tablename__
+        result = await self.session.execute(
+            update(models.CatalogVersion)
+            .where(models.CatalogVersion.table_name == table_name)
+            .values(version=models.CatalogVersion.version + 1)
+        )
+        if result.rowcount == 0:  # type: ignore
+            # Счётчик отсутствует (например, база создана без миграций) - создадим его
+            self.session.add(models.CatalogVersion(table_name=table_name, version=1))
+        self.session.info[CATALOG_CHANGED_KEY] = True
+        self.cache.invalidate()
 
     def _get_instance_from_data(self, data: dict | Model) -> Model:
         """Получение объекта модели из различных источников"""
@@ -59,6 +130,7 @@ class ModelRepository(Generic[Model]):
         """Создать запись сущности в таблице базы данных"""
         instance = self._get_instance_from_data(data=data)
         self.session.add(instance)
+        await self._mark_catalog_changed()
         if auto_commit:
             await self.session.commit()
             await self.session.refresh(instance)
@@ -68,11 +140,86 @@ class ModelRepository(Generic[Model]):
         """Обновить запись сущности в таблице базы данных, если задан primary key, иначе создать новую"""
         instance = self._get_instance_from_data(data=data)
         instance = await self.session.merge(instance)
+        await self._mark_catalog_changed()
         if auto_commit:
             await self.session.commit()
             await self.session.refresh(instance)
         return instance
 
+    async def upsert(
+        self,
+        rows: Sequence[dict[str, Any]],
+        conflict_columns: Sequence[str],
+        auto_commit: bool = True,
+    ) -> None:
+        """
+        Создать или обновить записи сущности одним запросом `INSERT ... ON CONFLICT DO UPDATE`
+
+        Существующие записи обновляются только при отличии значений, поэтому повторная запись
+        тех же данных не создаёт новых версий строк.
+
+        Args:
+            rows (Sequence[dict[str, Any]]): Значения колонок записей. Все записи должны содержать одинаковый
+                набор колонок
+            conflict_columns (Sequence[str]): Колонки уникального ограничения, по которому определяется
+                существующая запись
+            auto_commit (bool): Зафиксировать транзакцию после записи
+
+        Raises:
+            ValueError: Если записи содержат разные наборы колонок или неизвестные колонки
+        """
+        if not rows:
+            return
+        dialect_name = self.session.get_bind().dialect.name
+        insert = UPSERT_DIALECTS.get(dialect_name)
+        if insert is None:
+            raise NotImplementedError(f"Upsert is not supported for '{dialect_name}'")
+
+        table = self.model.__table__
+        # Отсутствующая колонка была бы записана как NULL (значения по умолчанию сервера и функции
+        # не применяются к пакетной вставке), а при обновлении затёрла бы существующее значение
+        column_names = list(rows[0].keys())
+        for row in rows[1:]:
+            if row.keys() != rows[0].keys():
+                raise ValueError(
+                    f"All rows must contain the same columns: {sorted(rows[0].keys())}, "
+                    f"got {sorted(row.keys())}"
+                )
+        unknown_columns = set(column_names) - set(table.columns.keys())
+        if unknown_columns:
+            raise ValueError(
+                f"Unknown columns {sorted(unknown_columns)} for {self.model.__name__}"
+            )
+        values = [dict(row) for row in rows]
+
+        statement = insert(table)
+        # Первичный ключ существующей записи не изменяется: на него могут ссылаться другие таблицы
+        primary_key = set(table.primary_key.columns.keys())
+        update_columns = [
+            name
+            for name in column_names
+            if name not in conflict_columns and name not in primary_key
+        ]
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={name: statement.excluded[name] for name in update_columns},
+                where=or_(
+                    *(
+                        table.columns[name].is_distinct_from(statement.excluded[name])
+                        for name in update_columns
+                    )
+                ),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=list(conflict_columns)
+            )
+        await self.session.execute(statement, values)
+        await self._mark_catalog_changed()
+        if auto_commit:
+            await self.session.commit()
+
     async def get(
         self,
         pk: str | int,
@@ -98,6 +245,54 @@ class ModelRepository(Generic[Model]):
 
         return await self.session.get(self.model, pk, options=options)
 
+    async def get_version(self) -> int:
+        """
+        Получить версию таблицы сущности - счётчик изменений, увеличивающийся при каждой записи
+
+        Returns:
+            int: Версия таблицы (0, если записей в таблицу ещё не было)
+        """
+        version = await self.session.scalar(
+            select(models.CatalogVersion.version).where(
+                models.CatalogVersion.table_name == self.model.__tablename__
+            )
+        )
+        return version or 0
+
+    async def get_snapshot(self, pk: str | int) -> Snapshot | None:
+        """
+        Получить неизменяемый снимок сущности каталога на основе первичного ключа.
+
+        Снимки читаются через кеш каталога: при попадании в кеш запрос к базе данных не выполняется.
+        Снимок содержит связанные сущности (например, снимок ML модели содержит набор данных и задачу).
+
+        Args:
+            pk (str | int): первичный ключ модели
+
+        Returns:
+            Snapshot | None: Снимок сущности модели
+        """
+        snapshot_type = SNAPSHOT_TYPES.get(self.model)
+        if snapshot_type is None:
+            raise ValueError(
+                f"Snapshots are not supported for model {self.model.__name__}"
+            )
+        key = (self.model.__tablename__, pk)
+        snapshot = self.cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        # Запомним поколение кеша до чтения, чтобы не сохранить значение, устаревшее за время запроса
+        generation = self.cache.generation
+        instance = await self.get(
+            pk, with_relationships=SNAPSHOT_RELATIONSHIPS.get(self.model)
+        )
+        if instance is None:
+            return None
+        snapshot = snapshot_type.from_model(instance)  # type: ignore
+        self.cache.set(key, snapshot, generation=generation)
+        return snapshot
+
     async def get_all(
         self,
         *expressions: BinaryExpression | ColumnElement,
@@ -125,10 +320,74 @@ class ModelRepository(Generic[Model]):
         if expressions:
             query = query.where(*expressions)
         if options:
-            query.options(*options)
+            query = query.options(*options)
 
         return list(await self.session.scalars(query))
 
+    async def get_page(
+        self,
+        *expressions: BinaryExpression | ColumnElement,
+        limit: int,
+        after: Any | None = None,
+        columns: Sequence[str] | None = None,
+        with_relationships: Sequence[InstrumentedAttribute] | None = None,
+    ) -> tuple[list[Model] | list[dict[str, Any]], Any | None]:
+        """
+        Получить страницу записей сущности, упорядоченных по первичному ключу (keyset pagination)
+
+        Args:
+            *expressions (ColumnElement | BinaryExpression): параметры фильтрации вида `Model.name == 'foo'`
+            limit (int): Максимальное количество записей на странице
+            after (Any, optional): Значение первичного ключа последней записи предыдущей страницы
+            columns (Sequence[str], optional): Названия колонок для выборки. Если заданы, то вместо сущностей
+                возвращаются словари только с этими колонками (и первичным ключом)
+            with_relationships (Sequence[InstrumentedAttribute] | None): Список связанных моделей вида
+                `Model.relationship_field` для совместной загрузки в рамках политики `selectinload`.
+                Игнорируется при выборке колонок.
+
+        Returns:
+            tuple[list[Model] | list[dict[str, Any]], Any | None]: Записи страницы и значение первичного ключа
+                для запроса следующей страницы (None, если страница последняя)
+        """
+        mapper = inspect(self.model)
+        primary_key = mapper.primary_key[0]
+        pk_name = mapper.get_property_by_column(primary_key).key
+
+        if columns:
+            unknown_columns = set(columns) - set(mapper.columns.keys())
+            if unknown_columns:
+                raise ValueError(
+                    f"Unknown columns {sorted(unknown_columns)} for model {self.model.__name__}"
+                )
+            # Первичный ключ нужен для вычисления курсора следующей страницы
+            column_names = list(dict.fromkeys([pk_name, *columns]))
+            query = select(*(mapper.columns[name] for name in column_names))
+        else:
+            query = select(self.model)
+            if with_relationships:
+                query = query.options(
+                    *(selectinload(relship) for relship in with_relationships)
+                )
+        if expressions:
+            query = query.where(*expressions)
+        if after is not None:
+            query = query.where(primary_key > after)
+        # Запросим на одну запись больше, чтобы определить наличие следующей страницы
+        query = query.order_by(primary_key).limit(limit + 1)
+
+        rows: list
+        if columns:
+            rows = [dict(row._mapping) for row in await self.session.execute(query)]
+        else:
+            rows = list(await self.session.scalars(query))
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_row = rows[-1]
+            next_key = last_row[pk_name] if columns else getattr(last_row, pk_name)
+        return rows, next_key
+
     async def exsist(
         self,
         *expressions: BinaryExpression,
@@ -1,3 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import config_manager
 from .seed_predict_tasks import seed_predict_tasks
 from .seed_datasets import seed_datasets
 from .seed_mlmodles import seed_mlmodels
+
+
+def get_seeding_config_paths() -> list[str]:
+    """Пути до файлов конфигурации автозаполнения в порядке их применения"""
+    sc = config_manager.seeding_config
+    return [
+        sc.predict_tasks_seeding_config,
+        sc.datasets_seeding_config,
+        sc.mlmodels_seeding_config,
+    ]
+
+
+async def seed_database(session: AsyncSession) -> bool:
+    """
+    Заполнение базы данных начальными значениями из файлов конфигурации автозаполнения
+
+    Все изменения применяются в одной транзакции: при ошибке база останется в прежнем состоянии.
+
+    Returns:
+        bool: Была ли применена хотя бы одна конфигурация
+    """
+    changed = False
+    for seeder, config_path in zip(
+        (seed_predict_tasks, seed_datasets, seed_mlmodels), get_seeding_config_paths()
+    ):
+        # Изменение родительских сущностей требует повторного применения зависимых конфигураций
+        changed = await seeder(config_path, session=session, force=changed) or changed
+    await session.commit()
+    return changed
@@ -0,0 +1,52 @@
+import datetime
+import hashlib
+from os import PathLike
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import SeedChecksum
+from src.database.repository import ModelRepository
+
+
+def compute_checksum(config_path: str | PathLike) -> str:
+    """Вычисление контрольной суммы (sha256) файла конфигурации автозаполнения"""
+    digest = hashlib.sha256()
+    with open(config_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def is_seed_applied(name: str, checksum: str, session: AsyncSession) -> bool:
+    """
+    Проверка, был ли уже применён файл автозаполнения с данной контрольной суммой
+
+    Args:
+        name (str): Название набора автозаполнения
+        checksum (str): Контрольная сумма файла конфигурации
+        session (AsyncSession): Сессия к базе данных
+    """
+    applied = await ModelRepository(model=SeedChecksum, session=session).get(name)
+    return applied is not None and applied.checksum == checksum
+
+
+async def save_seed_checksum(name: str, checksum: str, session: AsyncSession) -> None:
+    """
+    Сохранение контрольной суммы применённого файла автозаполнения (без фиксации транзакции)
+
+    Args:
+        name (str): Название набора автозаполнения
+        checksum (str): Контрольная сумма файла конфигурации
+        session (AsyncSession): Сессия к базе данных
+    """
+    await ModelRepository(model=SeedChecksum, session=session).upsert(
+        [
+            {
+                "name": name,
+                "checksum": checksum,
+                "applied_at": datetime.datetime.now(),
+            }
+        ],
+        conflict_columns=["name"],
+        auto_commit=False,
+    )
@@ -8,17 +8,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import Dataset, PredictTask
 from src.database.repository import ModelRepository
 from src.config import config_manager
+from .checksum import compute_checksum, is_seed_applied, save_seed_checksum
 
 
-async def seed_datasets(config_path: str | PathLike, session: AsyncSession):
+async def seed_datasets(
+    config_path: str | PathLike, session: AsyncSession, force: bool = False
+) -> bool:
     """
     Актуализация данных Datasets на основе заданной конфигурации
 
+    Изменения записываются без фиксации транзакции, фиксация выполняется вызывающей стороной.
+
     Args:
         config_path (str | PathLike): Путь до файла конфигурации в формате json, содержащего необходимые
             данные для обновления
         session (AsyncSession): Сессия к базе данных
+        force (bool): Применить конфигурацию, даже если она не менялась с последнего применения
+
+    Returns:
+        bool: Была ли применена конфигурация
     """
+    checksum = compute_checksum(config_path)
+    if not force and await is_seed_applied(
+        Dataset.__tablename__, checksum, session=session
+    ):
+        return False
+
     # Загрузим конфигурацию заполнения из файла
     with open(config_path) as file:
         config: dict[str, Any] = json.load(file)
@@ -35,38 +50,31 @@ async def seed_datasets(config_path: str | PathLike, session: AsyncSession):
                 f"No found weights for mlmodel with name '{name}' by path '{dataset_path}'"
             )
 
-    # Получим данные для вставки
-    source_models = [
-        Dataset(
-            # Оставим только те параметры, которые пренадлежат сущности
-            **{k: v for k, v in data.items() if hasattr(Dataset, k)}
-        )
-        for data in config["data"]
-    ]
-
     # Создадим репозиторий для работы с моделью типа предсказания
     task_repo = ModelRepository(model=PredictTask, session=session)
     # Создадим репозиторий для работы с моделью набора данных
     dataset_repo = ModelRepository(model=Dataset, session=session)
 
-    # Подгрузим информацию об id типа предсказания
-    for model, data in zip(source_models, config["data"]):
-        if model.task_id is None:
-            # Получим все tasks с нужным именем (имя уникально -> 0 или 1 запись)
+    # Подгрузим информацию об id типов предсказания одним запросом
+    task_names = {row["task_name"] for row in config["data"] if "task_id" not in row}
+    task_ids = {
+        task.name: task.id
+        for task in await task_repo.get_all(PredictTask.name.in_(task_names))
+    }
+
+    # Получим данные для вставки
+    rows = []
+    for data in config["data"]:
+        # Оставим только те параметры, которые пренадлежат сущности
+        row = {k: v for k, v in data.items() if hasattr(Dataset, k)}
+        if "task_id" not in row:
             task_name = data["task_name"]
-            task_ids = await task_repo.get_all(PredictTask.name == task_name)
-            if task_ids:
-                model.task_id = task_ids[0].id
-            else:
+            if task_name not in task_ids:
                 raise RuntimeError(f"No found PredictTask with name '{task_name}'")
-    # Получим id набора данных для обновления, если он уже есть в базе
-    for model in source_models:
-        if model.id is None:
-            # Получим все Datasets с нужным именем (имя уникально -> 0 или 1 запись)
-            model_ids = await dataset_repo.get_all(Dataset.name == model.name)
-            if model_ids:
-                model.id = model_ids[0].id
+            row["task_id"] = task_ids[task_name]
+        rows.append(row)
 
-    # Обновим или создадим данные
-    for model in source_models:
-        await dataset_repo.update(model)
+    # Обновим или создадим данные (имя набора данных уникально)
+    await dataset_repo.upsert(rows, conflict_columns=["name"], auto_commit=False)
+    await save_seed_checksum(Dataset.__tablename__, checksum, session=session)
+    return True
@@ -9,17 +9,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import Dataset, MLModel
 from src.database.repository import ModelRepository
 from src.config import config_manager
+from .checksum import compute_checksum, is_seed_applied, save_seed_checksum
 
 
-async def seed_mlmodels(config_path: str | PathLike, session: AsyncSession):
+async def seed_mlmodels(
+    config_path: str | PathLike, session: AsyncSession, force: bool = False
+) -> bool:
     """
-    Актуализация данных Datasets на основе заданной конфигурации
+    Актуализация данных MLModels на основе заданной конфигурации
+
+    Изменения записываются без фиксации транзакции, фиксация выполняется вызывающей стороной.
 
     Args:
         config_path (str | PathLike): Путь до файла конфигурации в формате json, содержащего необходимые
             данные для обновления
         session (AsyncSession): Сессия к базе данных
+        force (bool): Применить конфигурацию, даже если она не менялась с последнего применения
+
+    Returns:
+        bool: Была ли применена конфигурация
     """
+    checksum = compute_checksum(config_path)
+    if not force and await is_seed_applied(
+        MLModel.__tablename__, checksum, session=session
+    ):
+        return False
+
     # Загрузим конфигурацию заполнения из файла
     with open(config_path) as file:
         config: dict[str, Any] = json.load(file)
@@ -40,38 +55,34 @@ async def seed_mlmodels(config_path: str | PathLike, session: AsyncSession):
     for field_name, deserializer in (("trained_at", datetime.datetime.fromisoformat),):
         for row in config["data"]:
             row[field_name] = deserializer(row[field_name])
-    # Получим данные для вставки
-    source_models = [
-        MLModel(
-            # Оставим только те параметры, которые пренадлежат сущности
-            **{k: v for k, v in data.items() if hasattr(MLModel, k)}
-        )
-        for data in config["data"]
-    ]
 
-    # Создадим репозиторий для работы с моделью типа предсказания
-    dataset_repo = ModelRepository(model=Dataset, session=session)
     # Создадим репозиторий для работы с моделью набора данных
+    dataset_repo = ModelRepository(model=Dataset, session=session)
+    # Создадим репозиторий для работы с моделью ML модели
     mlmodel_repo = ModelRepository(model=MLModel, session=session)
 
-    # Подгрузим информацию об id базы данных
-    for model, data in zip(source_models, config["data"]):
-        if model.dataset_id is None:
-            # Получим все datasets с нужным именем (имя уникально -> 0 или 1 запись)
+    # Подгрузим информацию об id наборов данных одним запросом
+    dataset_names = {
+        row["dataset_name"] for row in config["data"] if "dataset_id" not in row
+    }
+    dataset_ids = {
+        dataset.name: dataset.id
+        for dataset in await dataset_repo.get_all(Dataset.name.in_(dataset_names))
+    }
+
+    # Получим данные для вставки
+    rows = []
+    for data in config["data"]:
+        # Оставим только те параметры, которые пренадлежат сущности
+        row = {k: v for k, v in data.items() if hasattr(MLModel, k)}
+        if "dataset_id" not in row:
             dataset_name = data["dataset_name"]
-            dataset_ids = await dataset_repo.get_all(Dataset.name == dataset_name)
-            if dataset_ids:
-                model.dataset_id = dataset_ids[0].id
-            else:
+            if dataset_name not in dataset_ids:
                 raise RuntimeError(f"No found Dataset with name '{dataset_name}'")
-    # Получим id ml моделей для обновления, если он уже есть в базе
-    for model in source_models:
-        if model.id is None:
-            # Получим все MLModel с нужным именем (имя уникально -> 0 или 1 запись)
-            model_ids = await mlmodel_repo.get_all(MLModel.name == model.name)
-            if model_ids:
-                model.id = model_ids[0].id
+            row["dataset_id"] = dataset_ids[dataset_name]
+        rows.append(row)
 
-    # Обновим или создадим данные
-    for model in source_models:
-        await mlmodel_repo.update(model)
+    # Обновим или создадим данные (имя ML модели уникально)
+    await mlmodel_repo.upsert(rows, conflict_columns=["name"], auto_commit=False)
+    await save_seed_checksum(MLModel.__tablename__, checksum, session=session)
+    return True
@@ -5,17 +5,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import PredictTask
 from src.database.repository import ModelRepository
+from .checksum import compute_checksum, is_seed_applied, save_seed_checksum
 
 
-async def seed_predict_tasks(config_path: str | PathLike, session: AsyncSession):
+async def seed_predict_tasks(
+    config_path: str | PathLike, session: AsyncSession, force: bool = False
+) -> bool:
     """
     Актуализация read-only данных PredictTask на основе заданной конфигурации
 
+    Изменения записываются без фиксации транзакции, фиксация выполняется вызывающей стороной.
+
     Args:
         config_path (str | PathLike): Путь до файла конфигурации в формате json, содержащего необходимые
             данные для обновления
         session (AsyncSession): Сессия к базе данных
+        force (bool): Применить конфигурацию, даже если она не менялась с последнего применения
+
+    Returns:
+        bool: Была ли применена конфигурация
     """
+    checksum = compute_checksum(config_path)
+    if not force and await is_seed_applied(
+        PredictTask.__tablename__, checksum, session=session
+    ):
+        return False
+
     # Загрузим конфигурацию заполнения из файла
     with open(config_path) as file:
         config = json.load(file)
@@ -23,9 +38,7 @@ async def seed_predict_tasks(config_path: str | PathLike, session: AsyncSession)
     # Создадим репозиторий для работы с моделью
     model_repo = ModelRepository(model=PredictTask, session=session)
 
-    # Получим данные для вставки
-    source_models = [PredictTask(**data) for data in config["data"]]
-
-    # Обновим или создадим данные
-    for model in source_models:
-        await model_repo.update(model)
+    # Обновим или создадим данные (имя задачи не уникально, поэтому идентификатор задаётся в конфигурации)
+    await model_repo.upsert(config["data"], conflict_columns=["id"], auto_commit=False)
+    await save_seed_checksum(PredictTask.__tablename__, checksum, session=session)
+    return True
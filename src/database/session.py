@@ -1,3 +1,4 @@
+from typing import Literal
 from urllib.parse import urlencode
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import (
@@ -7,6 +8,8 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
+from .pool import InstrumentedAsyncPool, PoolMetrics
+
 
 class DatabaseSessionBuilder:
     def __init__(
@@ -17,6 +20,12 @@ class DatabaseSessionBuilder:
         user: str,
         password: str,
         database: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_disconnect_strategy: Literal["pessimistic", "optimistic"] = "optimistic",
+        prepared_statement_cache_size: int | None = None,
     ):
         """
         Инициализация инструмента работы с базой данных
@@ -28,11 +37,35 @@ class DatabaseSessionBuilder:
             user (str): Логин для доступа к базе данных
             password (str): Пароль для доступа к базе данных
             database (str): Имя базы данных
+            pool_size (int): Количество постоянно удерживаемых соединений в пуле
+            max_overflow (int): Максимальное количество временных соединений сверх размера пула
+            pool_timeout (float): Время ожидания (в секундах) свободного соединения перед ошибкой
+            pool_recycle (int): Время жизни (в секундах) соединения. Значение -1 отключает пересоздание
+            pool_disconnect_strategy (str): Стратегия обработки разорванных соединений. Для "pessimistic"
+                соединение проверяется запросом при каждой выдаче из пула
+            prepared_statement_cache_size (int, optional): Размер кеша подготовленных выражений
+                на соединение. Учитывается только для драйвера asyncpg
         """
-        url = f"{dialect}://{user}:{password}@{host}:{port}/{database}"
+        url_params = {}
+        if prepared_statement_cache_size is not None and dialect.endswith("+asyncpg"):
+            url_params["prepared_statement_cache_size"] = prepared_statement_cache_size
+        url = self.build_link(
+            dialect=dialect,
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            **url_params,
+        )
         self.engine: AsyncEngine = create_async_engine(
             url=url,
-            pool_pre_ping=True,
+            poolclass=InstrumentedAsyncPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_disconnect_strategy == "pessimistic",
         )
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
@@ -71,6 +104,10 @@ class DatabaseSessionBuilder:
             url = url + "?" + urlencode(url_params)
         return url
 
+    def get_pool_metrics(self) -> PoolMetrics:
+        """Получение текущего состояния пула соединений к базе данных"""
+        return self.engine.pool.get_metrics()  # type: ignore[attr-defined]
+
     async def dispose(self) -> None:
         """Завершение работы с базой данных"""
         await self.engine.dispose()
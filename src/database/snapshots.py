@@ -0,0 +1,104 @@
+"""
+Неизменяемые снимки сущностей каталога.
+
+Снимки не связаны с сессией базы данных, поэтому их можно безопасно передавать между потоками
+и хранить в кеше без риска отложенной загрузки или изменения состояния ORM объектов.
+"""
+
+import datetime
+from dataclasses import dataclass
+
+from .models import Base, Dataset, MLModel, PredictTask
+
+
+@dataclass(frozen=True, slots=True)
+class PredictTaskSnapshot:
+    """Снимок задачи предсказания"""
+
+    id: int
+    """ Идентификатор задачи """
+    name: str
+    """ Системное название задачи """
+    title: str
+    """ Человекочитаемое название задачи """
+
+    @classmethod
+    def from_model(cls, instance: PredictTask) -> "PredictTaskSnapshot":
+        return cls(id=instance.id, name=instance.name, title=instance.title)
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSnapshot:
+    """Снимок набора данных вместе с информацией о задаче"""
+
+    id: int
+    """ Идентификатор набора данных """
+    name: str
+    """ Системное название набора данных """
+    title: str
+    """ Человекочитаемое название набора данных """
+    description: str
+    """ Человекочитаемое описание набора данных """
+    task_id: int
+    """ Идентификатор задачи """
+    target_column: str
+    """  Название целевой колонки """
+    index_column: str | None
+    """ Название колонки индекса """
+    task: PredictTaskSnapshot
+    """ Информация о задачи """
+
+    @classmethod
+    def from_model(cls, instance: Dataset) -> "DatasetSnapshot":
+        return cls(
+            id=instance.id,
+            name=instance.name,
+            title=instance.title,
+            description=instance.description,
+            task_id=instance.task_id,
+            target_column=instance.target_column,
+            index_column=instance.index_column,
+            task=PredictTaskSnapshot.from_model(instance.task),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MLModelSnapshot:
+    """Снимок ML модели вместе с информацией о наборе данных"""
+
+    id: int
+    """ Идентификатор модели """
+    name: str
+    """ Системное название модели """
+    title: str
+    """ Человекочитаемое название модели """
+    description: str
+    """ Человекочитаемое описание модели """
+    dataset_id: int
+    """ Идентификатор набора данных, на котором обучена модель """
+    trained_at: datetime.datetime
+    """ Время когда модель была обучена """
+    dataset: DatasetSnapshot
+    """ Информация о наборе данных, на котором обучена модель """
+
+    @classmethod
+    def from_model(cls, instance: MLModel) -> "MLModelSnapshot":
+        return cls(
+            id=instance.id,
+            name=instance.name,
+            title=instance.title,
+            description=instance.description,
+            dataset_id=instance.dataset_id,
+            trained_at=instance.trained_at,
+            dataset=DatasetSnapshot.from_model(instance.dataset),
+        )
+
+
+Snapshot = PredictTaskSnapshot | DatasetSnapshot | MLModelSnapshot
+
+SNAPSHOT_TYPES: dict[type[Base], type[Snapshot]] = {
+    PredictTask: PredictTaskSnapshot,
+    Dataset: DatasetSnapshot,
+    MLModel: MLModelSnapshot,
+}
+""" Соответствие сущностей каталога и типов их снимков """
@@ -0,0 +1,231 @@
+"""
+Очередь задач обучения моделей на основе таблицы базы данных.
+
+Обработчики (в том числе на разных машинах) забирают задачи с блокировкой строки `FOR UPDATE SKIP LOCKED`,
+поэтому одна задача не выполняется дважды, а обработчики не ожидают друг друга. Выполняемая задача
+периодически подтверждается обработчиком: задачи без подтверждения дольше срока аренды (например,
+после падения обработчика) возвращаются в очередь и выполняются повторно.
+"""
+
+import datetime
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import TrainJob
+
+
+class TrainJobStatus:
+    """Состояния задачи обучения"""
+
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class TrainJobQueue:
+    """Очередь задач обучения моделей"""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def enqueue(
+        self,
+        dataset_id: int,
+        params: dict[str, Any] | None = None,
+        title: str = "Untitled",
+        description: str = "",
+        max_attempts: int = 3,
+    ) -> TrainJob:
+        """
+        Поставить задачу обучения в очередь
+
+        Args:
+            dataset_id (int): Идентификатор набора данных
+            params (dict[str, Any], optional): Параметры обучения (см. `AutoMLTrainer.train`)
+            title (str): Человекочитаемое название обученной модели
+            description (str): Человекочитаемое описание обученной модели
+            max_attempts (int): Максимальное количество запусков задачи
+
+        Returns:
+            TrainJob: Созданная задача
+        """
+        job = TrainJob(
+            dataset_id=dataset_id,
+            status=TrainJobStatus.queued,
+            params=params or {},
+            title=title,
+            description=description,
+            max_attempts=max_attempts,
+            attempts=0,
+            progress="",
+            created_at=datetime.datetime.now(),
+        )
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def claim(self, worker_id: str) -> TrainJob | None:
+        """
+        Забрать следующую задачу из очереди
+
+        Строка задачи блокируется до фиксации транзакции, заблокированные другими обработчиками строки
+        пропускаются. Диалекты без поддержки `FOR UPDATE` (например, sqlite) блокируют базу целиком.
+
+        Args:
+            worker_id (str): Идентификатор обработчика
+
+        Returns:
+            TrainJob | None: Задача или None, если очередь пуста
+        """
+        job = await self.session.scalar(
+            select(TrainJob)
+            .where(TrainJob.status == TrainJobStatus.queued)
+            .order_by(TrainJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if job is None:
+            await self.session.rollback()
+            return None
+
+        now = datetime.datetime.now()
+        job.status = TrainJobStatus.running
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.progress = f"Claimed by {worker_id} (attempt {job.attempts})"
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def heartbeat(
+        self, job_id: int, worker_id: str, progress: str | None = None
+    ) -> bool:
+        """
+        Подтвердить выполнение задачи обработчиком и обновить сообщение о ходе выполнения
+
+        Returns:
+            bool: Принадлежит ли задача обработчику. Если False, то задача была возвращена в очередь
+                (например, из-за просроченного подтверждения) и результат обработчика не будет принят
+        """
+        values: dict[str, Any] = {"heartbeat_at": datetime.datetime.now()}
+        if progress is not None:
+            values["progress"] = progress[:512]
+        result = await self.session.execute(
+            update(TrainJob)
+            .where(
+                TrainJob.id == job_id,
+                TrainJob.worker_id == worker_id,
+                TrainJob.status == TrainJobStatus.running,
+            )
+            .values(**values)
+        )
+        await self.session.commit()
+        return result.rowcount > 0  # type: ignore
+
+    async def complete(
+        self,
+        job_id: int,
+        worker_id: str,
+        result: dict[str, Any],
+        mlmodel_id: int | None = None,
+    ) -> bool:
+        """
+        Отметить задачу выполненной (транзакция фиксируется вместе с ранее сделанными изменениями сессии)
+
+        Returns:
+            bool: Принят ли результат. Если False, транзакция отменяется
+        """
+        updated = await self.session.execute(
+            update(TrainJob)
+            .where(
+                TrainJob.id == job_id,
+                TrainJob.worker_id == worker_id,
+                TrainJob.status == TrainJobStatus.running,
+            )
+            .values(
+                status=TrainJobStatus.succeeded,
+                result=result,
+                mlmodel_id=mlmodel_id,
+                error=None,
+                progress="Finished",
+                finished_at=datetime.datetime.now(),
+            )
+        )
+        if updated.rowcount == 0:  # type: ignore
+            await self.session.rollback()
+            return False
+        await self.session.commit()
+        return True
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        """
+        Отметить неудачный запуск задачи: задача возвращается в очередь, если не исчерпаны попытки
+        """
+        job = await self.session.scalar(
+            select(TrainJob)
+            .where(
+                TrainJob.id == job_id,
+                TrainJob.worker_id == worker_id,
+                TrainJob.status == TrainJobStatus.running,
+            )
+            .with_for_update()
+        )
+        if job is None:
+            await self.session.rollback()
+            return
+        job.error = error[:1024]
+        job.worker_id = None
+        if job.attempts < job.max_attempts:
+            job.status = TrainJobStatus.queued
+            job.progress = f"Requeued after failed attempt {job.attempts}"
+        else:
+            job.status = TrainJobStatus.failed
+            job.progress = "Failed"
+            job.finished_at = datetime.datetime.now()
+        await self.session.commit()
+
+    async def requeue_stale(self, lease: float) -> int:
+        """
+        Вернуть в очередь задачи, выполнение которых не подтверждалось дольше срока аренды
+
+        Задачи, исчерпавшие попытки, отмечаются неудачными.
+
+        Args:
+            lease (float): Срок аренды задачи (в секундах)
+
+        Returns:
+            int: Количество возвращённых в очередь задач
+        """
+        now = datetime.datetime.now()
+        stale = (
+            TrainJob.status == TrainJobStatus.running,
+            TrainJob.heartbeat_at < now - datetime.timedelta(seconds=lease),
+        )
+        await self.session.execute(
+            update(TrainJob)
+            .where(*stale, TrainJob.attempts >= TrainJob.max_attempts)
+            .values(
+                status=TrainJobStatus.failed,
+                worker_id=None,
+                error="Worker heartbeat lease expired",
+                progress="Failed",
+                finished_at=now,
+            )
+        )
+        requeued = await self.session.execute(
+            update(TrainJob)
+            .where(*stale)
+            .values(
+                status=TrainJobStatus.queued,
+                worker_id=None,
+                progress="Requeued after worker heartbeat lease expired",
+            )
+        )
+        await self.session.commit()
+        return requeued.rowcount  # type: ignore
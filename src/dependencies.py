@@ -29,6 +29,12 @@ def get_database_session_builder() -> DatabaseSessionBuilder:
         user=db_config.user,
         password=db_config.password.get_secret_value(),
         database=db_config.database,
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_timeout=db_config.pool_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_disconnect_strategy=db_config.pool_disconnect_strategy,
+        prepared_statement_cache_size=db_config.prepared_statement_cache_size,
     )
 
 
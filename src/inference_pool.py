@@ -0,0 +1,620 @@
+"""
+Пул процессов выполнения предсказаний с закреплением ML моделей за процессами.
+
+Каждая ML модель закрепляется за `replicas` процессами пула с помощью согласованного хеширования
+идентификатора модели. Процесс API передаёт данные для предсказания закреплённому процессу через Unix сокет,
+поэтому каждая модель загружена только в своих процессах: кеш моделей процессов не вытесняет модели
+случайными запросами, а память пула растёт пропорционально размеру каталога, делённому на количество процессов.
+
+При добавлении, удалении или аварийном завершении процесса меняется закрепление только моделей этого процесса.
+Завершившийся процесс перезапускается, а до его готовности запросы его моделей обрабатывают соседние процессы.
+
+Пул запускается один раз для всех процессов API: процессом API при запуске uvicorn, главным процессом gunicorn
+(см. `src.server`) или отдельной службой. Запустивший пул процесс записывает в каталог сокетов файл `pool.json`
+со списком процессов пула, по которому остальные процессы API строят то же кольцо и подключаются к сокетам.
+
+Сообщения передаются кадрами `[длина (uint64)][pickle]` через сокеты в каталоге, доступном только владельцу.
+
+Запуск отдельной службой (количество процессов меняется сигналами SIGTTIN и SIGTTOU, как у gunicorn,
+идентификатор процесса службы записан в `pool.json`):
+    python -m src.inference_pool
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import signal
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from functools import cache
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .config import config_manager
+from .core.logger import LoggerFactory
+from .database.models import MLModel
+from .database.snapshots import MLModelSnapshot
+
+INFERENCE_LOGGER = LoggerFactory.get_logger("InferencePool")
+
+_FRAME_HEADER = struct.Struct("!Q")
+
+_MANIFEST_NAME = "pool.json"
+""" Файл каталога сокетов со списком процессов пула """
+
+_REMOTE_ERRORS: dict[str, type[Exception]] = {
+    "ValueError": ValueError,
+    "FileNotFoundError": FileNotFoundError,
+}
+""" Ошибки процесса пула, которые передаются вызывающей стороне без изменения типа """
+
+
+class InferenceWorkerUnavailable(ConnectionError):
+    """Процесс пула недоступен (не запущен или завершился во время обработки запроса)"""
+
+
+class HashRing:
+    """Кольцо согласованного хеширования с виртуальными точками узлов"""
+
+    def __init__(self, virtual_nodes: int = 64) -> None:
+        """
+        Args:
+            virtual_nodes (int): Количество точек каждого узла на кольце. Больше точек - равномернее распределение
+        """
+        self.virtual_nodes = virtual_nodes
+        self._points: list[int] = []
+        self._owners: list[int] = []
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(), "big"
+        )
+
+    @property
+    def nodes(self) -> set[int]:
+        return set(self._owners)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def add(self, node: int) -> None:
+        """Добавить узел на кольцо"""
+        if node in self._owners:
+            return
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: int) -> None:
+        """Удалить узел с кольца"""
+        kept = [
+            (point, owner)
+            for point, owner in zip(self._points, self._owners)
+            if owner != node
+        ]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def get_nodes(self, key: str, count: int) -> list[int]:
+        """
+        Получить узлы, за которыми закреплён ключ
+
+        Args:
+            key (str): Ключ
+            count (int): Количество узлов
+
+        Returns:
+            (list[int]): Различные узлы в порядке обхода кольца от точки ключа
+        """
+        nodes: list[int] = []
+        if not self._points:
+            return nodes
+        start = bisect.bisect(self._points, self._hash(key))
+        for offset in range(len(self._points)):
+            node = self._owners[(start + offset) % len(self._points)]
+            if node not in nodes:
+                nodes.append(node)
+                if len(nodes) >= count:
+                    break
+        return nodes
+
+
+def _dump_frame(message: Any) -> bytes:
+    payload = pickle.dumps(message, protocol=5)
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def _handle_request(request: dict[str, Any]) -> Any:
+    """Обработка запроса в процессе пула"""
+    # Импорт выполняется внутри процесса пула, чтобы не загружать FEDOT при импорте модуля
+    from .core.model_cache import get_model_cache
+    from .core.predict import predict, predict_proba, prepare_data_for_predict
+
+    op = request["op"]
+    if op == "ping":
+        return os.getpid()
+    if op == "reload":
+        return get_model_cache().reload(request["name"]) is not None
+    if op == "predict":
+        entry = get_model_cache().get(
+            request["name"], task=request["task"], path=request["path"]
+        )
+        with entry.lock:
+            prepared_data = prepare_data_for_predict(
+                request["data"],
+                task=entry.task,
+                weight_path=entry.path,
+                model=entry.model,
+            )
+            predict_method = predict_proba if request.get("proba") else predict
+            return predict_method(
+                prepared_data,
+                task=entry.task,
+                weight_path=entry.path,
+                model=entry.model,
+            )
+    raise ValueError(f"Unknown inference request '{op}'")
+
+
+class _InferenceRequestHandler(socketserver.StreamRequestHandler):
+    """Обработчик соединения с процессом пула: последовательность запросов и ответов"""
+
+    def handle(self) -> None:
+        while True:
+            header = self.rfile.read(_FRAME_HEADER.size)
+            if len(header) < _FRAME_HEADER.size:
+                return
+            (size,) = _FRAME_HEADER.unpack(header)
+            request = pickle.loads(self.rfile.read(size))
+            try:
+                response = {"result": _handle_request(request)}
+            except Exception as e:
+                response = {"error": type(e).__name__, "message": str(e)}
+            self.wfile.write(_dump_frame(response))
+
+
+class _InferenceServer(socketserver.ThreadingUnixStreamServer):
+    """Сервер процесса пула: каждое соединение обрабатывается в отдельном потоке"""
+
+    daemon_threads = True
+    # Очередь соединений по умолчанию (5) переполняется при всплеске одновременных запросов
+    request_queue_size = socket.SOMAXCONN
+
+
+def _run_worker(socket_path: str) -> None:
+    """Запуск процесса пула: обработка запросов, поступающих на Unix сокет"""
+    Path(socket_path).unlink(missing_ok=True)
+    server = _InferenceServer(socket_path, _InferenceRequestHandler)
+    parent_pid = os.getppid()
+
+    def watch_parent() -> None:
+        # Процесс завершается вместе с запустившим пул процессом, даже если тот был завершён аварийно
+        while os.getppid() == parent_pid:
+            time.sleep(1.0)
+        server.shutdown()
+
+    threading.Thread(target=watch_parent, daemon=True).start()
+    INFERENCE_LOGGER.info(f"Inference worker {os.getpid()} listens on {socket_path}")
+    with server:
+        server.serve_forever()
+
+
+class InferencePool:
+    """Пул процессов выполнения предсказаний с маршрутизацией запросов по ML моделям"""
+
+    def __init__(
+        self,
+        workers: int,
+        replicas: int = 1,
+        virtual_nodes: int = 64,
+        socket_dir: str | None = None,
+        start_timeout: float = 60.0,
+        monitor_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            workers (int): Количество процессов
+            replicas (int): Количество процессов, за которыми закреплена каждая модель
+            virtual_nodes (int): Количество точек каждого процесса на кольце согласованного хеширования
+            socket_dir (str, optional): Каталог Unix сокетов процессов. По умолчанию создаётся временный каталог
+            start_timeout (float): Время ожидания (в секундах) готовности запущенного процесса
+            monitor_interval (float): Период (в секундах) проверки работоспособности процессов
+        """
+        self.workers = workers
+        self.replicas = max(replicas, 1)
+        self.socket_dir = socket_dir
+        self.start_timeout = start_timeout
+        self.monitor_interval = monitor_interval
+        self.ring = HashRing(virtual_nodes=virtual_nodes)
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: dict[int, BaseProcess] = {}
+        self._in_flight: dict[int, int] = {}
+        self._monitor_task: asyncio.Task | None = None
+        self._owns_socket_dir = False
+        self._connected = False
+        self._manifest_version: int | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._monitor_task is not None or self._connected
+
+    def _get_socket_path(self, worker_id: int) -> str:
+        return str(Path(self.socket_dir, f"worker-{worker_id}.sock"))  # type: ignore
+
+    def _get_manifest_path(self) -> Path:
+        return Path(self.socket_dir, _MANIFEST_NAME)  # type: ignore
+
+    def _write_manifest(self) -> None:
+        """Публикация списка процессов пула для подключённых процессов API"""
+        manifest_path = self._get_manifest_path()
+        temp_path = manifest_path.with_suffix(".tmp")
+        temp_path.write_text(
+            json.dumps({"pid": os.getpid(), "workers": sorted(self._processes)})
+        )
+        # Подключённые процессы не должны прочитать файл, записанный частично
+        os.replace(temp_path, manifest_path)
+
+    def _refresh_ring(self) -> None:
+        """Обновление кольца подключённого процесса API по списку процессов пула"""
+        if not self._connected:
+            return
+        try:
+            version = self._get_manifest_path().stat().st_mtime_ns
+        except OSError:
+            # Пул остановлен или перезапускается - запросы завершатся ошибкой недоступности процессов
+            return
+        if version == self._manifest_version:
+            return
+        try:
+            workers = set(json.loads(self._get_manifest_path().read_text())["workers"])
+        except (OSError, ValueError, KeyError) as e:
+            INFERENCE_LOGGER.warning(
+                f"Couldn't read inference pool manifest: ({type(e).__name__}) {e}"
+            )
+            return
+        for worker_id in self.ring.nodes - workers:
+            self.ring.remove(worker_id)
+        for worker_id in workers:
+            self.ring.add(worker_id)
+        self.workers = len(workers)
+        self._manifest_version = version
+
+    async def start(self) -> None:
+        """Запуск процессов пула в текущем процессе"""
+        if self.socket_dir is None:
+            self.socket_dir = tempfile.mkdtemp(prefix="automl-inference-")
+            self._owns_socket_dir = True
+        else:
+            Path(self.socket_dir).mkdir(parents=True, exist_ok=True)
+        # Сообщения десериализуются через pickle - сокеты доступны только владельцу процесса
+        os.chmod(self.socket_dir, 0o700)
+        # Список процессов прошлого запуска не должен использоваться до готовности процессов
+        self._get_manifest_path().unlink(missing_ok=True)
+        await asyncio.gather(*(self._start_worker(i) for i in range(self.workers)))
+        self._write_manifest()
+        self._monitor_task = asyncio.create_task(self._monitor())
+        INFERENCE_LOGGER.info(f"Inference pool started with {self.workers} workers")
+
+    async def connect(self) -> None:
+        """
+        Подключение к пулу, запущенному другим процессом (главным процессом gunicorn или отдельной службой)
+
+        Процессы пула не перезапускаются подключённым процессом: пока запустивший пул процесс перезапускает
+        завершившийся процесс, запросы его моделей передаются следующему процессу кольца.
+
+        Raises:
+            RuntimeError: Если пул не запущен за время `start_timeout`
+        """
+        if self.socket_dir is None:
+            raise ValueError("Inference pool socket_dir is required to connect")
+        deadline = time.monotonic() + self.start_timeout
+        while not self._get_manifest_path().exists():
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"Inference pool in '{self.socket_dir}' is not running"
+                )
+            await asyncio.sleep(0.1)
+        self._connected = True
+        self._refresh_ring()
+        INFERENCE_LOGGER.info(
+            f"Connected to inference pool with {self.workers} workers in '{self.socket_dir}'"
+        )
+
+    async def stop(self) -> None:
+        """Остановка процессов пула или отключение от пула, запущенного другим процессом"""
+        self._connected = False
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+            self._get_manifest_path().unlink(missing_ok=True)
+        for worker_id in list(self._processes):
+            await self._stop_worker(worker_id)
+        if self._owns_socket_dir and self.socket_dir is not None:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+
+    async def resize(self, workers: int) -> None:
+        """
+        Изменение количества процессов пула
+
+        За процессами, которые остаются в пуле, сохраняется большинство закреплённых моделей.
+        Подключённые процессы API получают новый список процессов через файл `pool.json`.
+        """
+        workers = max(workers, 1)
+        for worker_id in range(self.workers, workers):
+            await self._start_worker(worker_id)
+        for worker_id in range(workers, self.workers):
+            await self._stop_worker(worker_id)
+        INFERENCE_LOGGER.info(
+            f"Inference pool resized from {self.workers} to {workers} workers"
+        )
+        self.workers = workers
+        self._write_manifest()
+
+    async def _start_worker(self, worker_id: int) -> None:
+        socket_path = self._get_socket_path(worker_id)
+        process = self._context.Process(
+            target=_run_worker, args=(socket_path,), daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._in_flight.setdefault(worker_id, 0)
+
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                await self._request(worker_id, {"op": "ping"})
+                break
+            except InferenceWorkerUnavailable:
+                if not process.is_alive() or time.monotonic() > deadline:
+                    process.kill()
+                    raise RuntimeError(
+                        f"Inference worker {worker_id} did not start in {self.start_timeout} s"
+                    )
+                await asyncio.sleep(0.1)
+        # Процесс получает модели только после готовности принимать запросы
+        self.ring.add(worker_id)
+
+    async def _stop_worker(self, worker_id: int) -> None:
+        self.ring.remove(worker_id)
+        process = self._processes.pop(worker_id, None)
+        if process is not None:
+            process.terminate()
+            await asyncio.to_thread(process.join, 5.0)
+            if process.is_alive():
+                process.kill()
+        Path(self._get_socket_path(worker_id)).unlink(missing_ok=True)
+
+    async def _monitor(self) -> None:
+        """Перезапуск аварийно завершившихся процессов"""
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                INFERENCE_LOGGER.warning(
+                    f"Inference worker {worker_id} exited with code {process.exitcode}, restarting"
+                )
+                # Модели процесса временно обслуживают соседние процессы кольца
+                self.ring.remove(worker_id)
+                try:
+                    await self._start_worker(worker_id)
+                except Exception as e:
+                    INFERENCE_LOGGER.error(
+                        f"Couldn't restart inference worker {worker_id}: ({type(e).__name__}) {e}"
+                    )
+
+    async def _request(self, worker_id: int, request: dict[str, Any]) -> Any:
+        """Отправка запроса процессу пула и получение результата"""
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                self._get_socket_path(worker_id)
+            )
+        except OSError as e:
+            raise InferenceWorkerUnavailable(
+                f"Inference worker {worker_id} is unavailable"
+            ) from e
+        self._in_flight[worker_id] = self._in_flight.get(worker_id, 0) + 1
+        try:
+            writer.write(_dump_frame(request))
+            await writer.drain()
+            (size,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+            response = pickle.loads(await reader.readexactly(size))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            raise InferenceWorkerUnavailable(
+                f"Inference worker {worker_id} closed the connection"
+            ) from e
+        finally:
+            self._in_flight[worker_id] -= 1
+            writer.close()
+        if "error" in response:
+            if response["error"] == "ModelClassesUnavailable":
+                # Импорт выполняется только при ошибке, чтобы не загружать FEDOT при импорте модуля
+                from .core.predict import ModelClassesUnavailable
+
+                raise ModelClassesUnavailable(response["message"])
+            error_type = _REMOTE_ERRORS.get(response["error"], RuntimeError)
+            raise error_type(response["message"])
+        return response["result"]
+
+    def get_workers(self, mlmodel_id: int) -> list[int]:
+        """Получить процессы, за которыми закреплена модель"""
+        self._refresh_ring()
+        return self.ring.get_nodes(str(mlmodel_id), self.replicas)
+
+    async def predict(
+        self,
+        ml_model: MLModel | MLModelSnapshot,
+        data: pd.DataFrame,
+        proba: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """
+        Предобработка данных и предсказание в процессе, за которым закреплена модель
+
+        Из закреплённых процессов выбирается наименее загруженный. Если он недоступен, запрос
+        передаётся следующему процессу кольца.
+
+        Args:
+            ml_model (MLModel | MLModelSnapshot): Сущность ML модели или её снимок
+            data (pd.DataFrame): Таблица с данными для предсказания
+            proba (bool): Предсказать вероятности классов вместо меток (см. `predict_proba`)
+
+        Returns:
+            (np.ndarray[N] | tuple[np.ndarray[N, C], np.ndarray[C]]): Массив предсказанных значений для каждой
+                строки из `data` или вероятности классов и метки классов
+
+        Raises:
+            ValueError: Если входные данные невозможно преобразовать
+        """
+        request = {
+            "op": "predict",
+            "name": ml_model.name,
+            "task": ml_model.dataset.task.name,
+            "path": str(
+                Path(config_manager.storage_config.weights_root, ml_model.name)
+            ),
+            "data": data,
+            "proba": proba,
+        }
+        self._refresh_ring()
+        candidates = self.ring.get_nodes(str(ml_model.id), self.replicas + 1)
+        preferred = sorted(
+            candidates[: self.replicas],
+            key=lambda worker_id: self._in_flight.get(worker_id, 0),
+        )
+        for worker_id in preferred + candidates[self.replicas :]:
+            try:
+                return await self._request(worker_id, request)
+            except InferenceWorkerUnavailable as e:
+                INFERENCE_LOGGER.warning(f"{e}, retry on the next worker")
+        raise RuntimeError(
+            f"No inference worker is available for model '{ml_model.name}'"
+        )
+
+    async def reload(self, name: str) -> None:
+        """Загрузка новой версии модели в процессах, в которых она загружена"""
+        self._refresh_ring()
+        await asyncio.gather(
+            *(
+                self._request(worker_id, {"op": "reload", "name": name})
+                for worker_id in self.ring.nodes
+            ),
+            return_exceptions=True,
+        )
+
+
+@cache
+def get_inference_pool() -> InferencePool:
+    """Получение пула процессов выполнения предсказаний (запускается при старте приложения)"""
+    inference_config = config_manager.inference_config
+    return InferencePool(
+        workers=inference_config.workers,
+        replicas=inference_config.replicas,
+        virtual_nodes=inference_config.virtual_nodes,
+        socket_dir=inference_config.socket_dir,
+        start_timeout=inference_config.start_timeout,
+        monitor_interval=inference_config.monitor_interval,
+    )
+
+
+async def _serve(pool: InferencePool, watch_parent: bool) -> None:
+    """Работа пула до получения сигнала завершения"""
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    parent_pid = os.getppid()
+    resize_lock = asyncio.Lock()
+
+    async def change_workers(delta: int) -> None:
+        # Каждый сигнал меняет количество процессов на единицу относительно результата предыдущего сигнала
+        async with resize_lock:
+            await pool.resize(pool.workers + delta)
+
+    # Обработчики устанавливаются до запуска: сигнал может прийти сразу после публикации списка процессов
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set)
+    # Количество процессов меняется сигналами, как у gunicorn: SIGTTIN - добавить процесс, SIGTTOU - удалить
+    loop.add_signal_handler(
+        signal.SIGTTIN, lambda: asyncio.create_task(change_workers(1))
+    )
+    loop.add_signal_handler(
+        signal.SIGTTOU, lambda: asyncio.create_task(change_workers(-1))
+    )
+    async with resize_lock:
+        await pool.start()
+    if watch_parent:
+
+        async def wait_parent() -> None:
+            # Пул завершается вместе с главным процессом gunicorn, даже если тот был завершён аварийно
+            while os.getppid() == parent_pid:
+                await asyncio.sleep(1.0)
+            stopped.set()
+
+        parent_task = asyncio.create_task(wait_parent())
+    try:
+        await stopped.wait()
+    finally:
+        if watch_parent:
+            parent_task.cancel()
+        await pool.stop()
+
+
+def run_pool(socket_dir: str | None = None, watch_parent: bool = False) -> None:
+    """
+    Запуск пула процессов выполнения предсказаний в текущем процессе до получения SIGTERM или SIGINT
+
+    Args:
+        socket_dir (str, optional): Каталог Unix сокетов процессов. По умолчанию - из настроек пула
+        watch_parent (bool): Завершить пул вместе с родительским процессом
+    """
+    pool = get_inference_pool()
+    if socket_dir is not None:
+        pool.socket_dir = socket_dir
+    asyncio.run(_serve(pool, watch_parent))
+
+
+def spawn_pool(socket_dir: str) -> BaseProcess:
+    """
+    Запуск пула в отдельном процессе и ожидание готовности процессов пула
+
+    Args:
+        socket_dir (str): Каталог Unix сокетов процессов, через который к пулу подключаются процессы API
+
+    Returns:
+        (BaseProcess): Процесс пула. Пул завершается вместе с текущим процессом
+
+    Raises:
+        RuntimeError: Если процесс пула завершился до готовности
+    """
+    manifest_path = Path(socket_dir, _MANIFEST_NAME)
+    manifest_path.unlink(missing_ok=True)
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_pool, kwargs={"socket_dir": socket_dir, "watch_parent": True}
+    )
+    process.start()
+    # Время запуска ограничено `start_timeout` в процессе пула: он завершается, если процессы не готовы
+    while not manifest_path.exists():
+        if not process.is_alive():
+            raise RuntimeError(
+                f"Inference pool exited with code {process.exitcode} before it was ready"
+            )
+        time.sleep(0.1)
+    return process
+
+
+if __name__ == "__main__":
+    run_pool()
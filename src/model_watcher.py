@@ -0,0 +1,219 @@
+"""
+Отслеживание изменений весов ML моделей и файлов автозаполнения без перезапуска API.
+
+Наблюдатель периодически проверяет каталоги весов моделей и файлы конфигурации автозаполнения.
+Изменение применяется, когда версия весов не менялась между двумя последовательными проверками
+(то есть запись модели завершена):
+
+* новая версия загруженной модели загружается в фоне и подменяет прежнюю в кеше моделей,
+  запросы, получившие прежнюю версию, завершаются на ней;
+* время обучения ML модели в базе данных обновляется по времени изменения весов;
+* изменённые файлы автозаполнения применяются к базе данных.
+
+Наблюдатель запускается в каждом процессе обработки запросов, так как у каждого процесса свой кеш моделей.
+Изменения базы данных выполняет только один из процессов - владелец блокировки файла `.watcher.lock`
+в каталоге весов моделей. При завершении этого процесса блокировку получает другой процесс.
+"""
+
+import asyncio
+import datetime
+import fcntl
+from pathlib import Path
+from typing import TextIO
+
+from sqlalchemy import select
+
+from . import dependencies
+from .config import config_manager
+from .core.logger import LoggerFactory
+from .core.model_cache import ModelCache, get_model_cache, get_model_version
+from .database.models import MLModel
+from .database.repository import ModelRepository
+from .database.seeders import get_seeding_config_paths, seed_database
+from .database.seeders.checksum import compute_checksum
+from .inference_pool import get_inference_pool
+
+WATCHER_LOGGER = LoggerFactory.get_logger("ModelWatcher")
+
+WATCHER_LOCK_FILENAME = ".watcher.lock"
+""" Имя файла блокировки процесса, применяющего изменения к базе данных """
+
+
+class ModelWatcher:
+    """Наблюдатель за изменениями весов ML моделей и файлов автозаполнения"""
+
+    def __init__(
+        self,
+        weights_root: str | Path | None = None,
+        interval: float | None = None,
+        model_cache: ModelCache | None = None,
+    ) -> None:
+        """
+        Args:
+            weights_root (str | Path, optional): Каталог весов моделей. По умолчанию из настроек хранилища
+            interval (float, optional): Период (в секундах) проверки изменений. По умолчанию из настроек кеша
+            model_cache (ModelCache, optional): Кеш загруженных моделей. По умолчанию общий кеш процесса
+        """
+        self.weights_root = Path(
+            weights_root
+            if weights_root is not None
+            else config_manager.storage_config.weights_root
+        )
+        self.interval = (
+            interval
+            if interval is not None
+            else config_manager.cache_config.model_watch_interval
+        )
+        self.model_cache = model_cache if model_cache is not None else get_model_cache()
+        self._versions: dict[str, str] | None = None
+        self._pending: dict[str, str] = {}
+        self._seed_checksums: dict[str, str] | None = None
+        self._lock_file: TextIO | None = None
+        self._is_leader = False
+
+    async def run(self) -> None:
+        """Периодическая проверка изменений до отмены задачи"""
+        WATCHER_LOGGER.info(
+            f"Watch '{self.weights_root}' for model changes every {self.interval} s"
+        )
+        try:
+            while True:
+                try:
+                    await self.check()
+                except Exception as e:
+                    # Ошибка одной проверки (например, некорректный файл автозаполнения) не останавливает наблюдение
+                    WATCHER_LOGGER.error(
+                        f"Couldn't apply changes: ({type(e).__name__}) {e}"
+                    )
+                await asyncio.sleep(self.interval)
+        finally:
+            self.release_lock()
+
+    def acquire_lock(self) -> bool:
+        """
+        Попытка стать процессом, применяющим изменения к базе данных
+
+        Returns:
+            (bool): Владеет ли текущий процесс блокировкой
+        """
+        if self._is_leader:
+            return True
+        if self._lock_file is None:
+            self.weights_root.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(Path(self.weights_root, WATCHER_LOCK_FILENAME), "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        self._is_leader = True
+        WATCHER_LOGGER.info("Model watcher applies changes to database")
+        return True
+
+    def release_lock(self) -> None:
+        """Освобождение блокировки процесса, применяющего изменения к базе данных"""
+        if self._lock_file is not None:
+            # Закрытие файла снимает блокировку
+            self._lock_file.close()
+            self._lock_file = None
+        self._is_leader = False
+
+    async def check(self) -> None:
+        """Одна проверка изменений файлов автозаполнения и весов моделей"""
+        await self._check_seeds()
+        versions = await asyncio.to_thread(self._scan_weights)
+        for name in self._get_stable_changes(versions):
+            await self._apply_model_change(name)
+
+    def _scan_weights(self) -> dict[str, str]:
+        """Получение версий всех сохранённых моделей"""
+        if not self.weights_root.exists():
+            return {}
+        return {
+            path.name: get_model_version(path)
+            for path in self.weights_root.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        }
+
+    def _get_stable_changes(self, versions: dict[str, str]) -> list[str]:
+        """Получение названий моделей, изменение весов которых завершено"""
+        if self._versions is None:
+            # Первая проверка только запоминает текущие версии
+            self._versions = versions
+            return []
+
+        changed = []
+        for name in self._versions.keys() - versions.keys():
+            # Веса модели удалены - освободим память
+            del self._versions[name]
+            self._pending.pop(name, None)
+            self.model_cache.evict(name)
+        for name, version in versions.items():
+            if self._versions.get(name) == version:
+                self._pending.pop(name, None)
+            elif self._pending.get(name) != version:
+                # Веса могут записываться в данный момент - дождёмся следующей проверки
+                self._pending[name] = version
+            else:
+                del self._pending[name]
+                is_new = name not in self._versions
+                self._versions[name] = version
+                if not is_new:
+                    changed.append(name)
+        return changed
+
+    async def _apply_model_change(self, name: str) -> None:
+        """Загрузка новой версии модели в кеш и обновление времени обучения модели в базе данных"""
+        reloaded = await asyncio.to_thread(self.model_cache.reload, name)
+        inference_pool = get_inference_pool()
+        if inference_pool.running:
+            # Процессы пула загружают новую версию в своих кешах моделей
+            await inference_pool.reload(name)
+        WATCHER_LOGGER.info(
+            f"Model '{name}' weights changed"
+            + (f", new version {reloaded.version[:8]} loaded" if reloaded else "")
+        )
+        if self.acquire_lock():
+            await self._update_trained_at(name)
+
+    async def _update_trained_at(self, name: str) -> None:
+        """Обновление времени обучения ML модели в базе данных по времени изменения весов"""
+        model_path = Path(self.weights_root, name)
+        trained_at = datetime.datetime.fromtimestamp(
+            max(
+                (
+                    path.stat().st_mtime
+                    for path in model_path.rglob("*")
+                    if path.is_file()
+                ),
+                default=model_path.stat().st_mtime,
+            )
+        )
+        async with dependencies.get_database_session_builder().get_async_session() as session:
+            ml_model = await session.scalar(select(MLModel).where(MLModel.name == name))
+            if ml_model is not None:
+                ml_model.trained_at = trained_at
+                await ModelRepository(model=MLModel, session=session).update(ml_model)
+
+    async def _check_seeds(self) -> None:
+        """Применение изменённых файлов автозаполнения"""
+        checksums = await asyncio.to_thread(
+            lambda: {
+                path: compute_checksum(path)
+                for path in get_seeding_config_paths()
+                if Path(path).exists()
+            }
+        )
+        if (
+            self._seed_checksums is None
+            or checksums == self._seed_checksums
+            or not self.acquire_lock()
+        ):
+            # Файлы автозаполнения применяются при запуске приложения и одним процессом при изменении
+            self._seed_checksums = checksums
+            return
+        async with dependencies.get_database_session_builder().get_async_session() as session:
+            changed = await seed_database(session)
+        # Контрольные суммы запоминаются после успешного применения, иначе попытка будет повторена
+        self._seed_checksums = checksums
+        if changed:
+            WATCHER_LOGGER.info("Seeding configs changed and applied to database")
@@ -0,0 +1,66 @@
+"""Условные запросы (ETag / If-None-Match) для маршрутов каталога"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+
+from src.config import config_manager
+
+
+def build_etag(version: int, request: Request) -> str:
+    """
+    Формирование строгого ETag ответа
+
+    Args:
+        version (int): Версия таблицы, на основе которой формируется ответ
+        request (Request): Запрос, параметры которого (фильтры, страница, поля) влияют на содержимое ответа
+
+    Returns:
+        (str): Значение ETag в кавычках
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{query}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def is_etag_matched(request: Request, etag: str) -> bool:
+    """Проверка, совпадает ли ETag с одним из значений заголовка `If-None-Match`"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Для If-None-Match используется слабое сравнение - игнорируем префикс W/
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def get_cache_control() -> str:
+    """Получение значения заголовка `Cache-Control` для ответов каталога"""
+    max_age = config_manager.cache_config.catalog_max_age
+    if max_age <= 0:
+        return "no-cache"
+    return f"max-age={max_age}, must-revalidate"
+
+
+def apply_etag(request: Request, response: Response, version: int) -> Response | None:
+    """
+    Установка заголовков кеширования ответа и проверка актуальности копии клиента
+
+    Args:
+        request (Request): Запрос клиента
+        response (Response): Объект ответа маршрута (для установки заголовков)
+        version (int): Версия таблицы, на основе которой формируется ответ
+
+    Returns:
+        (Response | None): Ответ `304 Not Modified`, если копия клиента актуальна, иначе None
+    """
+    etag = build_etag(version, request)
+    headers = {"ETag": etag, "Cache-Control": get_cache_control()}
+    if is_etag_matched(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
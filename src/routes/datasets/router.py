@@ -1,11 +1,13 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query, Request, Response
 from fastapi import status
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 
-from .schemas import DatasetInfo
+from .schemas import DatasetField, DatasetInfo
+from ..conditional import apply_etag
+from ..pagination import PageParams, build_page_response, get_page_params
 from ... import dependencies
 from ...database.models import Dataset
 from ...database.repository import DatabaseRepository, ModelRepository
@@ -16,17 +18,50 @@ router = APIRouter()
 DependDatabaseRepository = Annotated[
     DatabaseRepository, Depends(dependencies.get_database_repository)
 ]
+DependPageParams = Annotated[PageParams, Depends(get_page_params)]
 
 
 @router.get(
     "/",
     response_model=list[DatasetInfo],
 )
-async def get_all_datasets_route(db_repository: DependDatabaseRepository):
-    """Получение информации о всех наборах данных"""
-    result = await db_repository.for_model(Dataset).get_all()
+async def get_all_datasets_route(
+    db_repository: DependDatabaseRepository,
+    page: DependPageParams,
+    request: Request,
+    response: Response,
+    task_id: Annotated[
+        int | None, Query(description="Идентификатор задачи для фильтрации")
+    ] = None,
+    fields: Annotated[
+        list[DatasetField] | None,
+        Query(description="Поля наборов данных, включаемые в ответ"),
+    ] = None,
+):
+    """
+    Получение информации о наборах данных.
 
-    return result
+    Записи выдаются постранично в порядке возрастания идентификатора: курсор следующей страницы
+    возвращается в заголовке `X-Next-Cursor`. Поддерживаются условные запросы с заголовком `If-None-Match`.
+    """
+    repository = db_repository.for_model(Dataset)
+    # Проверим актуальность копии клиента по версии таблицы без выборки записей
+    not_modified = apply_etag(request, response, await repository.get_version())
+    if not_modified is not None:
+        return not_modified
+
+    filters = []
+    if task_id is not None:
+        filters.append(Dataset.task_id == task_id)
+
+    rows, next_key = await repository.get_page(
+        *filters,
+        limit=page.limit,
+        after=page.after,
+        columns=fields or list(DatasetInfo.model_fields),
+    )
+
+    return build_page_response(rows, next_key, response, fields=fields)
 
 
 @router.get(
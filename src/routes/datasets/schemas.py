@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel, Field
 
 
@@ -31,3 +32,7 @@ class DatasetInfo(BaseDataset):
     """ Имя колонки индекса """
     task_id: int = Field(description="Идентификатор задачи", examples=[1])
     """ Идентификатор задачи """
+
+
+DatasetField = Literal[tuple(DatasetInfo.model_fields)]  # type: ignore
+""" Названия полей схемы `DatasetInfo`, доступные для выборки """
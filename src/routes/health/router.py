@@ -1,8 +1,13 @@
+import dataclasses
 import os
+from fastapi import Depends
 from fastapi.routing import APIRouter
 import psutil
 
-from .schemas import HealthResponse
+from src.core.model_cache import get_model_cache
+from src.dependencies import get_database_session_builder
+from src.database.session import DatabaseSessionBuilder
+from .schemas import HealthResponse, ModelCacheMetricsResponse, PoolMetricsResponse
 
 
 router = APIRouter()
@@ -24,3 +29,27 @@ def health():
         "threads": len(process.threads()),
     }
     return {"status": "OK", "info": info}
+
+
+@router.get(
+    "/pool",
+    response_model=PoolMetricsResponse,
+)
+def pool_metrics(
+    session_builder: DatabaseSessionBuilder = Depends(get_database_session_builder),
+):
+    """
+    Состояние пула соединений к базе данных текущего процесса.
+    """
+    return dataclasses.asdict(session_builder.get_pool_metrics())
+
+
+@router.get(
+    "/models",
+    response_model=ModelCacheMetricsResponse,
+)
+def model_cache_metrics():
+    """
+    Состояние кеша загруженных ML моделей текущего процесса.
+    """
+    return dataclasses.asdict(get_model_cache().get_metrics())
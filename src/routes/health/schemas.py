@@ -23,3 +23,72 @@ class HealthResponse(BaseModel):
     """ Статус сервера """
     info: HealthInfo = Field(description="Информация о состоянии сервера")
     """ Информация о состоянии сервера """
+
+
+class PoolMetricsResponse(BaseModel):
+    """
+    Состояние пула соединений к базе данных текущего процесса.
+    """
+
+    size: int = Field(description="Размер пула (количество постоянно удерживаемых соединений)", examples=[5])
+    """ Размер пула (количество постоянно удерживаемых соединений) """
+    max_overflow: int = Field(description="Максимальное количество соединений сверх размера пула", examples=[10])
+    """ Максимальное количество соединений сверх размера пула """
+    checked_in: int = Field(description="Количество свободных соединений в пуле", examples=[3])
+    """ Количество свободных соединений в пуле """
+    checked_out: int = Field(description="Количество выданных соединений", examples=[2])
+    """ Количество выданных соединений """
+    overflow: int = Field(description="Текущее количество соединений сверх размера пула", examples=[0])
+    """ Текущее количество соединений сверх размера пула """
+    checkouts: int = Field(description="Количество выдач соединений с момента создания пула", examples=[1024])
+    """ Количество выдач соединений с момента создания пула """
+    timeouts: int = Field(description="Количество запросов соединения, завершившихся по таймауту", examples=[0])
+    """ Количество запросов соединения, завершившихся по таймауту """
+    wait_total: float = Field(description="Суммарное время ожидания выдачи соединения (в секундах)", examples=[0.52])
+    """ Суммарное время ожидания выдачи соединения (в секундах) """
+    wait_max: float = Field(description="Максимальное время ожидания выдачи соединения (в секундах)", examples=[0.031])
+    """ Максимальное время ожидания выдачи соединения (в секундах) """
+
+
+class ResidentModelResponse(BaseModel):
+    """
+    Состояние загруженной ML модели.
+    """
+
+    name: str = Field(description="Системное название модели", examples=["boston-housing_2025-08-22_18-33-47"])
+    """ Системное название модели """
+    version: str = Field(description="Версия весов модели")
+    """ Версия весов модели """
+    size: int = Field(description="Оценка объёма памяти (в байтах), занимаемого моделью", examples=[52428800])
+    """ Оценка объёма памяти (в байтах), занимаемого моделью """
+    hits: int = Field(description="Количество обращений к модели с момента загрузки", examples=[42])
+    """ Количество обращений к модели с момента загрузки """
+    load_time: float = Field(description="Время (в секундах) загрузки модели", examples=[1.25])
+    """ Время (в секундах) загрузки модели """
+    loaded_at: float = Field(description="Время (unix timestamp) загрузки модели", examples=[1760875200.0])
+    """ Время (unix timestamp) загрузки модели """
+
+
+class ModelCacheMetricsResponse(BaseModel):
+    """
+    Состояние кеша загруженных ML моделей текущего процесса.
+    """
+
+    memory_budget: int = Field(description="Бюджет памяти (в байтах) загруженных моделей, 0 - без ограничения", examples=[1073741824])
+    """ Бюджет памяти (в байтах) загруженных моделей, 0 - без ограничения """
+    max_size: int = Field(description="Максимальное количество загруженных моделей", examples=[8])
+    """ Максимальное количество загруженных моделей """
+    resident_size: int = Field(description="Оценка объёма памяти (в байтах), занимаемого загруженными моделями", examples=[157286400])
+    """ Оценка объёма памяти (в байтах), занимаемого загруженными моделями """
+    hits: int = Field(description="Количество запросов, получивших уже загруженную модель", examples=[1024])
+    """ Количество запросов, получивших уже загруженную модель """
+    loads: int = Field(description="Количество загрузок моделей", examples=[12])
+    """ Количество загрузок моделей """
+    reloads: int = Field(description="Количество повторных загрузок моделей, ранее удалённых из памяти", examples=[3])
+    """ Количество повторных загрузок моделей, ранее удалённых из памяти """
+    evictions: int = Field(description="Количество удалений моделей из памяти", examples=[5])
+    """ Количество удалений моделей из памяти """
+    load_time_total: float = Field(description="Суммарное время (в секундах) загрузки моделей", examples=[14.7])
+    """ Суммарное время (в секундах) загрузки моделей """
+    models: list[ResidentModelResponse] = Field(description="Загруженные модели")
+    """ Загруженные модели """
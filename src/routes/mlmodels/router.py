@@ -1,11 +1,13 @@
 from typing import Annotated
 
-from fastapi import Depends, Path
+from fastapi import Depends, Path, Query, Request, Response
 from fastapi import status
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 
-from .schemas import MLModelInfo
+from .schemas import MLModelField, MLModelInfo
+from ..conditional import apply_etag
+from ..pagination import PageParams, build_page_response, get_page_params
 from ... import dependencies
 from ...schemas import Message
 from ...database.models import MLModel
@@ -16,14 +18,47 @@ router = APIRouter()
 DependDatabaseRepository = Annotated[
     DatabaseRepository, Depends(dependencies.get_database_repository)
 ]
+DependPageParams = Annotated[PageParams, Depends(get_page_params)]
 
 
 @router.get("/", response_model=list[MLModelInfo])
-async def get_all_mlmodels_route(db_repository: DependDatabaseRepository):
-    """Получение информации о всех наборах данных"""
-    result = await db_repository.for_model(MLModel).get_all()
+async def get_all_mlmodels_route(
+    db_repository: DependDatabaseRepository,
+    page: DependPageParams,
+    request: Request,
+    response: Response,
+    dataset_id: Annotated[
+        int | None, Query(description="Идентификатор набора данных для фильтрации")
+    ] = None,
+    fields: Annotated[
+        list[MLModelField] | None,
+        Query(description="Поля ML моделей, включаемые в ответ"),
+    ] = None,
+):
+    """
+    Получение информации о ML моделях.
 
-    return result
+    Записи выдаются постранично в порядке возрастания идентификатора: курсор следующей страницы
+    возвращается в заголовке `X-Next-Cursor`. Поддерживаются условные запросы с заголовком `If-None-Match`.
+    """
+    repository = db_repository.for_model(MLModel)
+    # Проверим актуальность копии клиента по версии таблицы без выборки записей
+    not_modified = apply_etag(request, response, await repository.get_version())
+    if not_modified is not None:
+        return not_modified
+
+    filters = []
+    if dataset_id is not None:
+        filters.append(MLModel.dataset_id == dataset_id)
+
+    rows, next_key = await repository.get_page(
+        *filters,
+        limit=page.limit,
+        after=page.after,
+        columns=fields or list(MLModelInfo.model_fields),
+    )
+
+    return build_page_response(rows, next_key, response, fields=fields)
 
 
 @router.get(
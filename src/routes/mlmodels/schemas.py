@@ -1,4 +1,5 @@
 import datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 
 
@@ -32,3 +33,7 @@ class MLModelInfo(BaseMLModel):
         examples=[datetime.datetime(2023, 1, 1, 12, 5).isoformat()],
     )
     """ Время когда модель была обучена """
+
+
+MLModelField = Literal[tuple(MLModelInfo.model_fields)]  # type: ignore
+""" Названия полей схемы `MLModelInfo`, доступные для выборки """
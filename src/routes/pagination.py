@@ -0,0 +1,105 @@
+"""Постраничная выдача (keyset pagination) и выборка полей для маршрутов каталога"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Annotated, Any, Sequence
+
+from fastapi import Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import AfterValidator
+
+DEFAULT_PAGE_LIMIT = 100
+""" Количество записей на странице по умолчанию """
+MAX_PAGE_LIMIT = 1000
+""" Максимально допустимое количество записей на странице """
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+""" Заголовок ответа с курсором следующей страницы """
+
+
+def encode_cursor(key: Any) -> str:
+    """Преобразовать ключ последней записи страницы в непрозрачный курсор"""
+    raw = json.dumps({"after": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """
+    Получить ключ последней записи страницы из курсора
+
+    Raises:
+        ValueError: Если курсор некорректен или ключ в нём не является целым числом
+    """
+    if cursor is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)["after"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    # Ключи сущностей каталога - целые числа; иное значение не должно попасть в запрос к БД
+    if not isinstance(key, int) or isinstance(key, bool):
+        raise ValueError("Invalid pagination cursor")
+    return key
+
+
+@dataclass(frozen=True)
+class PageParams:
+    """Параметры запроса страницы"""
+
+    limit: int
+    """ Максимальное количество записей на странице """
+    after: int | None
+    """ Ключ последней записи предыдущей страницы """
+
+
+def get_page_params(
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=MAX_PAGE_LIMIT,
+            description="Максимальное количество записей на странице",
+        ),
+    ] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=f"Курсор следующей страницы из заголовка `{NEXT_CURSOR_HEADER}` предыдущего ответа"
+        ),
+        AfterValidator(decode_cursor),
+    ] = None,
+) -> PageParams:
+    """Получение параметров запроса страницы"""
+    return PageParams(limit=limit, after=cursor)
+
+
+def build_page_response(
+    rows: list[dict[str, Any]],
+    next_key: Any | None,
+    response: Response,
+    fields: Sequence[str] | None = None,
+) -> list[dict[str, Any]] | JSONResponse:
+    """
+    Формирование ответа со страницей записей
+
+    Args:
+        rows (list[dict[str, Any]]): Записи страницы
+        next_key (Any, optional): Ключ для запроса следующей страницы
+        response (Response): Объект ответа маршрута (для установки заголовков)
+        fields (Sequence[str], optional): Запрошенные клиентом поля. Если заданы, то ответ формируется
+            только из них в обход `response_model` маршрута
+
+    Returns:
+        (list[dict[str, Any]] | JSONResponse): Записи страницы для валидации по `response_model` или готовый ответ
+    """
+    if next_key is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_key)
+    if not fields:
+        return rows
+
+    content = [{field: row[field] for field in fields} for row in rows]
+    return JSONResponse(
+        content=jsonable_encoder(content), headers=dict(response.headers)
+    )
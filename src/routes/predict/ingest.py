@@ -0,0 +1,220 @@
+"""
+Потоковое чтение табличных данных из тела запроса.
+
+Тело запроса читается асинхронно частями и передаётся через ограниченный канал в поток разбора .csv,
+который строит таблицу по мере поступления данных: приём данных по сети и их разбор выполняются одновременно,
+а данные не сохраняются во временный файл. Сжатое тело запроса (gzip, zstd) распаковывается
+в потоке разбора по мере чтения (см. `src.core.decompress`).
+
+Разбор выполняется в отдельном ограниченном пуле потоков: поток занят на всё время загрузки тела запроса,
+поэтому медленные клиенты не должны занимать потоки общего пула цикла событий (`asyncio.to_thread`).
+Если все потоки разбора заняты, новая загрузка отклоняется. Ожидание места в канале выполняется
+в цикле событий и не занимает потоков.
+"""
+
+import asyncio
+import contextlib
+import io
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Any, AsyncIterator, Callable
+
+import pandas as pd
+
+from ...config import config_manager
+from ...core.decompress import DEFAULT_MAX_RATIO, open_decompressed
+
+STREAM_QUEUE_SIZE = 16
+""" Максимальное количество частей тела запроса, ожидающих разбора """
+CSV_CHUNK_ROWS = 10000
+""" Количество строк .csv, разбираемых за один шаг """
+
+
+class StreamParserUnavailable(RuntimeError):
+    """Все потоки разбора потоковых данных заняты"""
+
+
+class StreamParserPool:
+    """Ограниченный пул потоков разбора потоковых данных без очереди ожидания"""
+
+    def __init__(self, workers: int) -> None:
+        """
+        Args:
+            workers (int): Максимальное количество одновременно разбираемых потоков данных
+        """
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="csv-stream"
+        )
+        self._active = 0
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """
+        Запуск разбора в свободном потоке пула
+
+        Raises:
+            StreamParserUnavailable: Если все потоки пула заняты
+        """
+        if self._active >= self.workers:
+            raise StreamParserUnavailable(f"All {self.workers} stream parsers are busy")
+        self._active += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _: asyncio.Future) -> None:
+        self._active -= 1
+
+
+@cache
+def get_stream_parser_pool() -> StreamParserPool:
+    """Получение пула потоков разбора потоковых данных"""
+    return StreamParserPool(workers=config_manager.upload_config.stream_parsers)
+
+
+class ChunkPipe(io.RawIOBase):
+    """
+    Канал передачи частей данных из цикла событий в поток разбора.
+
+    Поток разбора читает канал как файл и ожидает поступления очередной части. Запись в заполненный канал
+    приостанавливает чтение тела запроса, поэтому медленный разбор не приводит к накоплению данных в памяти.
+    """
+
+    _EOF = b""
+
+    def __init__(self, max_chunks: int = STREAM_QUEUE_SIZE) -> None:
+        super().__init__()
+        self._queue: queue.Queue[bytes] = queue.Queue(maxsize=max_chunks)
+        self._buffer = memoryview(b"")
+        self._aborted = False
+        # Ожидание места в канале выполняется в цикле событий, а не в отдельном потоке
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._space = asyncio.Event()
+        self._writer_waiting = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            chunk = self._queue.get()
+            self._notify_writer()
+            if not chunk:
+                # Сохраним признак конца данных для повторных чтений
+                self._queue.put(self._EOF)
+                return 0
+            self._buffer = memoryview(chunk)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def _notify_writer(self) -> None:
+        """Сообщить циклу событий об освобождении места в канале"""
+        if self._writer_waiting and self._loop is not None:
+            self._writer_waiting = False
+            self._loop.call_soon_threadsafe(self._space.set)
+
+    async def _put(self, chunk: bytes) -> None:
+        self._loop = asyncio.get_running_loop()
+        while not self._aborted:
+            try:
+                self._queue.put_nowait(chunk)
+                return
+            except queue.Full:
+                self._writer_waiting = True
+                self._space.clear()
+                # Поток разбора мог освободить место до установки признака ожидания
+                if not self._queue.full():
+                    continue
+                await self._space.wait()
+
+    async def put(self, chunk: bytes) -> None:
+        """Передать часть данных в поток разбора, ожидая освобождения места в канале"""
+        if chunk:
+            await self._put(chunk)
+
+    async def finish(self) -> None:
+        """Сообщить потоку разбора о конце данных"""
+        await self._put(self._EOF)
+
+    def abort(self) -> None:
+        """Прекратить передачу данных, освободив ожидающие запись и чтение"""
+        self._aborted = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put_nowait(self._EOF)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._space.set)
+
+
+def _parse_csv(
+    pipe: ChunkPipe,
+    chunk_rows: int,
+    encoding: str | None,
+    max_ratio: float,
+    max_size: int,
+) -> pd.DataFrame:
+    """Разбор .csv из канала частями по `chunk_rows` строк с распаковкой сжатых данных"""
+    try:
+        if encoding is None:
+            source = io.BufferedReader(pipe, 1 << 16)
+        else:
+            source = open_decompressed(
+                pipe, encoding, max_ratio=max_ratio, max_size=max_size
+            )
+        frames = list(pd.read_csv(source, chunksize=chunk_rows))
+    except BaseException:
+        pipe.abort()
+        raise
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+async def read_csv_stream(
+    chunks: AsyncIterator[bytes],
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    encoding: str | None = None,
+    max_ratio: float = DEFAULT_MAX_RATIO,
+    max_size: int = 0,
+) -> pd.DataFrame:
+    """
+    Чтение таблицы .csv из асинхронного потока частей данных
+
+    Args:
+        chunks (AsyncIterator[bytes]): Части данных (например, `Request.stream()`)
+        chunk_rows (int): Количество строк, разбираемых за один шаг
+        encoding (str | None): Способ сжатия данных (см. `get_encoding`). Значение None - данные не сжаты
+        max_ratio (float): Максимальное отношение размера распакованных данных к размеру сжатых
+        max_size (int): Максимальный размер (в байтах) распакованных данных. Значение 0 отключает ограничение
+
+    Returns:
+        (pd.DataFrame): Таблица данных
+
+    Raises:
+        StreamParserUnavailable: Если все потоки разбора заняты
+        ValueError: Если данные не удалось распаковать или разобрать как .csv
+    """
+    pipe = ChunkPipe()
+    parser = get_stream_parser_pool().submit(
+        _parse_csv, pipe, chunk_rows, encoding, max_ratio, max_size
+    )
+    try:
+        async for chunk in chunks:
+            if parser.done():
+                # Разбор завершился ошибкой - остальные данные не нужны
+                break
+            await pipe.put(chunk)
+        await pipe.finish()
+    except BaseException:
+        # Поток разбора не должен ожидать данных, которые уже не поступят
+        pipe.abort()
+        with contextlib.suppress(Exception):
+            await parser
+        raise
+    return await parser
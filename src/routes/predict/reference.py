@@ -0,0 +1,181 @@
+"""
+Чтение файлов наборов данных, хранящихся на сервере, для предсказания по ссылке.
+
+Файлы выбираются шаблоном glob внутри каталога набора данных и читаются частями: несжатые файлы
+отображаются в память, сжатые (gzip, zstd) распаковываются по мере чтения. Диапазон строк и условия
+отбора применяются к каждой части, поэтому размер файла не ограничен объёмом памяти.
+"""
+
+import contextlib
+import operator
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextFileReader
+
+from .schemas import RowFilter
+from ...core.decompress import get_encoding, open_decompressed
+
+DATASET_FILE_SUFFIXES = (".csv", ".csv.gz", ".csv.gzip", ".csv.zst", ".csv.zstd")
+""" Расширения файлов набора данных, доступных для предсказания """
+MAX_DATASET_FILES = 1000
+""" Максимальное количество файлов, выбираемых одним шаблоном """
+
+_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+
+def resolve_dataset_files(dataset_root: Path, pattern: str) -> list[Path]:
+    """
+    Поиск файлов набора данных по шаблону
+
+    Шаблон не может выходить за пределы каталога набора данных: абсолютные пути и `..` запрещены,
+    а файлы, чьи символические ссылки указывают за пределы каталога, пропускаются.
+
+    Args:
+        dataset_root (Path): Каталог набора данных
+        pattern (str): Имя файла или шаблон glob относительно каталога набора данных
+
+    Returns:
+        (list[Path]): Отсортированные пути до найденных файлов
+
+    Raises:
+        ValueError: Если шаблон недопустим или по нему не найдено ни одного файла
+    """
+    parts = PurePosixPath(pattern).parts
+    if not pattern or "\\" in pattern or pattern.startswith("/") or ".." in parts:
+        raise ValueError(
+            f"File pattern '{pattern}' must be relative to the dataset directory"
+        )
+    root = dataset_root.resolve()
+    if not root.is_dir():
+        raise ValueError(f"No found dataset directory '{dataset_root}'")
+
+    files = []
+    for path in sorted(root.glob(pattern)):
+        if not path.name.lower().endswith(DATASET_FILE_SUFFIXES) or not path.is_file():
+            continue
+        if not path.resolve().is_relative_to(root):
+            continue
+        files.append(path)
+        if len(files) > MAX_DATASET_FILES:
+            raise ValueError(
+                f"File pattern '{pattern}' matches more than {MAX_DATASET_FILES} files"
+            )
+    if not files:
+        raise ValueError(f"No found dataset files by pattern '{pattern}'")
+    return files
+
+
+@contextlib.contextmanager
+def _open_csv(path: Path, **kwargs):
+    """Открытие файла .csv для чтения `pd.read_csv` с распаковкой сжатых файлов"""
+    encoding = get_encoding(filename=path.name)
+    with contextlib.ExitStack() as stack:
+        if encoding is None:
+            # Несжатый файл отображается в память: чтение не копирует его через буферы файла
+            result = pd.read_csv(path, memory_map=True, **kwargs)
+        else:
+            file = stack.enter_context(open(path, "rb"))
+            # Файлы сервера считаются доверенными - отношение сжатия не ограничивается
+            result = pd.read_csv(
+                open_decompressed(file, encoding, max_ratio=0), **kwargs
+            )
+        if isinstance(result, TextFileReader):
+            stack.enter_context(result)
+        yield result
+
+
+def read_dataset_columns(path: Path) -> list[str]:
+    """Получение названий столбцов файла набора данных"""
+    with _open_csv(path, nrows=0) as header:
+        return list(header.columns)
+
+
+def validate_filters(filters: Sequence[RowFilter], columns: Sequence[str]) -> None:
+    """
+    Проверка условий отбора строк до начала чтения файла
+
+    Raises:
+        ValueError: Если столбец не найден или значение не подходит оператору
+    """
+    for row_filter in filters:
+        if row_filter.column not in columns:
+            raise ValueError(f"No found column '{row_filter.column}' to filter rows")
+        if row_filter.op in ("in", "not_in"):
+            if not isinstance(row_filter.value, list):
+                raise ValueError(
+                    f"Operator '{row_filter.op}' for column '{row_filter.column}' requires a list of values"
+                )
+        elif isinstance(row_filter.value, list):
+            raise ValueError(
+                f"Operator '{row_filter.op}' for column '{row_filter.column}' requires a single value"
+            )
+
+
+def get_filter_mask(data: pd.DataFrame, filters: Sequence[RowFilter]) -> np.ndarray:
+    """Получение маски строк, удовлетворяющих всем условиям отбора"""
+    mask = np.ones(len(data), dtype=bool)
+    for row_filter in filters:
+        column = data[row_filter.column]
+        if row_filter.op in ("in", "not_in"):
+            matched = column.isin(row_filter.value)
+            if row_filter.op == "not_in":
+                matched = ~matched
+        else:
+            matched = _OPERATORS[row_filter.op](column, row_filter.value)
+        mask &= matched.to_numpy(dtype=bool)
+    return mask
+
+
+def iter_dataset_chunks(
+    path: Path,
+    start: int = 0,
+    stop: int | None = None,
+    chunk_rows: int = 10000,
+    filters: Sequence[RowFilter] = (),
+    drop_columns: Sequence[str] = (),
+) -> Iterator[tuple[np.ndarray, pd.DataFrame]]:
+    """
+    Чтение файла набора данных частями
+
+    Args:
+        path (Path): Путь до файла (.csv или сжатый .csv)
+        start (int): Номер первой строки данных (с 0)
+        stop (int, optional): Номер строки данных, до которой (не включая) выполняется чтение
+        chunk_rows (int): Количество строк, читаемых за один шаг (до отбора строк)
+        filters (Sequence[RowFilter]): Условия отбора строк
+        drop_columns (Sequence[str]): Столбцы, исключаемые из данных (например, целевой атрибут)
+
+    Yields:
+        (tuple[np.ndarray[N], pd.DataFrame]): Номера строк данных в файле и сами строки. Части без
+            отобранных строк пропускаются
+    """
+    if stop is not None and stop <= start:
+        return
+    with _open_csv(
+        path,
+        chunksize=chunk_rows,
+        # Строка 0 - заголовок, поэтому пропускаются строки файла с 1 по `start`
+        skiprows=(lambda line: 0 < line <= start) if start else None,
+        nrows=None if stop is None else stop - start,
+    ) as reader:
+        offset = start
+        for chunk in reader:
+            rows = np.arange(offset, offset + len(chunk))
+            offset += len(chunk)
+            if filters:
+                mask = get_filter_mask(chunk, filters)
+                if not mask.any():
+                    continue
+                chunk, rows = chunk[mask], rows[mask]
+            columns = [column for column in drop_columns if column in chunk.columns]
+            yield rows, chunk.drop(columns=columns) if columns else chunk
@@ -1,33 +1,186 @@
 import asyncio
+import contextlib
 import datetime
+import json
 from logging import Logger
-from typing import Annotated
+from pathlib import Path as FilePath
+from typing import Annotated, Any, AsyncIterator
 
-from fastapi import Depends, File, Path, UploadFile
+import numpy as np
+import pandas as pd
+from fastapi import Depends, File, Path, Query, Request, UploadFile
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.routing import APIRouter
 
 
-from .schemas import PredictOutput
+from .ingest import StreamParserUnavailable, read_csv_stream
+from .reference import (
+    iter_dataset_chunks,
+    read_dataset_columns,
+    resolve_dataset_files,
+    validate_filters,
+)
+from .schemas import (
+    DatasetPredictInput,
+    MultiPredictOutput,
+    PredictOutput,
+    PredictOutputMode,
+)
 from .service import PredictService
 from ... import dependencies
-from ...database.models import MLModel
+from ...config import config_manager
+from ...core.decompress import UnsupportedEncodingError, get_encoding
+from ...core.predict import ModelClassesUnavailable, get_top_k
+from ...database.models import Dataset, MLModel
+from ...database.snapshots import MLModelSnapshot
 from ...database.repository import DatabaseRepository, ModelRepository
+from ...inference_pool import get_inference_pool
 from ...schemas import Message
 
 router = APIRouter()
+models_router = APIRouter()
+""" Маршруты предсказания несколькими ML моделями (не привязаны к одной модели) """
 
 DependDatabaseRepository = Annotated[
     DatabaseRepository, Depends(dependencies.get_database_repository)
 ]
 DependLogger = Annotated[Logger, Depends(dependencies.get_app_logger)]
+QueryOutputMode = Annotated[
+    PredictOutputMode,
+    Query(
+        description="Режим вывода: `labels` - метки, `proba` - вероятности всех классов, "
+        "`top_k` - `top_k` наиболее вероятных классов. Вероятности доступны только для классификации"
+    ),
+]
+QueryTopK = Annotated[
+    int, Query(ge=1, description="Количество классов для режима вывода `top_k`")
+]
+
+PROBA_DECIMALS = 6
+""" Количество знаков после запятой в вероятностях классов ответа """
+
+
+def _preparing_error(ml_model: MLModel | MLModelSnapshot) -> JSONResponse:
+    """Ответ об ошибке предобработки данных для модели"""
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={
+            "message": "Preparing the uploaded file caused an error. "
+            "Check correctness of column titles, cell types and whether this data belongs "
+            f"to the training dataset with title '{ml_model.dataset.title}'.",
+        },
+    )
+
+
+def _classes_error(ml_model: MLModel | MLModelSnapshot) -> JSONResponse:
+    """Ответ об ошибке определения меток классов модели"""
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "message": f"Class labels of the ML model with id {ml_model.id} couldn't be determined, "
+            "so class probabilities are unavailable. Use output mode 'labels'.",
+        },
+    )
+
+
+def _check_output_mode(
+    ml_model: MLModel | MLModelSnapshot, output: PredictOutputMode
+) -> JSONResponse | None:
+    """Ответ об ошибке, если режим вывода недоступен для модели"""
+    if output != "labels" and ml_model.dataset.task.name != "classification":
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": f"Output mode '{output}' is available only for classification models."
+            },
+        )
+    return None
+
+
+async def _predict_array(
+    ml_model: MLModel | MLModelSnapshot, data: pd.DataFrame, proba: bool = False
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    """
+    Предобработка данных и предсказание моделью в пуле процессов или в потоке процесса API
+
+    При `proba=True` возвращаются вероятности классов и метки классов (см. `PredictService.get_predict_proba`).
+
+    Raises:
+        ValueError: Если данные не удалось предобработать для модели
+    """
+    inference_pool = get_inference_pool()
+    if inference_pool.running:
+        # Предобработка и предсказание выполняются процессом пула, за которым закреплена модель
+        return await inference_pool.predict(ml_model, data, proba=proba)
+
+    # Получим загруженную модель: запрос выполняется на этой версии, даже если модель будет обновлена
+    cached_model = await asyncio.to_thread(PredictService.get_model, ml_model)
+    # Предобработаем данные
+    # Воспользуемся asyncio.to_thread для вынесения ресурсоемких задач в отдельный поток
+    prepared_data = await asyncio.to_thread(
+        PredictService.prepare_data_for_prediction, data, ml_model, cached_model
+    )
+    # Получим предсказания от модели
+    predict_method = (
+        PredictService.get_predict_proba if proba else PredictService.get_predict
+    )
+    return await asyncio.to_thread(
+        predict_method, prepared_data, ml_model, cached_model
+    )
+
+
+def _format_predictions(
+    result: np.ndarray | tuple[np.ndarray, np.ndarray],
+    output: PredictOutputMode,
+    top_k: int,
+) -> dict[str, Any]:
+    """Формирование полей ответа с предсказаниями в режиме вывода `output`"""
+    if output == "labels":
+        return {"predictions": result.tolist()}
+
+    # Метки и вероятности получены за одно предсказание вероятностей
+    probabilities, classes = result
+    if output == "proba":
+        return {
+            "predictions": classes[probabilities.argmax(axis=1)].tolist(),
+            "classes": classes.tolist(),
+            "probabilities": probabilities.round(PROBA_DECIMALS).tolist(),
+        }
+    top_classes, top_scores = get_top_k(probabilities, classes, top_k)
+    return {
+        "predictions": top_classes[:, 0].tolist(),
+        "top_classes": top_classes.tolist(),
+        "top_scores": top_scores.round(PROBA_DECIMALS).tolist(),
+    }
+
+
+async def _predict_response(
+    ml_model: MLModel | MLModelSnapshot,
+    data: pd.DataFrame,
+    output: PredictOutputMode = "labels",
+    top_k: int = 1,
+) -> dict[str, Any] | JSONResponse:
+    """Предобработка данных, предсказание и формирование ответа в режиме вывода `output`"""
+    try:
+        result = await _predict_array(ml_model, data, proba=output != "labels")
+    except ValueError:
+        return _preparing_error(ml_model)
+    except ModelClassesUnavailable:
+        return _classes_error(ml_model)
+
+    return {
+        "mlmodel": ml_model,
+        "predicted_at": datetime.datetime.now(),
+        **_format_predictions(result, output, top_k),
+    }
 
 
 @router.post(
     "/",
     tags=["Predict"],
     response_model=PredictOutput,
+    response_model_exclude_none=True,
     responses={
         status.HTTP_404_NOT_FOUND: {
             "model": Message,
@@ -37,6 +190,14 @@ DependLogger = Annotated[Logger, Depends(dependencies.get_app_logger)]
             "model": Message,
             "description": "The uploaded file was incorrect",
         },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "model": Message,
+            "description": "Class labels of the ML model couldn't be determined",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "model": Message,
+            "description": "The compression of the uploaded file is not supported",
+        },
     },
 )
 async def get_model_prediction_route(
@@ -44,27 +205,37 @@ async def get_model_prediction_route(
     mlmodel_id: Annotated[
         int, Path(description="Идентификатор ML модели", examples=[8])
     ],
+    output: QueryOutputMode = "labels",
+    top_k: QueryTopK = 1,
     data_file: UploadFile = File(
-        description="Файл формата .csv, содержащий столбцы признаков из обучающего набора данных."
+        description="Файл формата .csv, содержащий столбцы признаков из обучающего набора данных. "
+        "Сжатый файл (.csv.gz, .csv.zst) распаковывается при разборе."
     ),
 ):
     """
     Предсказание данных из `data_file`файла моделью, обученной на `dataset_name` наборе данных.
     """
-    # Загрузим сущность модели вместе с набором данных
-    ml_model = await db_repository.for_model(MLModel).get(
-        mlmodel_id, with_relationships=[MLModel.dataset]
-    )
+    # Загрузим снимок модели вместе с набором данных (из кеша каталога, если он актуален)
+    ml_model = await db_repository.for_model(MLModel).get_snapshot(mlmodel_id)
     # Если сущность не найдена
     if ml_model is None:
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"message": "ML model with id {mlmodel_id} not found."},
         )
+    # Проверим доступность режима вывода для модели
+    output_error = _check_output_mode(ml_model, output)
+    if output_error is not None:
+        return output_error
     # Загрузим данные
     try:
         # Воспользуемся asyncio.to_thread для вынесения ресурсоемких задач в отдельный поток
         data = await asyncio.to_thread(PredictService.load_data_from_file, data_file)
+    except UnsupportedEncodingError as e:
+        return JSONResponse(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            content={"message": f"{e}."},
+        )
     except ValueError:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -79,29 +250,387 @@ async def get_model_prediction_route(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "No found any row in uploaded data file."},
         )
-    # Предобработаем данные
+    return await _predict_response(ml_model, data, output=output, top_k=top_k)
+
+
+@router.post(
+    "/stream",
+    tags=["Predict"],
+    response_model=PredictOutput,
+    response_model_exclude_none=True,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "model": Message,
+            "description": "The ML model was not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": Message,
+            "description": "The request body was incorrect",
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "model": Message,
+            "description": "Class labels of the ML model couldn't be determined",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "model": Message,
+            "description": "The request body compression is not supported",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def get_model_stream_prediction_route(
+    db_repository: DependDatabaseRepository,
+    mlmodel_id: Annotated[
+        int, Path(description="Идентификатор ML модели", examples=[8])
+    ],
+    request: Request,
+    output: QueryOutputMode = "labels",
+    top_k: QueryTopK = 1,
+):
+    """
+    Предсказание данных из тела запроса в формате .csv моделью, обученной на `dataset_name` наборе данных.
+
+    Тело запроса разбирается по мере поступления, без предварительного сохранения файла,
+    поэтому разбор больших файлов завершается практически одновременно с их передачей.
+    Сжатое тело запроса (`Content-Encoding: gzip` или `zstd`) распаковывается при разборе.
+    """
+    # Загрузим снимок модели вместе с набором данных (из кеша каталога, если он актуален)
+    ml_model = await db_repository.for_model(MLModel).get_snapshot(mlmodel_id)
+    # Если сущность не найдена
+    if ml_model is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"ML model with id {mlmodel_id} not found."},
+        )
+    # Проверим доступность режима вывода для модели
+    output_error = _check_output_mode(ml_model, output)
+    if output_error is not None:
+        return output_error
+    # Определим способ сжатия тела запроса
+    try:
+        encoding = get_encoding(
+            content_encoding=request.headers.get("content-encoding")
+        )
+    except UnsupportedEncodingError as e:
+        return JSONResponse(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            content={"message": f"{e}."},
+        )
+    # Загрузим данные по мере поступления тела запроса
+    upload_config = config_manager.upload_config
+    try:
+        data = await read_csv_stream(
+            request.stream(),
+            encoding=encoding,
+            max_ratio=upload_config.max_decompression_ratio,
+            max_size=int(upload_config.max_decompressed_size * 1024**2),
+        )
+    except StreamParserUnavailable:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": "Too many uploads are being processed, retry later."},
+            headers={"Retry-After": "1"},
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": "Reading the request body caused an error. "
+                "Check the data format and the integrity of the content."
+            },
+        )
+    # Проверим длину данных
+    if data.shape[0] == 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "No found any row in request body."},
+        )
+    return await _predict_response(ml_model, data, output=output, top_k=top_k)
+
+
+async def _stream_dataset_predictions(
+    ml_model: MLModelSnapshot,
+    dataset_root: FilePath,
+    files: list[FilePath],
+    params: DatasetPredictInput,
+    drop_columns: list[str],
+    output: PredictOutputMode,
+    top_k: int,
+) -> AsyncIterator[bytes]:
+    """
+    Предсказание файлов набора данных по частям с выдачей строк NDJSON
+
+    Следующая часть файла читается, пока выполняется предсказание текущей. Ошибка передаётся
+    последней строкой ответа с полем `error`, так как заголовки ответа уже отправлены.
+    """
+    for path in files:
+        name = path.relative_to(dataset_root).as_posix()
+        chunks = iter_dataset_chunks(
+            path,
+            start=params.start,
+            stop=params.stop,
+            chunk_rows=params.chunk_rows,
+            filters=params.filters,
+            drop_columns=drop_columns,
+        )
+        pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+        try:
+            while True:
+                try:
+                    item = await pending
+                except (ValueError, TypeError, OSError) as e:
+                    yield _dump_line(
+                        {"file": name, "error": f"Couldn't read file: {e}"}
+                    )
+                    return
+                if item is None:
+                    break
+                # Прочитаем следующую часть файла, пока выполняется предсказание текущей
+                pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+                rows, data = item
+                try:
+                    result = await _predict_array(
+                        ml_model, data, proba=output != "labels"
+                    )
+                except ValueError:
+                    yield _dump_line(
+                        {
+                            "file": name,
+                            "error": "Preparing the dataset file caused an error. "
+                            "Check whether this data belongs to the training dataset "
+                            f"with title '{ml_model.dataset.title}'.",
+                        }
+                    )
+                    return
+                except ModelClassesUnavailable:
+                    yield _dump_line(
+                        {
+                            "file": name,
+                            "error": "Class labels of the ML model couldn't be determined. "
+                            "Use output mode 'labels'.",
+                        }
+                    )
+                    return
+                yield _dump_line(
+                    {
+                        "file": name,
+                        "rows": rows.tolist(),
+                        **_format_predictions(result, output, top_k),
+                    }
+                )
+        finally:
+            # Генератор чтения нельзя закрыть, пока он читает часть файла в другом потоке
+            with contextlib.suppress(Exception):
+                await pending
+            await asyncio.to_thread(chunks.close)
+
+
+def _dump_line(content: dict[str, Any]) -> bytes:
+    return (json.dumps(content, ensure_ascii=False) + "\n").encode()
+
+
+@router.post(
+    "/dataset",
+    tags=["Predict"],
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Predictions by chunks: one JSON object per line with the fields "
+            "`file`, `rows` (row numbers in the file) and the prediction fields of the output mode. "
+            "An error after the response has started is reported as a line with the field `error`.",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "model": Message,
+            "description": "The ML model or the dataset was not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": Message,
+            "description": "The file pattern or the row filters were incorrect",
+        },
+    },
+)
+async def get_model_dataset_prediction_route(
+    db_repository: DependDatabaseRepository,
+    mlmodel_id: Annotated[
+        int, Path(description="Идентификатор ML модели", examples=[8])
+    ],
+    params: DatasetPredictInput,
+    output: QueryOutputMode = "labels",
+    top_k: QueryTopK = 1,
+):
+    """
+    Предсказание данных из файлов набора данных, хранящихся на сервере, без их загрузки в запросе.
+
+    Файлы выбираются шаблоном внутри каталога набора данных и читаются частями, а предсказания
+    передаются по мере готовности в формате NDJSON (строка на каждую часть файла).
+    """
+    # Загрузим снимок модели вместе с набором данных (из кеша каталога, если он актуален)
+    ml_model = await db_repository.for_model(MLModel).get_snapshot(mlmodel_id)
+    # Если сущность не найдена
+    if ml_model is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"ML model with id {mlmodel_id} not found."},
+        )
+    # Проверим доступность режима вывода для модели
+    output_error = _check_output_mode(ml_model, output)
+    if output_error is not None:
+        return output_error
+    # Загрузим снимок набора данных, файлы которого нужно предсказать
+    dataset_id = ml_model.dataset_id if params.dataset_id is None else params.dataset_id
+    dataset = await db_repository.for_model(Dataset).get_snapshot(dataset_id)
+    if dataset is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"Dataset with id {dataset_id} not found."},
+        )
+    # Найдём файлы и проверим условия отбора строк до начала ответа
+    dataset_root = FilePath(
+        config_manager.storage_config.datasets_root, dataset.name
+    ).resolve()
+    try:
+        files = await asyncio.to_thread(
+            resolve_dataset_files, dataset_root, params.files
+        )
+        for path in files:
+            columns = await asyncio.to_thread(read_dataset_columns, path)
+            validate_filters(params.filters, columns)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": f"{e}."},
+        )
+
+    return StreamingResponse(
+        _stream_dataset_predictions(
+            ml_model,
+            dataset_root,
+            files,
+            params,
+            # Целевой атрибут присутствует в обучающих файлах, но не является признаком
+            drop_columns=[dataset.target_column],
+            output=output,
+            top_k=top_k,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@models_router.post(
+    "/",
+    tags=["Predict"],
+    response_model=MultiPredictOutput,
+    response_model_exclude_none=True,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "model": Message,
+            "description": "One of the ML models was not found",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": Message,
+            "description": "The uploaded file was incorrect or the ML models belong to different datasets",
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {
+            "model": Message,
+            "description": "The compression of the uploaded file is not supported",
+        },
+    },
+)
+async def get_models_prediction_route(
+    db_repository: DependDatabaseRepository,
+    mlmodel_ids: Annotated[
+        list[int],
+        Query(
+            description="Идентификаторы ML моделей, обученных на одном наборе данных",
+            min_length=1,
+            examples=[[8, 9]],
+        ),
+    ],
+    ensemble: Annotated[
+        bool,
+        Query(description="Добавить в ответ предсказания ансамбля моделей"),
+    ] = False,
+    data_file: UploadFile = File(
+        description="Файл формата .csv, содержащий столбцы признаков из обучающего набора данных. "
+        "Сжатый файл (.csv.gz, .csv.zst) распаковывается при разборе."
+    ),
+):
+    """
+    Предсказание данных из `data_file` файла несколькими моделями, обученными на одном наборе данных.
+
+    Файл разбирается один раз, а предсказания моделей выполняются одновременно, поэтому время ответа
+    определяется самой медленной моделью, а не суммой времени всех моделей.
+    """
+    # Загрузим снимки моделей, сохранив порядок из запроса и убрав повторы
+    ml_models: list[MLModelSnapshot] = []
+    repository = db_repository.for_model(MLModel)
+    for mlmodel_id in dict.fromkeys(mlmodel_ids):
+        ml_model = await repository.get_snapshot(mlmodel_id)
+        # Если сущность не найдена
+        if ml_model is None:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": f"ML model with id {mlmodel_id} not found."},
+            )
+        ml_models.append(ml_model)
+    # Модели должны ожидать одни и те же признаки
+    if len({ml_model.dataset_id for ml_model in ml_models}) > 1:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": "ML models must be trained on the same dataset to predict one file."
+            },
+        )
+    # Загрузим данные один раз для всех моделей
     try:
         # Воспользуемся asyncio.to_thread для вынесения ресурсоемких задач в отдельный поток
-        prepared_data = await asyncio.to_thread(
-            PredictService.prepare_data_for_prediction, data, ml_model
+        data = await asyncio.to_thread(PredictService.load_data_from_file, data_file)
+    except UnsupportedEncodingError as e:
+        return JSONResponse(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            content={"message": f"{e}."},
         )
     except ValueError:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
-                "message": "Preparing the uploaded file caused an error. "
-                "Check correctness of column titles, cell types and whether this data belongs "
-                f"to the training dataset with title '{ml_model.dataset.title}'.",
+                "message": "Reading the uploaded file caused an error. "
+                "Check the file format and the integrity of the content."
             },
         )
-    # Получим предсказания от модели
-    # Воспользуемся asyncio.to_thread для вынесения ресурсоемких задач в отдельный поток
-    result_array = await asyncio.to_thread(
-        PredictService.get_predict, prepared_data, ml_model
+    # Проверим длину файла
+    if data.shape[0] == 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "No found any row in uploaded data file."},
+        )
+
+    # Выполним предсказания всех моделей одновременно
+    results = await asyncio.gather(
+        *(_predict_array(ml_model, data) for ml_model in ml_models),
+        return_exceptions=True,
     )
+    for ml_model, result in zip(ml_models, results):
+        if isinstance(result, ValueError):
+            return _preparing_error(ml_model)
+        if isinstance(result, BaseException):
+            raise result
 
-    return {
-        "mlmodel": ml_model,
+    response: dict[str, Any] = {
         "predicted_at": datetime.datetime.now(),
-        "predictions": result_array.tolist(),
+        "results": [
+            {"mlmodel": ml_model, "predictions": result.tolist()}
+            for ml_model, result in zip(ml_models, results)
+        ],
     }
+    if ensemble:
+        response["ensemble"] = PredictService.get_ensemble_predict(
+            results, task=ml_models[0].dataset.task.name
+        ).tolist()
+    return response
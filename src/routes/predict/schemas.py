@@ -1,7 +1,11 @@
 import datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 from ..mlmodels.schemas import BaseMLModel
 
+PredictOutputMode = Literal["labels", "proba", "top_k"]
+""" Режим вывода предсказаний: метки, вероятности всех классов или `k` наиболее вероятных классов """
+
 
 class PredictOutput(BaseModel):
     """Выходные данные от предсказания"""
@@ -16,9 +20,128 @@ class PredictOutput(BaseModel):
         examples=[datetime.datetime(2023, 1, 1, 12, 5).isoformat()],
     )
     """Время выполнения предсказания"""
-    predictions: list[float | int] = Field(
+    predictions: list[str | int | float] = Field(
         description="Список предсказаний целевого атрибута. Формат зависимости от типа задачи \
-            (float - регрессия, int - классификация). Порядок аналогичен порядку строк в переданных данных.",
-        examples=[[0.15, 26.1, 72.5], [0, 1, 1, 2, 0]],
+            (float - регрессия, метки классов (int или str) - классификация). Порядок аналогичен порядку строк \
+            в переданных данных.",
+        examples=[[0.15, 26.1, 72.5], [0, 1, 1, 2, 0], ["setosa", "virginica"]],
+    )
+    """Список предсказаний целевого атрибута"""
+    classes: list[str | int | float] | None = Field(
+        default=None,
+        description="Метки классов в порядке столбцов `probabilities` (режим вывода `proba`)",
+        examples=[["setosa", "versicolor", "virginica"]],
+    )
+    """Метки классов в порядке столбцов вероятностей"""
+    probabilities: list[list[float]] | None = Field(
+        default=None,
+        description="Вероятности классов: строка на каждую строку данных, столбец на каждый класс из `classes` \
+            (режим вывода `proba`)",
+        examples=[[[0.9, 0.08, 0.02], [0.1, 0.7, 0.2]]],
+    )
+    """Вероятности классов"""
+    top_classes: list[list[str | int | float]] | None = Field(
+        default=None,
+        description="Наиболее вероятные классы каждой строки по убыванию вероятности (режим вывода `top_k`)",
+        examples=[[["setosa", "versicolor"], ["versicolor", "virginica"]]],
+    )
+    """Наиболее вероятные классы каждой строки"""
+    top_scores: list[list[float]] | None = Field(
+        default=None,
+        description="Вероятности классов из `top_classes` (режим вывода `top_k`)",
+        examples=[[[0.9, 0.08], [0.7, 0.2]]],
+    )
+    """Вероятности наиболее вероятных классов"""
+
+
+class ModelPredictions(BaseModel):
+    """Предсказания одной ML модели"""
+
+    mlmodel: BaseMLModel = Field(
+        description="Информация об ML модели, использовавшейся для предсказания"
+    )
+    """ML модель"""
+    predictions: list[str | int | float] = Field(
+        description="Список предсказаний целевого атрибута. Порядок аналогичен порядку строк в переданных данных.",
+        examples=[[0.15, 26.1, 72.5], [0, 1, 1, 2, 0], ["setosa", "virginica"]],
     )
     """Список предсказаний целевого атрибута"""
+
+
+class MultiPredictOutput(BaseModel):
+    """Выходные данные от предсказания несколькими ML моделями"""
+
+    predicted_at: datetime.datetime = Field(
+        description="Время выполнения предсказания",
+        examples=[datetime.datetime(2023, 1, 1, 12, 5).isoformat()],
+    )
+    """Время выполнения предсказания"""
+    results: list[ModelPredictions] = Field(
+        description="Предсказания каждой ML модели в порядке их перечисления в запросе"
+    )
+    """Предсказания каждой ML модели"""
+    ensemble: list[str | int | float] | None = Field(
+        default=None,
+        description="Предсказания ансамбля моделей: среднее для регрессии, голосование большинства для классификации. \
+            Передаются только при запросе ансамбля.",
+        examples=[[0.15, 26.1, 72.5], None],
+    )
+    """Предсказания ансамбля моделей"""
+
+
+RowFilterOperator = Literal["eq", "ne", "lt", "le", "gt", "ge", "in", "not_in"]
+""" Операторы сравнения фильтра строк """
+
+
+class RowFilter(BaseModel):
+    """Условие отбора строк файла набора данных"""
+
+    column: str = Field(description="Название столбца", examples=["rm"])
+    """ Название столбца """
+    op: RowFilterOperator = Field(default="eq", description="Оператор сравнения")
+    """ Оператор сравнения """
+    value: float | int | str | bool | list[float | int | str | bool] | None = Field(
+        description="Значение для сравнения. Для операторов `in` и `not_in` - список значений",
+        examples=[6.5, ["A", "B"]],
+    )
+    """ Значение для сравнения """
+
+
+class DatasetPredictInput(BaseModel):
+    """Ссылка на файлы набора данных на сервере для предсказания"""
+
+    dataset_id: int | None = Field(
+        default=None,
+        description="Идентификатор набора данных. По умолчанию - набор данных, на котором обучена модель",
+        examples=[12],
+    )
+    """ Идентификатор набора данных """
+    files: str = Field(
+        default="*.csv",
+        description="Имя файла или шаблон glob относительно каталога набора данных (.csv, .csv.gz, .csv.zst)",
+        examples=["test.csv", "parts/*.csv.gz"],
+    )
+    """ Имя файла или шаблон glob относительно каталога набора данных """
+    start: int = Field(
+        default=0, ge=0, description="Номер первой строки данных каждого файла (с 0)"
+    )
+    """ Номер первой строки данных каждого файла """
+    stop: int | None = Field(
+        default=None,
+        ge=0,
+        description="Номер строки данных каждого файла, до которой (не включая) выполняется предсказание. \
+            По умолчанию - до конца файла",
+    )
+    """ Номер строки данных, до которой выполняется предсказание """
+    filters: list[RowFilter] = Field(
+        default=[],
+        description="Условия отбора строк (объединяются через И)",
+    )
+    """ Условия отбора строк """
+    chunk_rows: int = Field(
+        default=10000,
+        ge=1,
+        le=1000000,
+        description="Количество строк, читаемых и предсказываемых за один шаг (одна строка ответа)",
+    )
+    """ Количество строк, читаемых и предсказываемых за один шаг """
@@ -4,9 +4,12 @@ import pandas as pd
 import numpy as np
 from fastapi import UploadFile
 
-from src.core.predict import predict, prepare_data_for_predict
+from src.core.decompress import get_encoding, open_decompressed
+from src.core.model_cache import CachedModel, get_model_cache
+from src.core.predict import predict, predict_proba, prepare_data_for_predict
 from src.config import config_manager
 from ...database.models import MLModel
+from ...database.snapshots import MLModelSnapshot
 
 # Создадим псевдоним типа, чтобы не тянуть зависимости из внешних файлов
 AutoMLInputData = Any
@@ -14,7 +17,7 @@ AutoMLInputData = Any
 
 class PredictService:
     @staticmethod
-    def _get_model_path(ml_model: MLModel) -> Path:
+    def _get_model_path(ml_model: MLModel | MLModelSnapshot) -> Path:
         # Получим путь до сохранённой модели
         weights_root = config_manager.storage_config.weights_root
         model_path = Path(weights_root, ml_model.name)
@@ -25,21 +28,58 @@ class PredictService:
             )
         return model_path
 
+    @classmethod
+    def get_model(cls, ml_model: MLModel | MLModelSnapshot) -> CachedModel:
+        """
+        Получение загруженной модели из кеша моделей (с загрузкой при отсутствии)
+
+        Полученная версия модели используется на всех этапах предсказания, даже если во время их выполнения
+        модель была заменена новой версией.
+
+        Args:
+            ml_model (MLModel | MLModelSnapshot): Сущность ML модели или её снимок
+
+        Returns:
+            (CachedModel): Загруженная версия модели
+        """
+        return get_model_cache().get(
+            ml_model.name,
+            task=ml_model.dataset.task.name,
+            path=cls._get_model_path(ml_model=ml_model),
+        )
+
     @staticmethod
     def load_data_from_file(data_file: UploadFile) -> pd.DataFrame:
         """
         Загрузка табличных данных из файла
 
+        Сжатый файл (gzip, zstd) определяется по заголовку `Content-Encoding`, типу содержимого
+        или расширению и распаковывается по мере разбора.
+
         Args:
-            data_file (file): Файл формата .csv
+            data_file (file): Файл формата .csv (в том числе сжатый, например `.csv.gz`)
 
         Returns:
             (pd.DataFrame) Таблица данных
 
         Raises:
+            UnsupportedEncodingError: Если способ сжатия файла не поддерживается
             ValueError: Если не удалось загрузить файл
         """
-        data = pd.read_csv(data_file.file)
+        upload_config = config_manager.upload_config
+        encoding = get_encoding(
+            content_encoding=data_file.headers.get("content-encoding"),
+            filename=data_file.filename,
+            content_type=data_file.content_type,
+        )
+        data = pd.read_csv(
+            open_decompressed(
+                data_file.file,
+                encoding,
+                max_ratio=upload_config.max_decompression_ratio,
+                max_size=int(upload_config.max_decompressed_size * 1024**2),
+            )
+        )
 
         if data.empty:
             raise ValueError(
@@ -52,14 +92,16 @@ class PredictService:
     def prepare_data_for_prediction(
         cls,
         data: pd.DataFrame,
-        ml_model: MLModel,
+        ml_model: MLModel | MLModelSnapshot,
+        cached_model: CachedModel | None = None,
     ) -> AutoMLInputData:
         """
         Предобработка `data` данных из `dataset_name` набора данных
 
         Args:
             data (pd.DataFrame): Таблица с данными для предсказания
-            ml_model (MLModel): Сущность ML модели
+            ml_model (MLModel | MLModelSnapshot): Сущность ML модели или её снимок
+            cached_model (CachedModel, optional): Загруженная версия модели. По умолчанию берётся из кеша моделей
 
         Returns:
             (AutoMLInputData): Преобразованные в нужный формат данные
@@ -67,15 +109,18 @@ class PredictService:
         Raises:
             (ValueError): Если входные данные невозможно преобразовать
         """
-        # Получим путь до сохранённой модели
-        model_path = cls._get_model_path(ml_model=ml_model)
+        # Получим загруженную модель
+        if cached_model is None:
+            cached_model = cls.get_model(ml_model=ml_model)
 
         # Подготовим входные данные
-        prepared_data = prepare_data_for_predict(
-            data,
-            task=ml_model.dataset.task.name,
-            weight_path=model_path,
-        )
+        with cached_model.lock:
+            prepared_data = prepare_data_for_predict(
+                data,
+                task=cached_model.task,
+                weight_path=cached_model.path,
+                model=cached_model.model,
+            )
 
         return prepared_data
 
@@ -83,22 +128,97 @@ class PredictService:
     def get_predict(
         cls,
         data: pd.DataFrame | AutoMLInputData,
-        ml_model: MLModel,
+        ml_model: MLModel | MLModelSnapshot,
+        cached_model: CachedModel | None = None,
     ) -> np.ndarray:
         """
         Получение предсказания на основе `data` данных с помощью `ml_model` модели
 
         Args:
             data (pd.DataFrame): Таблица с данными для предсказания
-            ml_model (MLModel): Сущность ML модели
+            ml_model (MLModel | MLModelSnapshot): Сущность ML модели или её снимок
+            cached_model (CachedModel, optional): Загруженная версия модели. По умолчанию берётся из кеша моделей
 
         Returns:
             (np.ndarray[N]): Массив предсказанных значений для каждой строки из `data`
         """
 
-        # Получим путь до сохранённой модели
-        model_path = cls._get_model_path(ml_model=ml_model)
+        # Получим загруженную модель
+        if cached_model is None:
+            cached_model = cls.get_model(ml_model=ml_model)
 
         # Сделаем предсказание
-        result = predict(data, task=ml_model.dataset.task.name, weight_path=model_path)
+        with cached_model.lock:
+            result = predict(
+                data,
+                task=cached_model.task,
+                weight_path=cached_model.path,
+                model=cached_model.model,
+            )
         return result
+
+    @classmethod
+    def get_predict_proba(
+        cls,
+        data: pd.DataFrame | AutoMLInputData,
+        ml_model: MLModel | MLModelSnapshot,
+        cached_model: CachedModel | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Получение вероятностей классов на основе `data` данных с помощью `ml_model` модели классификации
+
+        Args:
+            data (pd.DataFrame): Таблица с данными для предсказания
+            ml_model (MLModel | MLModelSnapshot): Сущность ML модели или её снимок
+            cached_model (CachedModel, optional): Загруженная версия модели. По умолчанию берётся из кеша моделей
+
+        Returns:
+            (tuple[np.ndarray[N, C], np.ndarray[C]]): Вероятности классов для каждой строки из `data` и метки классов
+        """
+        # Получим загруженную модель
+        if cached_model is None:
+            cached_model = cls.get_model(ml_model=ml_model)
+
+        # Сделаем предсказание
+        with cached_model.lock:
+            return predict_proba(
+                data,
+                task=cached_model.task,
+                weight_path=cached_model.path,
+                model=cached_model.model,
+            )
+
+    @staticmethod
+    def get_ensemble_predict(
+        predictions: list[np.ndarray],
+        task: str,
+    ) -> np.ndarray:
+        """
+        Объединение предсказаний нескольких моделей в предсказание ансамбля
+
+        Для регрессии предсказания усредняются, для классификации выбирается класс, за который проголосовало
+        большинство моделей. При равенстве голосов выбирается класс первой модели, если он среди лидеров.
+
+        Args:
+            predictions (list[np.ndarray[N]]): Предсказания моделей для одних и тех же строк данных
+            task (str): Тип задачи (`classification` или `regression`)
+
+        Returns:
+            (np.ndarray[N]): Предсказания ансамбля
+        """
+        stacked = np.stack([np.ravel(prediction) for prediction in predictions])
+        if task != "classification":
+            return stacked.mean(axis=0)
+
+        # Подсчитаем голоса моделей за каждый класс в каждой строке
+        labels, inverse = np.unique(stacked, return_inverse=True)
+        inverse = inverse.reshape(stacked.shape)
+        rows = np.arange(stacked.shape[1])
+        votes = np.zeros((len(labels), stacked.shape[1]), dtype=np.int32)
+        np.add.at(votes, (inverse, np.broadcast_to(rows, inverse.shape)), 1)
+
+        first_votes = votes[inverse[0], rows]
+        winners = np.where(
+            first_votes == votes.max(axis=0), inverse[0], votes.argmax(axis=0)
+        )
+        return labels[winners]
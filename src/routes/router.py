@@ -6,7 +6,9 @@ from .health.router import router as health_route
 from .datasets.router import router as dataset_router
 from .mlmodels.router import router as mlmodel_router
 from .predict.router import router as predict_router
+from .predict.router import models_router as predict_models_router
 from .tasks.router import router as tasks_router
+from .train_jobs.router import router as train_jobs_router
 
 router = APIRouter()
 
@@ -25,6 +27,10 @@ router.include_router(
 router.include_router(
     mlmodel_router, prefix=config_manager.api_config.mlmodels, tags=["MLModels"]
 )
+router.include_router(predict_models_router, prefix=config_manager.api_config.predict)
 router.include_router(
     tasks_router, prefix=config_manager.api_config.tasks, tags=["Tasks"]
 )
+router.include_router(
+    train_jobs_router, prefix=config_manager.api_config.train_jobs, tags=["TrainJobs"]
+)
@@ -1,12 +1,14 @@
 import asyncio
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query, Request, Response
 from fastapi import status
 from fastapi.responses import JSONResponse
 from fastapi.routing import APIRouter
 
-from .schemas import BasePredictTask
+from .schemas import BasePredictTask, PredictTaskField
+from ..conditional import apply_etag
+from ..pagination import PageParams, build_page_response, get_page_params
 from ... import dependencies
 from ...database.models import PredictTask
 from ...database.repository import DatabaseRepository, ModelRepository
@@ -17,17 +19,50 @@ router = APIRouter()
 DependDatabaseRepository = Annotated[
     DatabaseRepository, Depends(dependencies.get_database_repository)
 ]
+DependPageParams = Annotated[PageParams, Depends(get_page_params)]
 
 
 @router.get(
     "/",
     response_model=list[BasePredictTask],
 )
-async def get_all_datasets_route(db_repository: DependDatabaseRepository):
-    """Получение информации о всех типах задачи"""
-    result = await db_repository.for_model(PredictTask).get_all()
+async def get_all_datasets_route(
+    db_repository: DependDatabaseRepository,
+    page: DependPageParams,
+    request: Request,
+    response: Response,
+    name: Annotated[
+        str | None, Query(description="Системное название задачи для фильтрации")
+    ] = None,
+    fields: Annotated[
+        list[PredictTaskField] | None,
+        Query(description="Поля типов задачи, включаемые в ответ"),
+    ] = None,
+):
+    """
+    Получение информации о типах задачи.
 
-    return result
+    Записи выдаются постранично в порядке возрастания идентификатора: курсор следующей страницы
+    возвращается в заголовке `X-Next-Cursor`. Поддерживаются условные запросы с заголовком `If-None-Match`.
+    """
+    repository = db_repository.for_model(PredictTask)
+    # Проверим актуальность копии клиента по версии таблицы без выборки записей
+    not_modified = apply_etag(request, response, await repository.get_version())
+    if not_modified is not None:
+        return not_modified
+
+    filters = []
+    if name is not None:
+        filters.append(PredictTask.name == name)
+
+    rows, next_key = await repository.get_page(
+        *filters,
+        limit=page.limit,
+        after=page.after,
+        columns=fields or list(BasePredictTask.model_fields),
+    )
+
+    return build_page_response(rows, next_key, response, fields=fields)
 
 
 @router.get(
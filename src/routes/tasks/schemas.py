@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel, Field
 
 
@@ -12,3 +13,7 @@ class BasePredictTask(BaseModel):
     """ Название типа задачи """
     title: str = Field(description="Человекочитаемое название типа задачи")
     """ Человекочитаемое название типа задачи """
+
+
+PredictTaskField = Literal[tuple(BasePredictTask.model_fields)]  # type: ignore
+""" Названия полей схемы `BasePredictTask`, доступные для выборки """
@@ -0,0 +1,121 @@
+from typing import Annotated
+
+from fastapi import Depends, Path, Query, Response
+from fastapi import status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRouter
+
+from .schemas import TrainJobCreate, TrainJobInfo, TrainJobStatusName
+from ..pagination import PageParams, build_page_response, get_page_params
+from ... import dependencies
+from ...config import config_manager
+from ...database.models import Dataset, TrainJob
+from ...database.repository import DatabaseRepository
+from ...database.train_queue import TrainJobQueue
+from ...schemas import Message
+
+router = APIRouter()
+
+DependDatabaseRepository = Annotated[
+    DatabaseRepository, Depends(dependencies.get_database_repository)
+]
+DependPageParams = Annotated[PageParams, Depends(get_page_params)]
+
+
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=TrainJobInfo,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "model": Message,
+            "description": "The dataset was not found",
+        }
+    },
+)
+async def create_train_job_route(
+    train_job: TrainJobCreate,
+    db_repository: DependDatabaseRepository,
+):
+    """
+    Постановка задачи обучения модели на наборе данных в очередь.
+
+    Задачу выполняет один из обработчиков очереди (`python -m src.train_worker run`), после обучения
+    модель регистрируется в каталоге ML моделей.
+    """
+    dataset = await db_repository.for_model(Dataset).get(train_job.dataset_id)
+    if dataset is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"Dataset with id {train_job.dataset_id} not found."},
+        )
+
+    return await TrainJobQueue(db_repository.session).enqueue(
+        dataset_id=dataset.id,
+        params=train_job.params.model_dump(exclude_none=True),
+        title=train_job.title,
+        description=train_job.description,
+        max_attempts=config_manager.train_config.job_max_attempts,
+    )
+
+
+@router.get("/", response_model=list[TrainJobInfo])
+async def get_all_train_jobs_route(
+    db_repository: DependDatabaseRepository,
+    page: DependPageParams,
+    response: Response,
+    job_status: Annotated[
+        TrainJobStatusName | None,
+        Query(alias="status", description="Состояние задачи для фильтрации"),
+    ] = None,
+    dataset_id: Annotated[
+        int | None, Query(description="Идентификатор набора данных для фильтрации")
+    ] = None,
+):
+    """
+    Получение информации о задачах обучения.
+
+    Записи выдаются постранично в порядке постановки в очередь: курсор следующей страницы
+    возвращается в заголовке `X-Next-Cursor`.
+    """
+    filters = []
+    if job_status is not None:
+        filters.append(TrainJob.status == job_status)
+    if dataset_id is not None:
+        filters.append(TrainJob.dataset_id == dataset_id)
+
+    rows, next_key = await db_repository.for_model(TrainJob).get_page(
+        *filters,
+        limit=page.limit,
+        after=page.after,
+        columns=list(TrainJobInfo.model_fields),
+    )
+
+    return build_page_response(rows, next_key, response)
+
+
+@router.get(
+    "/{train_job_id}",
+    response_model=TrainJobInfo,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "model": Message,
+            "description": "The item was not found.",
+        }
+    },
+)
+async def get_train_job_route(
+    train_job_id: Annotated[
+        int, Path(description="Идентификатор задачи обучения", examples=[3])
+    ],
+    db_repository: DependDatabaseRepository,
+):
+    """Получение состояния и результата задачи обучения"""
+    result = await db_repository.for_model(TrainJob).get(train_job_id)
+    if result is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Item not found."},
+        )
+
+    return result
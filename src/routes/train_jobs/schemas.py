@@ -0,0 +1,130 @@
+import datetime
+from typing import Any, Literal
+from pydantic import BaseModel, Field
+
+TrainJobStatusName = Literal["queued", "running", "succeeded", "failed"]
+""" Состояния задачи обучения """
+
+
+class TrainJobParams(BaseModel):
+    """
+    Параметры обучения модели (см. `AutoMLTrainer.train`).
+    """
+
+    timeout: float = Field(
+        default=5,
+        gt=0,
+        description="Максимально допустимое время (в минутах) для поиска оптимального решения",
+    )
+    """ Максимально допустимое время (в минутах) для поиска оптимального решения """
+    composition_preset: str | None = Field(
+        default=None,
+        description="Параметр выбора моделей для подбора решения",
+        examples=["fast_train"],
+    )
+    """ Параметр выбора моделей для подбора решения """
+    n_jobs: int = Field(
+        default=-1,
+        description="Количество процессов для обучения. Значение -1 использует все доступные ядра",
+    )
+    """ Количество процессов для обучения """
+    composition_subsample: float | None = Field(
+        default=None,
+        gt=0,
+        description="Размер подвыборки обучающих данных для поиска решения: доля или количество записей",
+    )
+    """ Размер подвыборки обучающих данных для поиска решения """
+    early_stopping_iterations: int | None = Field(
+        default=None,
+        gt=0,
+        description="Количество поколений без значимого улучшения метрики для остановки поиска решения",
+    )
+    """ Количество поколений без значимого улучшения метрики для остановки поиска решения """
+    early_stopping_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Время (в минутах) без значимого улучшения метрики для остановки поиска решения",
+    )
+    """ Время (в минутах) без значимого улучшения метрики для остановки поиска решения """
+
+
+class TrainJobCreate(BaseModel):
+    """
+    Запрос на постановку задачи обучения в очередь.
+    """
+
+    dataset_id: int = Field(
+        description="Идентификатор набора данных для обучения", examples=[12]
+    )
+    """ Идентификатор набора данных для обучения """
+    title: str = Field(
+        default="Untitled", description="Человекочитаемое название обученной модели"
+    )
+    """ Человекочитаемое название обученной модели """
+    description: str = Field(
+        default="", description="Человекочитаемое описание обученной модели"
+    )
+    """ Человекочитаемое описание обученной модели """
+    params: TrainJobParams = Field(
+        default_factory=TrainJobParams, description="Параметры обучения"
+    )
+    """ Параметры обучения """
+
+
+class TrainJobInfo(BaseModel):
+    """
+    Информация о задаче обучения.
+    """
+
+    id: int = Field(description="Идентификатор задачи обучения", examples=[3])
+    """ Идентификатор задачи обучения """
+    dataset_id: int = Field(
+        description="Идентификатор набора данных для обучения", examples=[12]
+    )
+    """ Идентификатор набора данных для обучения """
+    status: TrainJobStatusName = Field(description="Состояние задачи обучения")
+    """ Состояние задачи обучения """
+    params: dict[str, Any] = Field(description="Параметры обучения")
+    """ Параметры обучения """
+    title: str = Field(description="Человекочитаемое название обученной модели")
+    """ Человекочитаемое название обученной модели """
+    description: str = Field(description="Человекочитаемое описание обученной модели")
+    """ Человекочитаемое описание обученной модели """
+    model_name: str | None = Field(
+        default=None, description="Системное название обученной модели"
+    )
+    """ Системное название обученной модели """
+    attempts: int = Field(description="Количество запусков задачи")
+    """ Количество запусков задачи """
+    max_attempts: int = Field(description="Максимальное количество запусков задачи")
+    """ Максимальное количество запусков задачи """
+    progress: str = Field(description="Последнее сообщение о ходе выполнения задачи")
+    """ Последнее сообщение о ходе выполнения задачи """
+    result: dict[str, Any] | None = Field(
+        default=None, description="Результат обучения: pipeline, метрики и время"
+    )
+    """ Результат обучения: pipeline, метрики и время """
+    error: str | None = Field(
+        default=None, description="Сообщение о последней ошибке выполнения"
+    )
+    """ Сообщение о последней ошибке выполнения """
+    mlmodel_id: int | None = Field(
+        default=None, description="Идентификатор зарегистрированной ML модели"
+    )
+    """ Идентификатор зарегистрированной ML модели """
+    created_at: datetime.datetime = Field(
+        description="Время постановки задачи в очередь"
+    )
+    """ Время постановки задачи в очередь """
+    started_at: datetime.datetime | None = Field(
+        default=None, description="Время последнего запуска задачи"
+    )
+    """ Время последнего запуска задачи """
+    heartbeat_at: datetime.datetime | None = Field(
+        default=None, description="Время последнего подтверждения работы обработчиком"
+    )
+    """ Время последнего подтверждения работы обработчиком """
+    finished_at: datetime.datetime | None = Field(
+        default=None, description="Время завершения задачи"
+    )
+    """ Время завершения задачи """
@@ -0,0 +1,163 @@
+"""
+Запуск API в нескольких процессах обработки запросов с общими загруженными ML моделями.
+
+При `run.workers > 1` приложение запускается под управлением gunicorn с предварительной загрузкой:
+главный процесс импортирует приложение и загружает ML модели каталога в кеш моделей, после чего
+создаёт процессы обработки запросов с помощью fork. Страницы памяти загруженных моделей разделяются
+процессами (копирование при записи), поэтому каждый дополнительный процесс почти не расходует память на модели.
+
+Перед созданием процессов объекты главного процесса переносятся в постоянное поколение сборщика мусора
+(`gc.freeze`): иначе сборка мусора в процессах изменяет заголовки всех отслеживаемых объектов
+и копирует страницы памяти моделей в каждый процесс.
+
+Если включён пул процессов выполнения предсказаний (`inference.workers > 0`), то модели загружаются
+процессами пула, а не процессами обработки запросов, поэтому предварительная загрузка не выполняется.
+Главный процесс запускает один пул до создания процессов обработки запросов, и они подключаются к нему
+через общий каталог сокетов (`inference.socket_dir`). Если пул запущен отдельной службой
+(`inference.external`), главный процесс его не запускает.
+
+Запуск:
+    python -m src.server
+"""
+
+import asyncio
+import gc
+import shutil
+import tempfile
+from typing import Any
+
+import uvicorn
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from . import dependencies
+from .config import config_manager
+from .core.logger import LoggerFactory
+from .database.models import MLModel
+from .database.repository import ModelRepository
+from .database.seeders import seed_database
+from .database.snapshots import MLModelSnapshot
+from .inference_pool import spawn_pool
+from .routes.predict.service import PredictService
+
+SERVER_LOGGER = LoggerFactory.get_logger("Server")
+
+
+class AutoMLUvicornWorker(UvicornWorker):
+    """Процесс обработки запросов gunicorn с реализацией цикла событий из настроек запуска"""
+
+    CONFIG_KWARGS = {"loop": config_manager.run_config.loop, "http": "auto"}
+
+
+async def _get_catalog_models() -> list[MLModelSnapshot]:
+    """Заполнение базы данных начальными значениями и получение ML моделей каталога"""
+    session_builder = dependencies.get_database_session_builder()
+    try:
+        async with session_builder.get_async_session() as session:
+            await seed_database(session)
+        async with session_builder.get_async_session() as session:
+            ml_models = await ModelRepository(model=MLModel, session=session).get_all(
+                with_relationships=[MLModel.dataset]
+            )
+            return [MLModelSnapshot.from_model(ml_model) for ml_model in ml_models]
+    finally:
+        # Соединения с базой данных не должны наследоваться процессами обработки запросов
+        await session_builder.dispose()
+
+
+def preload_models() -> int:
+    """
+    Загрузка ML моделей каталога в кеш моделей текущего процесса
+
+    Количество загруженных моделей ограничено настройками кеша моделей.
+
+    Returns:
+        (int): Количество загруженных моделей
+    """
+    loaded = 0
+    for ml_model in asyncio.run(_get_catalog_models()):
+        try:
+            PredictService.get_model(ml_model)
+            loaded += 1
+        except Exception as e:
+            # Модель без весов не мешает запуску - ошибка вернётся при запросе предсказания
+            SERVER_LOGGER.warning(
+                f"Couldn't preload model '{ml_model.name}': ({type(e).__name__}) {e}"
+            )
+    return loaded
+
+
+class AutoMLApplication(BaseApplication):
+    """Приложение gunicorn с загрузкой ML моделей в главном процессе"""
+
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from .api import app
+
+        if config_manager.inference_config.workers > 0:
+            # Предсказания выполняются процессами пула - модели в главном процессе не используются
+            SERVER_LOGGER.info("Skip models preloading: inference pool is enabled")
+        elif config_manager.run_config.preload_models:
+            loaded = preload_models()
+            SERVER_LOGGER.info(f"Preloaded {loaded} models before forking workers")
+        # Заморозим объекты главного процесса, чтобы сборка мусора в процессах не копировала их страницы
+        gc.collect()
+        gc.freeze()
+        return app
+
+
+def run_server() -> None:
+    """Запуск API с количеством процессов обработки запросов из настроек запуска"""
+    run_config = config_manager.run_config
+    if run_config.workers <= 1:
+        uvicorn.run(
+            "src.api:app",
+            host=run_config.host,
+            port=run_config.port,
+            loop=run_config.loop,
+            log_level="info",
+        )
+        return
+
+    inference_config = config_manager.inference_config
+    pool_process = None
+    temp_socket_dir = None
+    if inference_config.workers > 0 and not inference_config.external:
+        if inference_config.socket_dir is None:
+            temp_socket_dir = tempfile.mkdtemp(prefix="automl-inference-")
+            inference_config.socket_dir = temp_socket_dir
+        pool_process = spawn_pool(inference_config.socket_dir)
+        # Процессы обработки запросов наследуют настройки главного процесса и подключаются к его пулу
+        inference_config.external = True
+        SERVER_LOGGER.info(
+            f"Inference pool started in '{inference_config.socket_dir}' for all workers"
+        )
+    try:
+        AutoMLApplication(
+            {
+                "bind": f"{run_config.host}:{run_config.port}",
+                "workers": run_config.workers,
+                "worker_class": run_config.worker_class,
+                "preload_app": True,
+                "loglevel": "info",
+            }
+        ).run()
+    finally:
+        if pool_process is not None:
+            pool_process.terminate()
+            pool_process.join(10.0)
+            if pool_process.is_alive():
+                pool_process.kill()
+        if temp_socket_dir is not None:
+            shutil.rmtree(temp_socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run_server()
@@ -0,0 +1,151 @@
+import mmap
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core import predict
+from src.core.artifact import (
+    ARTIFACT_MIN_BUFFER_SIZE,
+    ARTIFACT_VERSION,
+    PACKED_MODEL_FILENAME,
+    describe_saved_model,
+    load_packed_artifact,
+    read_artifact_header,
+    save_packed_artifact,
+)
+
+
+class TestPackedArtifact:
+    """Тестовые случаи для упакованного формата модели"""
+
+    def test_small_object(self, tmp_path):
+        """Объект без крупных массивов сохраняется целиком в pickle"""
+        obj = {"name": "model", "weights": np.arange(10), "params": [1, 2.5, None]}
+        path = save_packed_artifact(obj, tmp_path / "model.pack", meta={"task": "test"})
+
+        loaded = load_packed_artifact(path)
+
+        assert loaded["name"] == "model" and loaded["params"] == [1, 2.5, None]
+        np.testing.assert_array_equal(loaded["weights"], np.arange(10))
+        header = read_artifact_header(path)
+        assert header["buffers"] == [] and header["meta"] == {"task": "test"}
+
+    def test_large_array_mapped(self, tmp_path):
+        """Крупные массивы загружаются отображением файла без копирования"""
+        weights = np.random.default_rng(0).random(ARTIFACT_MIN_BUFFER_SIZE // 8 + 1)
+        assert weights.nbytes >= ARTIFACT_MIN_BUFFER_SIZE
+        path = save_packed_artifact({"weights": weights}, tmp_path / "model.pack")
+
+        loaded = load_packed_artifact(path)["weights"]
+
+        np.testing.assert_array_equal(loaded, weights)
+        assert len(read_artifact_header(path)["buffers"]) == 1
+        assert not loaded.flags.owndata
+        base = loaded
+        while isinstance(base, np.ndarray):
+            base = base.base
+        # Массив создан поверх отображения файла в память
+        assert isinstance(base, memoryview) and isinstance(base.obj, mmap.mmap)
+        assert loaded.ctypes.data % 64 == 0
+
+    def test_mapped_array_changes_are_private(self, tmp_path):
+        """Изменение загруженного массива не изменяет файл"""
+        weights = np.zeros(ARTIFACT_MIN_BUFFER_SIZE)
+        path = save_packed_artifact({"weights": weights}, tmp_path / "model.pack")
+        content = path.read_bytes()
+
+        loaded = load_packed_artifact(path)["weights"]
+        loaded[:] = 1
+
+        assert path.read_bytes() == content
+        assert not load_packed_artifact(path)["weights"].any()
+
+    def test_bad_magic(self, tmp_path):
+        """Файл другого формата отклоняется"""
+        path = save_packed_artifact({"a": 1}, tmp_path / "model.pack")
+        content = bytearray(path.read_bytes())
+        content[:8] = b"NOTPACK\x00"
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError, match="not a packed artifact"):
+            load_packed_artifact(path)
+        with pytest.raises(ValueError):
+            read_artifact_header(path)
+
+    def test_unsupported_version(self, tmp_path):
+        """Файл неподдерживаемой версии формата отклоняется"""
+        path = save_packed_artifact({"a": 1}, tmp_path / "model.pack")
+        content = bytearray(path.read_bytes())
+        struct.pack_into("<I", content, 8, ARTIFACT_VERSION + 1)
+        path.write_bytes(content)
+
+        with pytest.raises(ValueError, match="version"):
+            load_packed_artifact(path)
+
+    def test_truncated_file(self, tmp_path):
+        """Слишком короткий файл отклоняется"""
+        path = tmp_path / "model.pack"
+        path.write_bytes(b"AML")
+
+        with pytest.raises(ValueError):
+            load_packed_artifact(path)
+
+
+class FakeFedot:
+    """Модель, достаточная для загрузки pipeline"""
+
+    def __init__(self, task: str) -> None:
+        self.current_pipeline = None
+        self.data_processor = SimpleNamespace(preprocessor=None)
+        self.loaded_from = None
+
+    def load(self, path) -> None:
+        self.loaded_from = path
+        self.current_pipeline = SimpleNamespace(source="fedot")
+
+
+class TestPackedModelLoading:
+    """Тестовые случаи для выбора упакованной модели при загрузке"""
+
+    @pytest.fixture
+    def weight_path(self, tmp_path, monkeypatch):
+        """Каталог весов с описанием pipeline и соответствующей ему упакованной моделью"""
+        monkeypatch.setattr(predict, "Fedot", FakeFedot)
+        weight_path = tmp_path / "model"
+        weight_path.mkdir()
+        (weight_path / "model.json").write_text('{"nodes": []}')
+        save_packed_artifact(
+            SimpleNamespace(source="pack", preprocessor="preprocessor"),
+            weight_path / PACKED_MODEL_FILENAME,
+            meta={"task": "regression", **describe_saved_model(weight_path)},
+        )
+        return weight_path
+
+    def test_packed_model_loaded(self, weight_path):
+        """Соответствующая сохранённой модели упакованная модель загружается без FEDOT"""
+        model = predict.load_model("regression", weight_path)
+
+        assert model.current_pipeline.source == "pack"
+        assert model.data_processor.preprocessor == "preprocessor"
+        assert model.loaded_from is None
+
+    def test_stale_packed_model_ignored(self, weight_path):
+        """Упакованная модель не загружается после пересохранения модели средствами FEDOT"""
+        (weight_path / "model.json").write_text('{"nodes": [{"operation_id": 0}]}')
+
+        model = predict.load_model("regression", weight_path)
+
+        assert model.current_pipeline.source == "fedot"
+        assert model.loaded_from == weight_path
+
+    def test_packed_model_without_description_ignored(self, weight_path):
+        """Упакованная модель без сведений о сохранённой модели не загружается"""
+        save_packed_artifact(
+            SimpleNamespace(source="pack", preprocessor=None),
+            weight_path / PACKED_MODEL_FILENAME,
+            meta={"task": "regression"},
+        )
+
+        assert predict.load_model("regression", weight_path).loaded_from == weight_path
@@ -0,0 +1,150 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import dataloaders
+from src.core.dataloaders import load_fedot_train_data_from_csv, subsample_train_data
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    """Файл данных регрессии"""
+    rng = np.random.default_rng(0)
+    path = tmp_path / "train.csv"
+    pd.DataFrame(
+        {
+            "id": np.arange(100, 200),
+            "x1": rng.random(100),
+            "x2": rng.random(100),
+            "target": rng.random(100),
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def load(data_path, cache_root):
+    return load_fedot_train_data_from_csv(
+        data_path,
+        task="regression",
+        target_columns="target",
+        index_col="id",
+        cache_root=cache_root,
+    )
+
+
+def list_caches(cache_root):
+    return sorted(path.name for path in cache_root.iterdir())
+
+
+class TestDatasetCache:
+    """Тестовые случаи для кеша наборов данных"""
+
+    def test_split_matches_fedot(self, data_path, tmp_path):
+        """Разбиение через кеш совпадает с разбиением FEDOT"""
+        expected = load(data_path, cache_root=None)
+        for cached in (load(data_path, tmp_path / "cache"),) * 2:
+            for expected_part, cached_part in zip(expected, cached):
+                np.testing.assert_array_equal(expected_part.idx, cached_part.idx)
+                np.testing.assert_array_equal(
+                    expected_part.features, cached_part.features
+                )
+                np.testing.assert_array_equal(expected_part.target, cached_part.target)
+
+    def test_cache_hit(self, data_path, tmp_path, monkeypatch):
+        """Повторная загрузка файла не разбирает .csv файл и отображает массивы в память"""
+        cache_root = tmp_path / "cache"
+        load(data_path, cache_root)
+        assert len(list_caches(cache_root)) == 1
+
+        def from_csv(*args, **kwargs):
+            raise AssertionError("Dataset must be loaded from cache")
+
+        monkeypatch.setattr(dataloaders.InputData, "from_csv", from_csv)
+        loaded_arrays = []
+        original_load = dataloaders.np.load
+
+        def np_load(*args, **kwargs):
+            array = original_load(*args, **kwargs)
+            loaded_arrays.append(array)
+            return array
+
+        monkeypatch.setattr(dataloaders.np, "load", np_load)
+        train_data, test_data = load(data_path, cache_root)
+
+        assert len(train_data.idx) + len(test_data.idx) == 100
+        assert loaded_arrays
+        assert all(isinstance(array, np.memmap) for array in loaded_arrays)
+        assert len(list_caches(cache_root)) == 1
+
+    def test_cache_miss_on_parameters(self, data_path, tmp_path):
+        """Загрузка с другими параметрами создаёт отдельный кеш и сохраняет прежний"""
+        cache_root = tmp_path / "cache"
+        load(data_path, cache_root)
+        load_fedot_train_data_from_csv(
+            data_path,
+            task="regression",
+            target_columns="x2",
+            index_col="id",
+            cache_root=cache_root,
+        )
+
+        assert len(list_caches(cache_root)) == 2
+
+    def test_stale_cache_removed(self, data_path, tmp_path):
+        """Изменение файла данных создаёт новый кеш и удаляет устаревший"""
+        cache_root = tmp_path / "cache"
+        load(data_path, cache_root)
+        (stale_cache,) = list_caches(cache_root)
+
+        data = pd.read_csv(data_path)
+        data.loc[0, "target"] += 1
+        data.to_csv(data_path, index=False)
+        train_data, test_data = load(data_path, cache_root)
+
+        caches = list_caches(cache_root)
+        assert len(caches) == 1 and caches != [stale_cache]
+        with open(cache_root / caches[0] / "meta.json", encoding="utf-8") as file:
+            assert json.load(file)["source"] == str(data_path.resolve())
+        target = {
+            int(index): value
+            for data_part in (train_data, test_data)
+            for index, value in zip(data_part.idx, np.ravel(data_part.target))
+        }
+        assert target[100] == pytest.approx(data.loc[0, "target"])
+
+    def test_cached_arrays_are_writable(self, data_path, tmp_path):
+        """Предобработка может изменять загруженные из кеша массивы, не затрагивая кеш"""
+        cache_root = tmp_path / "cache"
+        load(data_path, cache_root)
+        train_data, _ = load(data_path, cache_root)
+        train_data.features[:] = 0
+
+        train_data, _ = load(data_path, cache_root)
+        assert np.any(train_data.features != 0)
+
+
+class TestSubsample:
+    """Тестовые случаи для подвыборки обучающих данных"""
+
+    def test_subsample_keeps_order_and_metadata(self, data_path):
+        """Подвыборка сохраняет порядок записей и сведения о признаках"""
+        train_data, _ = load(data_path, cache_root=None)
+        subsample = subsample_train_data(train_data, 0.5, task="regression")
+
+        positions = [list(train_data.idx).index(index) for index in subsample.idx]
+        assert len(positions) == round(len(train_data.idx) * 0.5)
+        assert np.all(np.diff(positions) > 0)
+        np.testing.assert_array_equal(
+            subsample.features, train_data.features[positions]
+        )
+        np.testing.assert_array_equal(subsample.target, train_data.target[positions])
+        assert subsample.numerical_idx == train_data.numerical_idx
+        assert subsample.supplementary_data is train_data.supplementary_data
+        assert subsample.task is not train_data.task
+
+    def test_subsample_of_full_size(self, data_path):
+        """Подвыборка не меньше данных возвращает исходные данные"""
+        train_data, _ = load(data_path, cache_root=None)
+        assert subsample_train_data(train_data, 1.0, task="regression") is train_data
@@ -0,0 +1,313 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core import model_cache
+from src.core.artifact import load_packed_artifact, save_packed_artifact
+from src.core.model_cache import ModelCache, estimate_deep_size
+
+
+class FakeLoader:
+    """Подмена загрузки модели: считает загрузки и позволяет задержать их"""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, task, path) -> SimpleNamespace:
+        self.calls.append(str(path))
+        self.started.set()
+        assert self.release.wait(timeout=10)
+        return SimpleNamespace(task=task, path=path, number=len(self.calls))
+
+
+@pytest.fixture
+def loader(monkeypatch) -> FakeLoader:
+    loader = FakeLoader()
+    monkeypatch.setattr(model_cache, "load_model", loader)
+    return loader
+
+
+def write_weights(path, content: bytes) -> None:
+    """Запись весов модели: изменение размера файла изменяет версию модели"""
+    path.mkdir(exist_ok=True)
+    (path / "model.json").write_bytes(content)
+
+
+class TestModelCacheLoading:
+    """Тестовые случаи для загрузки и обновления моделей в кеше"""
+
+    def test_loaded_once(self, tmp_path, loader):
+        """Повторные запросы получают загруженную модель"""
+        write_weights(tmp_path / "m", b"v1")
+        cache = ModelCache(max_size=2)
+
+        first = cache.get("m", "regression", tmp_path / "m")
+        second = cache.get("m", "regression", tmp_path / "m")
+
+        assert first is second
+        assert len(loader.calls) == 1
+        assert second.hits == 2
+        assert cache.get_metrics().hits == 1
+
+    def test_concurrent_requests_load_once(self, tmp_path, loader):
+        """Конкурентные запросы незагруженной модели ожидают одной загрузки"""
+        write_weights(tmp_path / "m", b"v1")
+        cache = ModelCache(max_size=2)
+        loader.release.clear()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(cache.get, "m", "regression", tmp_path / "m")
+                for _ in range(8)
+            ]
+            assert loader.started.wait(timeout=10)
+            # Дадим остальным запросам дойти до ожидания загрузки
+            time.sleep(0.1)
+            loader.release.set()
+            entries = [future.result(timeout=10) for future in futures]
+
+        assert len(loader.calls) == 1
+        assert all(entry is entries[0] for entry in entries)
+        assert cache.get_metrics().loads == 1
+
+    def test_reload_unchanged_version(self, tmp_path, loader):
+        """Модель с неизменной версией весов не загружается повторно"""
+        write_weights(tmp_path / "m", b"v1")
+        cache = ModelCache(max_size=2)
+        cache.get("m", "regression", tmp_path / "m")
+
+        assert cache.reload("m") is None
+        assert cache.reload("missing") is None
+        assert len(loader.calls) == 1
+
+    def test_reload_swaps_atomically(self, tmp_path, loader):
+        """Во время загрузки новой версии запросы получают прежнюю, а после загрузки - новую"""
+        write_weights(tmp_path / "m", b"v1")
+        cache = ModelCache(max_size=2)
+        old = cache.get("m", "regression", tmp_path / "m")
+        write_weights(tmp_path / "m", b"version 2")
+
+        loader.started.clear()
+        loader.release.clear()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            reloading = executor.submit(cache.reload, "m")
+            assert loader.started.wait(timeout=10)
+            # Запрос во время загрузки не ожидает её и получает прежнюю версию
+            assert cache.get("m", "regression", tmp_path / "m") is old
+            loader.release.set()
+            new = reloading.result(timeout=10)
+
+        assert new is not None and new is not old
+        assert new.version != old.version
+        assert cache.get("m", "regression", tmp_path / "m") is new
+        # Запросы, получившие прежнюю версию, завершаются на ней
+        assert old.model.number == 1 and new.model.number == 2
+        # Новая версия наследует частоту обращений прежней
+        assert new.hits == old.hits + 1
+
+    def test_reload_of_evicted_model(self, tmp_path, loader):
+        """Новая версия не возвращается в кеш, если модель удалена во время загрузки"""
+        write_weights(tmp_path / "m", b"v1")
+        cache = ModelCache(max_size=2)
+        cache.get("m", "regression", tmp_path / "m")
+        write_weights(tmp_path / "m", b"version 2")
+
+        loader.started.clear()
+        loader.release.clear()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            reloading = executor.submit(cache.reload, "m")
+            assert loader.started.wait(timeout=10)
+            cache.evict("m")
+            loader.release.set()
+            assert reloading.result(timeout=10) is None
+
+        assert "m" not in cache
+
+
+class SizedLoader:
+    """Подмена загрузки модели: модели известного размера с известным временем загрузки"""
+
+    def __init__(self, models: dict[str, tuple[int, float]]) -> None:
+        """
+        Args:
+            models (dict[str, tuple[int, float]]): Размер (в байтах) и время загрузки (в секундах) моделей
+        """
+        self.models = models
+        self.now = 0.0
+        self.calls: list[str] = []
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def __call__(self, task, path) -> SimpleNamespace:
+        size, load_time = self.models[path.name]
+        self.calls.append(path.name)
+        self.now += load_time
+        return SimpleNamespace(name=path.name, size=size)
+
+
+@pytest.fixture
+def sized_loader(monkeypatch, tmp_path):
+    loader = SizedLoader(
+        {
+            "fast": (100, 1.0),
+            "slow": (100, 10.0),
+            "small": (10, 1.0),
+            "medium": (100, 5.0),
+            "huge": (1000, 10.0),
+        }
+    )
+    monkeypatch.setattr(model_cache, "load_model", loader)
+    monkeypatch.setattr(model_cache.time, "perf_counter", loader.perf_counter)
+    monkeypatch.setattr(model_cache, "estimate_model_size", lambda model: model.size)
+    for name in loader.models:
+        write_weights(tmp_path / name, b"v1")
+    return loader
+
+
+def resident(cache: ModelCache) -> set[str]:
+    return {model.name for model in cache.get_metrics().models}
+
+
+class TestModelCacheEviction:
+    """Тестовые случаи для вытеснения моделей из памяти (GreedyDual-Size-Frequency)"""
+
+    def test_lowest_priority_evicted(self, tmp_path, sized_loader):
+        """Из памяти удаляется модель с наименьшей стоимостью повторной загрузки на байт"""
+        cache = ModelCache(max_size=2)
+        for name in ("slow", "fast", "medium"):
+            cache.get(name, "regression", tmp_path / name)
+
+        assert resident(cache) == {"slow", "medium"}
+        metrics = cache.get_metrics()
+        assert metrics.evictions == 1 and metrics.loads == 3
+
+    def test_frequency_increases_priority(self, tmp_path, sized_loader):
+        """Часто используемая модель остаётся в памяти, несмотря на быструю загрузку"""
+        cache = ModelCache(max_size=2)
+        cache.get("slow", "regression", tmp_path / "slow")
+        for _ in range(20):
+            cache.get("fast", "regression", tmp_path / "fast")
+        cache.get("medium", "regression", tmp_path / "medium")
+
+        assert resident(cache) == {"fast", "medium"}
+
+    def test_small_model_preferred(self, tmp_path, sized_loader):
+        """При одинаковом времени загрузки в памяти остаётся модель меньшего размера"""
+        cache = ModelCache(max_size=2)
+        for name in ("small", "fast", "medium"):
+            cache.get(name, "regression", tmp_path / name)
+
+        assert resident(cache) == {"small", "medium"}
+
+    def test_memory_budget(self, tmp_path, sized_loader):
+        """Суммарный размер моделей не превышает бюджет памяти"""
+        cache = ModelCache(max_size=10, memory_budget=250)
+        for name in ("slow", "small", "medium", "fast"):
+            cache.get(name, "regression", tmp_path / name)
+
+        metrics = cache.get_metrics()
+        assert metrics.resident_size <= 250
+        assert resident(cache) == {"slow", "small", "fast"}
+        assert metrics.evictions == 1
+
+    def test_requested_model_kept(self, tmp_path, sized_loader):
+        """Запрошенная модель остаётся в памяти, даже если её размер превышает бюджет"""
+        cache = ModelCache(max_size=10, memory_budget=150)
+        slow = cache.get("slow", "regression", tmp_path / "slow")
+        huge = cache.get("huge", "regression", tmp_path / "huge")
+
+        assert resident(cache) == {"huge"}
+        assert cache.get_metrics().resident_size == 1000
+        # Запрос вытесненной модели возвращает её в память вместо превышающей бюджет
+        assert cache.get("slow", "regression", tmp_path / "slow") is not slow
+        assert resident(cache) == {"slow"}
+        assert huge.model.size == 1000
+
+    def test_reloads_counted(self, tmp_path, sized_loader):
+        """Повторная загрузка вытесненной модели учитывается отдельно"""
+        cache = ModelCache(max_size=1)
+        cache.get("fast", "regression", tmp_path / "fast")
+        cache.get("slow", "regression", tmp_path / "slow")
+        assert cache.get_metrics().reloads == 0
+
+        cache.get("fast", "regression", tmp_path / "fast")
+
+        metrics = cache.get_metrics()
+        assert metrics.reloads == 1
+        assert metrics.loads == 3 and metrics.evictions == 2
+        assert metrics.load_time_total == pytest.approx(12.0)
+        assert sized_loader.calls == ["fast", "slow", "fast"]
+
+    def test_evicted_priority_ages_cache(self, tmp_path, sized_loader):
+        """Обращения после вытеснения получают ценность не ниже ценности вытесненной модели"""
+        cache = ModelCache(max_size=1)
+        slow = cache.get("slow", "regression", tmp_path / "slow")
+        fast = cache.get("fast", "regression", tmp_path / "fast")
+        assert fast.priority < slow.priority
+
+        cache.get("fast", "regression", tmp_path / "fast")
+
+        assert fast.priority == pytest.approx(
+            slow.priority + fast.hits * fast.load_time / fast.size
+        )
+
+    def test_disabled_cache(self, tmp_path, sized_loader):
+        """При отключённом кеше модель загружается при каждом запросе"""
+        cache = ModelCache(max_size=0)
+        cache.get("fast", "regression", tmp_path / "fast")
+        cache.get("fast", "regression", tmp_path / "fast")
+
+        assert sized_loader.calls == ["fast", "fast"]
+        assert resident(cache) == set()
+
+
+class TestEstimateDeepSize:
+    """Тестовые случаи для оценки объёма памяти модели"""
+
+    def test_array_data_counted(self):
+        """Данные массивов учитываются в размере"""
+        weights = np.zeros(1 << 20, dtype=np.uint8)
+
+        size = estimate_deep_size({"weights": weights})
+
+        assert weights.nbytes <= size < weights.nbytes + 4096
+
+    def test_shared_array_counted_once(self):
+        """Массив, на который ссылаются несколько объектов, учитывается один раз"""
+        weights = np.zeros(1 << 20, dtype=np.uint8)
+
+        size = estimate_deep_size([weights, weights, weights[10:]])
+
+        assert size < 2 * weights.nbytes
+
+    def test_mapped_array_not_counted(self, tmp_path):
+        """Данные, отображённые в память из файла упакованной модели, не учитываются"""
+        path = save_packed_artifact(
+            {"weights": np.zeros(1 << 20, dtype=np.uint8)}, tmp_path / "model.pack"
+        )
+
+        size = estimate_deep_size(load_packed_artifact(path))
+
+        assert size < 1 << 16
+
+    def test_extension_state_counted(self):
+        """Данные объектов расширений учитываются через их состояние для сериализации"""
+        tree = SimpleNamespace(state=np.ones((1000, 100)))
+
+        class Extension:
+            __slots__ = ()
+
+            def __getstate__(self):
+                return tree.state
+
+        size = estimate_deep_size([Extension()])
+
+        assert size >= tree.state.nbytes
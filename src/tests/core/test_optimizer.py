@@ -0,0 +1,116 @@
+import pickle
+from types import SimpleNamespace
+
+from golem.core.optimisers.fitness import SingleObjFitness
+
+from src.core import optimizer
+from src.core.optimizer import CachedObjective, EvaluationCache
+
+
+class FakeClock:
+    """Управляемые часы для проверки порядка использования записей"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+class TestEvaluationCache:
+    """Тестовые случаи для постоянного кеша оценок pipeline"""
+
+    def test_get_set(self, tmp_path):
+        """Сохранённая оценка возвращается по ключу"""
+        cache = EvaluationCache(tmp_path / "cache.sqlite")
+        key = cache.build_key("data", "pipeline")
+
+        assert cache.get(key) is None
+        cache.set(key, SingleObjFitness(0.5))
+        assert cache.get(key) == SingleObjFitness(0.5)
+        cache.set(key, SingleObjFitness(0.7))
+        assert cache.get(key) == SingleObjFitness(0.7)
+
+    def test_shared_between_instances(self, tmp_path):
+        """Оценки доступны другим экземплярам кеша с тем же файлом"""
+        EvaluationCache(tmp_path / "cache.sqlite").set("key", SingleObjFitness(0.5))
+        assert EvaluationCache(tmp_path / "cache.sqlite").get(
+            "key"
+        ) == SingleObjFitness(0.5)
+
+    def test_build_key(self):
+        """Ключ зависит от всех частей"""
+        assert EvaluationCache.build_key("a", 1) == EvaluationCache.build_key("a", 1)
+        assert EvaluationCache.build_key("a", 1) != EvaluationCache.build_key("a", 2)
+        assert EvaluationCache.build_key("a", 1) != EvaluationCache.build_key(1, "a")
+
+    def test_eviction_by_access_time(self, tmp_path, monkeypatch):
+        """При превышении размера удаляются записи, которые дольше всего не использовались"""
+        monkeypatch.setattr(optimizer.time, "time", FakeClock())
+        cache = EvaluationCache(tmp_path / "cache.sqlite", max_entries=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, SingleObjFitness(0.5))
+        # Обращение к записи откладывает её удаление
+        assert cache.get("a") is not None
+
+        cache.set("d", SingleObjFitness(0.5))
+        assert cache.get("b") is None
+        cache.set("e", SingleObjFitness(0.5))
+        assert cache.get("c") is None
+        assert all(cache.get(key) is not None for key in ("a", "d", "e"))
+        (count,) = cache.connection.execute(
+            "SELECT COUNT(*) FROM evaluations"
+        ).fetchone()
+        assert count == 3
+
+    def test_pickle_without_connection(self, tmp_path):
+        """Соединение не передаётся при сериализации и открывается заново"""
+        cache = EvaluationCache(tmp_path / "cache.sqlite", max_entries=10)
+        cache.set("key", SingleObjFitness(0.5))
+
+        restored = pickle.loads(pickle.dumps(cache))
+
+        assert cache._connection is not None
+        assert restored._connection is None
+        assert restored.path == cache.path and restored.max_entries == 10
+        assert restored.get("key") == SingleObjFitness(0.5)
+        assert restored._connection is not cache._connection
+
+
+class TestCachedObjective:
+    """Тестовые случаи для оценки pipeline с кешем"""
+
+    def test_objective_called_once(self, tmp_path):
+        """Повторная оценка pipeline берётся из кеша"""
+        calls = []
+
+        def objective(graph):
+            calls.append(graph)
+            return SingleObjFitness(0.5)
+
+        cached_objective = CachedObjective(
+            objective, EvaluationCache(tmp_path / "cache.sqlite"), ["data"]
+        )
+        graph = SimpleNamespace(descriptive_id="(rf)")
+
+        assert cached_objective(graph) == SingleObjFitness(0.5)
+        assert cached_objective(graph) == SingleObjFitness(0.5)
+        assert len(calls) == 1
+
+    def test_invalid_fitness_not_cached(self, tmp_path):
+        """Неудачные оценки не сохраняются"""
+        calls = []
+
+        def objective(graph):
+            calls.append(graph)
+            return SingleObjFitness(None)
+
+        cached_objective = CachedObjective(
+            objective, EvaluationCache(tmp_path / "cache.sqlite"), ["data"]
+        )
+        graph = SimpleNamespace(descriptive_id="(rf)")
+
+        assert not cached_objective(graph).valid
+        assert not cached_objective(graph).valid
+        assert len(calls) == 2
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fedot.preprocessing.preprocessing import DataPreprocessor
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from src.core.predict import ModelClassesUnavailable, predict_proba
+
+
+def make_model(
+    probabilities: np.ndarray,
+    preprocessor: DataPreprocessor | None = None,
+    fitted_operation=None,
+) -> SimpleNamespace:
+    """Модель с заданными вероятностями классов и pipeline, по которому определяются метки классов"""
+    pipeline = SimpleNamespace(
+        preprocessor=preprocessor or DataPreprocessor(),
+        root_node=SimpleNamespace(fitted_operation=fitted_operation),
+    )
+
+    def predict_proba(data, probs_for_all_classes=False):
+        assert probs_for_all_classes
+        return probabilities
+
+    return SimpleNamespace(current_pipeline=pipeline, predict_proba=predict_proba)
+
+
+def fit_classifier(labels: list) -> LogisticRegression:
+    features = np.arange(len(labels), dtype=float).reshape(-1, 1)
+    return LogisticRegression().fit(features, labels)
+
+
+class TestPredictProba:
+    """Тестовые случаи для предсказания вероятностей классов"""
+
+    data = pd.DataFrame({"x": [1.0, 2.0]})
+    probabilities = np.array([[0.2, 0.5, 0.3], [0.6, 0.1, 0.3]])
+
+    def call(self, model):
+        return predict_proba(self.data, "classification", "unused", model=model)
+
+    def test_string_labels_from_target_encoder(self):
+        """Нечисловые метки восстанавливаются кодировщиком целевого атрибута FEDOT"""
+        preprocessor = DataPreprocessor()
+        preprocessor.target_encoders["default"] = LabelEncoder().fit(
+            ["virginica", "setosa", "versicolor", "setosa"]
+        )
+        # Обученная операция выходного узла видит только закодированные метки
+        model = make_model(
+            self.probabilities,
+            preprocessor=preprocessor,
+            fitted_operation=fit_classifier([0, 1, 2, 0]),
+        )
+
+        probabilities, classes = self.call(model)
+
+        np.testing.assert_array_equal(probabilities, self.probabilities)
+        assert classes.tolist() == ["setosa", "versicolor", "virginica"]
+
+    def test_numeric_labels_from_fitted_operation(self):
+        """Числовые метки берутся из обученной операции выходного узла"""
+        model = make_model(
+            self.probabilities, fitted_operation=fit_classifier([7, 3, 5, 3])
+        )
+
+        _, classes = self.call(model)
+
+        assert classes.tolist() == [3, 5, 7]
+
+    def test_numeric_labels_from_fedot_implementation(self):
+        """Метки операций, реализованных в FEDOT, берутся из обученной модели операции"""
+        implementation = SimpleNamespace(model=fit_classifier([10, 20, 30]))
+        model = make_model(self.probabilities, fitted_operation=implementation)
+
+        _, classes = self.call(model)
+
+        assert classes.tolist() == [10, 20, 30]
+
+    def test_binary_probabilities(self):
+        """Вероятность положительного класса дополняется вероятностью отрицательного"""
+        model = make_model(
+            np.array([0.8, 0.1]), fitted_operation=fit_classifier([0, 1, 1])
+        )
+
+        probabilities, classes = self.call(model)
+
+        np.testing.assert_allclose(probabilities, [[0.2, 0.8], [0.9, 0.1]])
+        assert classes.tolist() == [0, 1]
+
+    def test_unknown_labels(self):
+        """Метки классов не подменяются номерами столбцов, если их не удалось определить"""
+        model = make_model(self.probabilities, fitted_operation=object())
+
+        with pytest.raises(ModelClassesUnavailable):
+            self.call(model)
+
+    def test_labels_count_mismatch(self):
+        """Количество меток должно совпадать с количеством столбцов вероятностей"""
+        model = make_model(self.probabilities, fitted_operation=fit_classifier([0, 1]))
+
+        with pytest.raises(ModelClassesUnavailable, match="2 class labels"):
+            self.call(model)
+
+    def test_regression_model(self):
+        """Вероятности классов недоступны для регрессии"""
+        with pytest.raises(ValueError):
+            predict_proba(self.data, "regression", "unused", model=object())
@@ -0,0 +1,80 @@
+import pytest
+
+from src.core import train_orchestrator
+from src.core.train_orchestrator import build_jobs, get_job_timeout
+from src.utils import write_yaml
+
+
+def make_data_root(path, size: int):
+    """Создание каталога набора данных с обучающими данными заданного размера"""
+    path.mkdir(parents=True)
+    write_yaml({"train_dataset": "train.csv"}, path / "config.yaml")
+    (path / "train.csv").write_bytes(b"0" * size)
+    return path
+
+
+class TestBuildJobs:
+    """Тестовые случаи для формирования задач обучения"""
+
+    def test_jobs_sorted_by_size(self, tmp_path):
+        """Задачи упорядочиваются по убыванию размера обучающих данных"""
+        small = make_data_root(tmp_path / "small", 10)
+        large = make_data_root(tmp_path / "large", 1000)
+        medium = make_data_root(tmp_path / "medium", 100)
+
+        jobs = build_jobs([small, large, medium])
+
+        assert [job.save_name for job in jobs] == ["large", "medium", "small"]
+        assert [job.size for job in jobs] == [1000, 100, 10]
+        assert jobs[0].data_root == large
+
+    def test_missing_train_dataset(self, tmp_path):
+        """Задача без файла обучающих данных имеет нулевой размер и запускается последней"""
+        data_root = make_data_root(tmp_path / "present", 10)
+        missing = tmp_path / "missing"
+        missing.mkdir()
+        write_yaml({"train_dataset": "train.csv"}, missing / "config.yaml")
+
+        jobs = build_jobs([missing, data_root])
+
+        assert [(job.save_name, job.size) for job in jobs] == [
+            ("present", 10),
+            ("missing", 0),
+        ]
+
+    def test_missing_config(self, tmp_path):
+        """Каталог без 'config.yaml' отклоняется"""
+        with pytest.raises(FileNotFoundError):
+            build_jobs([tmp_path])
+
+    def test_duplicate_names(self, tmp_path):
+        """Каталоги с одинаковыми именами отклоняются до запуска обучения"""
+        first = make_data_root(tmp_path / "a" / "iris", 10)
+        second = make_data_root(tmp_path / "b" / "iris", 10)
+
+        with pytest.raises(ValueError, match="'iris'"):
+            build_jobs([first, second])
+
+
+class TestJobTimeout:
+    """Тестовые случаи для распределения бюджета времени между задачами"""
+
+    @pytest.fixture
+    def now(self, monkeypatch):
+        monkeypatch.setattr(train_orchestrator.time, "monotonic", lambda: 1000.0)
+        return 1000.0
+
+    def test_without_budget(self, now):
+        """Без общего бюджета задача получает полное время"""
+        assert get_job_timeout(5, None, 1) == 5
+
+    def test_limited_by_budget(self, now):
+        """Время задачи ограничивается остатком бюджета"""
+        assert get_job_timeout(5, now + 3 * 60, 1) == pytest.approx(3)
+        assert get_job_timeout(5, now + 10 * 60, 1) == 5
+
+    def test_skipped_when_budget_exhausted(self, now):
+        """Задача пропускается, если остаток бюджета меньше минимального времени"""
+        assert get_job_timeout(5, now + 30, 1) is None
+        assert get_job_timeout(5, now - 60, 1) is None
+        assert get_job_timeout(5, now + 60, 1) == pytest.approx(1)
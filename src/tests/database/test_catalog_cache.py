@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.orm import Session
+
+from src.database import cache as catalog_cache
+from src.database.cache import CatalogCache, get_catalog_cache
+from src.database.models import MLModel
+from src.database.repository import CATALOG_CHANGED_KEY, ModelRepository
+
+
+class FakeClock:
+    """Управляемые часы для проверки времени жизни записей"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_ml_model(title: str) -> SimpleNamespace:
+    """Объект, достаточный для построения снимка ML модели"""
+    task = SimpleNamespace(id=1, name="regression", title="Регрессия")
+    dataset = SimpleNamespace(
+        id=1,
+        name="test",
+        title="Test",
+        description="",
+        task_id=1,
+        target_column="target",
+        index_column=None,
+        task=task,
+    )
+    return SimpleNamespace(
+        id=1,
+        name="test_model",
+        title=title,
+        description="",
+        dataset_id=1,
+        trained_at=None,
+        dataset=dataset,
+    )
+
+
+class TestCatalogCache:
+    """Тестовые случаи для кеша метаданных каталога"""
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        """Запись недоступна после истечения времени жизни"""
+        clock = FakeClock()
+        monkeypatch.setattr(catalog_cache.time, "monotonic", clock)
+        cache = CatalogCache(ttl=10)
+
+        cache.set("key", "value")
+        clock.now += 9.9
+        assert cache.get("key") == "value"
+        clock.now += 0.1
+        assert cache.get("key") is None
+
+    def test_disabled_cache_stores_nothing(self):
+        """Кеш с нулевым временем жизни не сохраняет записи"""
+        cache = CatalogCache(ttl=0)
+
+        cache.set("key", "value")
+
+        assert cache.get("key") is None
+
+    def test_max_size_evicts_oldest_entry(self):
+        """При превышении размера удаляется самая старая запись"""
+        cache = CatalogCache(ttl=60, max_size=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_stale_generation_is_not_stored(self):
+        """Значение, прочитанное до инвалидации, не попадает в кеш"""
+        cache = CatalogCache(ttl=60)
+        generation = cache.generation
+
+        cache.invalidate()
+        cache.set("key", "stale", generation=generation)
+
+        assert cache.generation == generation + 1
+        assert cache.get("key") is None
+
+    def test_commit_invalidates_cache(self):
+        """Фиксация транзакции, изменившей каталог, сбрасывает кеш и увеличивает поколение"""
+        cache = get_catalog_cache()
+        cache.set("key", "value")
+        generation = cache.generation
+
+        session = Session()
+        session.begin()
+        session.info[CATALOG_CHANGED_KEY] = True
+        session.commit()
+
+        assert cache.generation == generation + 1
+        assert cache.get("key") is None
+        assert CATALOG_CHANGED_KEY not in session.info
+
+    def test_commit_without_catalog_changes_keeps_cache(self):
+        """Фиксация транзакции без изменений каталога не сбрасывает кеш"""
+        cache = get_catalog_cache()
+        generation = cache.generation
+
+        session = Session()
+        session.begin()
+        session.commit()
+
+        assert cache.generation == generation
+
+    def test_rollback_discards_catalog_changes(self):
+        """Откат транзакции отбрасывает отметку изменения каталога без сброса кеша"""
+        cache = get_catalog_cache()
+        generation = cache.generation
+
+        session = Session()
+        session.begin()
+        session.info[CATALOG_CHANGED_KEY] = True
+        session.rollback()
+        session.begin()
+        session.commit()
+
+        assert CATALOG_CHANGED_KEY not in session.info
+        assert cache.generation == generation
+
+    def test_get_snapshot_returns_fresh_data_after_update(self, monkeypatch):
+        """Снимок читается из кеша до изменения каталога и из базы данных после него"""
+        cache = CatalogCache(ttl=60)
+        repository = ModelRepository(MLModel, session=None, cache=cache)  # type: ignore
+        stored = {"title": "Old"}
+        reads = []
+
+        async def get(pk, with_relationships=None):
+            reads.append(pk)
+            return make_ml_model(stored["title"])
+
+        monkeypatch.setattr(repository, "get", get)
+
+        first = asyncio.run(repository.get_snapshot(1))
+        cached = asyncio.run(repository.get_snapshot(1))
+        assert first.title == cached.title == "Old"
+        assert len(reads) == 1
+
+        # Изменение каталога сбрасывает кеш (см. `ModelRepository._mark_catalog_changed`)
+        stored["title"] = "New"
+        cache.invalidate()
+        fresh = asyncio.run(repository.get_snapshot(1))
+
+        assert fresh.title == "New"
+        assert len(reads) == 2
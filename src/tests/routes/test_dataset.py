@@ -25,6 +25,21 @@ class TestDatasetEndpoints:
                 "task_id",
             }
 
+    def test_get_all_datasets_not_modified(self, test_client):
+        """Тестирование условного запроса GET /api/datasets/ с заголовком If-None-Match"""
+        response = test_client.get("/api/datasets/")
+
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers.get("ETag")
+        assert etag is not None
+        assert "Cache-Control" in response.headers
+
+        response = test_client.get("/api/datasets/", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers.get("ETag") == etag
+        assert response.content == b""
+
     def test_get_dataset_by_id_success(self, test_client):
         """Тестирование GET /api/datasets/{dataset_id} с корректным ID"""
         dataset_id = 1
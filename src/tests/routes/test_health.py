@@ -0,0 +1,39 @@
+from fastapi import status
+
+
+class TestHealthEndpoints:
+    """Тестовые случаи для ручки /health"""
+
+    def test_health(self, test_client):
+        """Тестирование GET /api/health/"""
+        response = test_client.get("/api/health/")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["status"] == "OK"
+        assert set(data["info"].keys()) == {"mem", "cpu_usage", "threads"}
+
+    def test_pool_metrics(self, test_client):
+        """Тестирование GET /api/health/pool"""
+        response = test_client.get("/api/health/pool")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["size"] >= 0
+        assert data["checked_out"] >= 0
+        # При запуске приложения уже происходили обращения к базе данных
+        assert data["checkouts"] > 0
+        assert data["wait_max"] <= data["wait_total"]
+
+    def test_model_cache_metrics(self, test_client):
+        """Тестирование GET /api/health/models"""
+        response = test_client.get("/api/health/models")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["resident_size"] == sum(model["size"] for model in data["models"])
+        assert data["reloads"] <= data["loads"]
+        assert len(data["models"]) <= data["max_size"]
@@ -25,6 +25,47 @@ class TestMLModelEndpoints:
                 "trained_at",
             }
 
+    def test_get_all_mlmodels_filter_and_fields(self, test_client):
+        """Тестирование GET /api/mlmodels/ с фильтрацией и выборкой полей"""
+        dataset_id = 1
+        response = test_client.get(
+            "/api/mlmodels/",
+            params={"dataset_id": dataset_id, "fields": ["id", "dataset_id"]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert isinstance(data, list)
+        for model in data:
+            assert set(model.keys()) == {"id", "dataset_id"}
+            assert model["dataset_id"] == dataset_id
+
+    def test_get_all_mlmodels_compressed(self, test_client):
+        """Тестирование GET /api/mlmodels/ со сжатием ответа"""
+        plain = test_client.get(
+            "/api/mlmodels/", headers={"Accept-Encoding": "identity"}
+        )
+        response = test_client.get(
+            "/api/mlmodels/", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in plain.headers
+        # Небольшие ответы передаются без сжатия
+        if len(plain.content) >= 1024:
+            assert response.headers["content-encoding"] == "gzip"
+            assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == plain.json()
+
+    def test_get_all_mlmodels_invalid_fields(self, test_client):
+        """Тестирование GET /api/mlmodels/ с несуществующим полем"""
+        response = test_client.get("/api/mlmodels/", params={"fields": ["invalid"]})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        data = response.json()
+        assert "detail" in data
+
     def test_get_mlmodel_by_id_success(self, test_client):
         """Тестирование GET /api/mlmodels/{mlmodel_id}"""
         mlmodel_id = 1
@@ -1,7 +1,14 @@
+import gzip
+import json
+
 import numpy as np
 import pytest
 from fastapi import status
 
+from src.core.predict import ModelClassesUnavailable
+from src.routes.predict import ingest
+from src.routes.predict import router as predict_router
+
 
 class TestPredictionEndpoints:
     """Тестовые случаи для ручек предсказания."""
@@ -79,3 +86,270 @@ class TestPredictionEndpoints:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         data = response.json()
         assert "message" in data
+
+    def test_stream_predict_with_valid_body(
+        self,
+        test_client,
+        correct_predict_input_data,
+        correct_predict_output_predictions,
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/stream"""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/stream",
+            content=correct_predict_input_data.read(),
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        # Потоковое чтение должно давать те же предсказания, что и загрузка файла
+        responce_prediction = np.array(data["predictions"])
+        true_prediction = np.array(correct_predict_output_predictions)
+        assert np.allclose(responce_prediction, true_prediction, rtol=0.05)
+
+    def test_stream_predict_with_empty_body(self, test_client):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/stream с пустым телом запроса."""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/stream",
+            content=b"",
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        data = response.json()
+        assert "message" in data
+
+    def test_stream_predict_with_gzip_body(
+        self,
+        test_client,
+        correct_predict_input_data,
+        correct_predict_output_predictions,
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/stream со сжатым телом запроса."""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/stream",
+            content=gzip.compress(correct_predict_input_data.read()),
+            headers={"Content-Type": "text/csv", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        responce_prediction = np.array(data["predictions"])
+        true_prediction = np.array(correct_predict_output_predictions)
+        assert np.allclose(responce_prediction, true_prediction, rtol=0.05)
+
+    def test_stream_predict_with_unsupported_encoding(self, test_client):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/stream с неподдерживаемым сжатием."""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/stream",
+            content=b"a,b\n1,2\n",
+            headers={"Content-Type": "text/csv", "Content-Encoding": "compress"},
+        )
+
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        data = response.json()
+        assert "message" in data
+
+    def test_stream_predict_when_parsers_busy(self, test_client, monkeypatch):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/stream при занятых потоках разбора."""
+        mlmodel_id = 1
+        # Все потоки разбора заняты другими загрузками
+        busy_pool = ingest.StreamParserPool(workers=1)
+        busy_pool._active = busy_pool.workers
+        monkeypatch.setattr(ingest, "get_stream_parser_pool", lambda: busy_pool)
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/stream",
+            content=b"a,b\n1,2\n",
+            headers={"Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "Retry-After" in response.headers
+        data = response.json()
+        assert "message" in data
+
+    def test_models_predict_with_ensemble(
+        self,
+        test_client,
+        correct_predict_input_data,
+        correct_predict_output_predictions,
+    ):
+        """Тестирование POST /api/predict/ несколькими моделями с ансамблем."""
+        mlmodel_id = 1
+
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            "/api/predict/",
+            params={"mlmodel_ids": [mlmodel_id, mlmodel_id], "ensemble": True},
+            files=files,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        # Повторяющиеся модели предсказывают один раз
+        assert [result["mlmodel"]["id"] for result in data["results"]] == [mlmodel_id]
+        true_prediction = np.array(correct_predict_output_predictions)
+        assert np.allclose(
+            np.array(data["results"][0]["predictions"]), true_prediction, rtol=0.05
+        )
+        # Ансамбль из одной модели совпадает с её предсказаниями
+        assert np.allclose(np.array(data["ensemble"]), true_prediction, rtol=0.05)
+
+    def test_models_predict_with_invalid_model_id(
+        self, test_client, correct_predict_input_data
+    ):
+        """Тестирование POST /api/predict/ с несуществующим ID одной из моделей."""
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            "/api/predict/", params={"mlmodel_ids": [1, 999]}, files=files
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        data = response.json()
+        assert "message" in data
+
+    def test_predict_proba_for_regression_model(
+        self, test_client, correct_predict_input_data
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/?output=proba для модели регрессии."""
+        mlmodel_id = 1
+
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/",
+            params={"output": "proba"},
+            files=files,
+        )
+
+        # Вероятности классов доступны только для моделей классификации
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        data = response.json()
+        assert "message" in data
+
+    @staticmethod
+    def mock_classification_model(monkeypatch) -> np.ndarray:
+        """Подмена предсказания моделью классификации с метками классов-строками"""
+        classes = np.array(["setosa", "versicolor", "virginica"])
+
+        async def predict_array(ml_model, data, proba=False):
+            probabilities = np.tile([0.2, 0.5, 0.3], (len(data), 1))
+            return probabilities, classes
+
+        monkeypatch.setattr(
+            predict_router, "_check_output_mode", lambda ml_model, output: None
+        )
+        monkeypatch.setattr(predict_router, "_predict_array", predict_array)
+        return classes
+
+    def test_predict_proba_for_classification_model(
+        self, test_client, correct_predict_input_data, monkeypatch
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/?output=proba для модели классификации."""
+        mlmodel_id = 1
+        classes = self.mock_classification_model(monkeypatch)
+
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/",
+            params={"output": "proba"},
+            files=files,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["classes"] == classes.tolist()
+        assert len(data["probabilities"]) == len(data["predictions"])
+        assert all(row == [0.2, 0.5, 0.3] for row in data["probabilities"])
+        assert set(data["predictions"]) == {"versicolor"}
+        assert "top_classes" not in data
+
+    def test_predict_top_k_for_classification_model(
+        self, test_client, correct_predict_input_data, monkeypatch
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/?output=top_k для модели классификации."""
+        mlmodel_id = 1
+        self.mock_classification_model(monkeypatch)
+
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/",
+            params={"output": "top_k", "top_k": 2},
+            files=files,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert all(row == ["versicolor", "virginica"] for row in data["top_classes"])
+        assert all(row == [0.5, 0.3] for row in data["top_scores"])
+        assert set(data["predictions"]) == {"versicolor"}
+        assert "probabilities" not in data
+
+    def test_predict_proba_without_model_classes(
+        self, test_client, correct_predict_input_data, monkeypatch
+    ):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/?output=proba для модели без меток классов."""
+        mlmodel_id = 1
+
+        async def predict_array(ml_model, data, proba=False):
+            raise ModelClassesUnavailable(
+                "Couldn't determine class labels of the model"
+            )
+
+        monkeypatch.setattr(
+            predict_router, "_check_output_mode", lambda ml_model, output: None
+        )
+        monkeypatch.setattr(predict_router, "_predict_array", predict_array)
+
+        files = {"data_file": ("test.csv", correct_predict_input_data, "text/csv")}
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/",
+            params={"output": "proba"},
+            files=files,
+        )
+
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert "labels" in response.json()["message"]
+
+    def test_dataset_predict_with_row_range(self, test_client):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/dataset"""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/dataset",
+            json={"files": "*.csv", "start": 1, "stop": 4},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines
+        for line in lines:
+            assert "error" not in line
+            assert line["rows"] == [1, 2, 3]
+            assert len(line["predictions"]) == len(line["rows"])
+
+    def test_dataset_predict_with_unsafe_pattern(self, test_client):
+        """Тестирование POST /api/mlmodels/{mlmodel_id}/predict/dataset с шаблоном вне каталога набора данных."""
+        mlmodel_id = 1
+
+        response = test_client.post(
+            f"/api/mlmodels/{mlmodel_id}/predict/dataset",
+            json={"files": "../*/*.csv"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        data = response.json()
+        assert "message" in data
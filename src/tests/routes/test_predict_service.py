@@ -0,0 +1,62 @@
+import numpy as np
+
+from src.routes.predict.service import PredictService
+
+
+class TestEnsemblePredict:
+    """Тестовые случаи для объединения предсказаний моделей ансамбля"""
+
+    def test_regression_mean(self):
+        """Предсказания регрессии усредняются"""
+        predictions = [
+            np.array([1.0, 2.0, 3.0]),
+            np.array([[3.0], [2.0], [0.0]]),
+            np.array([2.0, 5.0, 3.0]),
+        ]
+
+        result = PredictService.get_ensemble_predict(predictions, "regression")
+
+        np.testing.assert_allclose(result, [2.0, 3.0, 2.0])
+
+    def test_classification_majority(self):
+        """Для классификации выбирается класс большинства моделей"""
+        predictions = [
+            np.array(["a", "b", "c"]),
+            np.array(["b", "b", "a"]),
+            np.array(["b", "c", "a"]),
+        ]
+
+        result = PredictService.get_ensemble_predict(predictions, "classification")
+
+        assert result.tolist() == ["b", "b", "a"]
+
+    def test_classification_tie_prefers_first_model(self):
+        """При равенстве голосов выбирается класс первой модели"""
+        predictions = [np.array([2, 1, 0]), np.array([1, 2, 1])]
+
+        result = PredictService.get_ensemble_predict(predictions, "classification")
+
+        assert result.tolist() == [2, 1, 0]
+
+    def test_classification_first_model_outvoted(self):
+        """Класс первой модели не выбирается, если он не среди лидеров"""
+        predictions = [
+            np.array(["a", "a"]),
+            np.array(["b", "c"]),
+            np.array(["b", "c"]),
+            np.array(["c", "b"]),
+            np.array(["c", "c"]),
+        ]
+
+        result = PredictService.get_ensemble_predict(predictions, "classification")
+
+        # В первой строке ничья между лидерами 'b' и 'c' без голоса первой модели
+        assert result.tolist() == ["b", "c"]
+
+    def test_classification_three_way_tie(self):
+        """При голосах за разные классы выбирается класс первой модели"""
+        predictions = [np.array([3]), np.array([1]), np.array([2])]
+
+        result = PredictService.get_ensemble_predict(predictions, "classification")
+
+        assert result.tolist() == [3]
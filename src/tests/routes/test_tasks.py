@@ -1,6 +1,8 @@
 import pytest
 from fastapi import status
 
+from src.routes.pagination import encode_cursor
+
 
 class TestTaskEndpoints:
     """Тестовые случаи для ручки /tasks"""
@@ -47,3 +49,36 @@ class TestTaskEndpoints:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
         data = response.json()
         assert "detail" in data
+
+    def test_get_all_tasks_pagination(self, test_client):
+        """Тестирование постраничной выдачи GET /api/tasks/"""
+        response = test_client.get("/api/tasks/", params={"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert len(first_page) == 1
+        cursor = response.headers.get("X-Next-Cursor")
+        assert cursor is not None
+
+        response = test_client.get("/api/tasks/", params={"limit": 1, "cursor": cursor})
+
+        assert response.status_code == status.HTTP_200_OK
+        second_page = response.json()
+        assert len(second_page) == 1
+        assert second_page[0]["id"] > first_page[0]["id"]
+
+    def test_get_all_tasks_invalid_cursor(self, test_client):
+        """Тестирование GET /api/tasks/ с некорректным курсором"""
+        response = test_client.get("/api/tasks/", params={"cursor": "invalid"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        data = response.json()
+        assert "detail" in data
+
+    def test_get_all_tasks_non_integer_cursor(self, test_client):
+        """Тестирование GET /api/tasks/ с курсором, ключ которого не является целым числом"""
+        response = test_client.get(
+            "/api/tasks/", params={"cursor": encode_cursor("1; DROP TABLE")}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,69 @@
+from fastapi import status
+
+
+class TestTrainJobEndpoints:
+    """Тестовые случаи для /train-jobs"""
+
+    def test_create_train_job(self, test_client):
+        """Тестирование POST /api/train-jobs/"""
+        response = test_client.post(
+            "/api/train-jobs/",
+            json={"dataset_id": 1, "title": "Test model", "params": {"timeout": 1}},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+
+        assert data["dataset_id"] == 1
+        assert data["status"] == "queued"
+        assert data["attempts"] == 0
+        assert data["params"]["timeout"] == 1
+        assert data["mlmodel_id"] is None
+
+    def test_create_train_job_dataset_not_found(self, test_client):
+        """Тестирование POST /api/train-jobs/ с несуществующим набором данных"""
+        response = test_client.post("/api/train-jobs/", json={"dataset_id": 999})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        data = response.json()
+        assert "message" in data
+
+    def test_create_train_job_invalid_params(self, test_client):
+        """Тестирование POST /api/train-jobs/ с некорректными параметрами обучения"""
+        response = test_client.post(
+            "/api/train-jobs/", json={"dataset_id": 1, "params": {"timeout": -1}}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_get_train_job(self, test_client):
+        """Тестирование GET /api/train-jobs/{train_job_id}"""
+        created = test_client.post("/api/train-jobs/", json={"dataset_id": 1}).json()
+
+        response = test_client.get(f"/api/train-jobs/{created['id']}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["id"] == created["id"]
+        assert data["status"] in {"queued", "running", "succeeded", "failed"}
+
+    def test_get_train_job_not_found(self, test_client):
+        """Тестирование GET /api/train-jobs/{train_job_id} с несуществующим ID"""
+        response = test_client.get("/api/train-jobs/999999")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        data = response.json()
+        assert "message" in data
+
+    def test_get_all_train_jobs_filter(self, test_client):
+        """Тестирование GET /api/train-jobs/ с фильтрацией по состоянию"""
+        test_client.post("/api/train-jobs/", json={"dataset_id": 1})
+
+        response = test_client.get("/api/train-jobs/", params={"status": "queued"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert isinstance(data, list)
+        assert data
+        for job in data:
+            assert job["status"] == "queued"
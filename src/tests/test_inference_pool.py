@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.inference_pool import HashRing, InferencePool
+
+KEYS = [str(i) for i in range(1000)]
+
+
+def make_ring(nodes: list[int], virtual_nodes: int = 64) -> HashRing:
+    ring = HashRing(virtual_nodes=virtual_nodes)
+    for node in nodes:
+        ring.add(node)
+    return ring
+
+
+class TestHashRing:
+    """Тестовые случаи для кольца согласованного хеширования"""
+
+    def test_placement_is_stable(self):
+        """Закрепление ключей не зависит от экземпляра кольца и порядка добавления узлов"""
+        first = make_ring([0, 1, 2, 3])
+        second = make_ring([3, 1, 0, 2])
+
+        assert [first.get_nodes(key, 2) for key in KEYS] == [
+            second.get_nodes(key, 2) for key in KEYS
+        ]
+
+    def test_keys_are_spread_over_nodes(self):
+        """Ключи закрепляются за всеми узлами кольца"""
+        ring = make_ring([0, 1, 2, 3])
+
+        owners = [ring.get_nodes(key, 1)[0] for key in KEYS]
+
+        assert set(owners) == {0, 1, 2, 3}
+        assert min(owners.count(node) for node in range(4)) > len(KEYS) / 4 / 2
+
+    def test_only_removed_node_keys_move(self):
+        """При удалении узла меняется закрепление только его ключей"""
+        ring = make_ring([0, 1, 2, 3])
+        before = {key: ring.get_nodes(key, 1)[0] for key in KEYS}
+
+        ring.remove(2)
+        after = {key: ring.get_nodes(key, 1)[0] for key in KEYS}
+
+        for key in KEYS:
+            if before[key] == 2:
+                assert after[key] != 2
+            else:
+                assert after[key] == before[key]
+
+    def test_only_added_node_takes_keys(self):
+        """При добавлении узла ключи переходят только к нему"""
+        ring = make_ring([0, 1, 2])
+        before = {key: ring.get_nodes(key, 1)[0] for key in KEYS}
+
+        ring.add(3)
+        after = {key: ring.get_nodes(key, 1)[0] for key in KEYS}
+
+        assert any(after[key] == 3 for key in KEYS)
+        for key in KEYS:
+            assert after[key] in (before[key], 3)
+
+    def test_get_nodes_returns_distinct_nodes(self):
+        """Реплики ключа закреплены за различными узлами, первый из которых - основной узел"""
+        ring = make_ring([0, 1, 2, 3])
+
+        for key in KEYS:
+            nodes = ring.get_nodes(key, 3)
+            assert len(nodes) == len(set(nodes)) == 3
+            assert nodes[0] == ring.get_nodes(key, 1)[0]
+
+    def test_get_nodes_limited_by_ring_size(self):
+        """Количество реплик не превышает количество узлов кольца"""
+        ring = make_ring([0, 1])
+
+        assert sorted(ring.get_nodes("model", 5)) == [0, 1]
+
+    def test_empty_ring(self):
+        """Пустое кольцо не закрепляет ключи"""
+        ring = make_ring([0])
+        ring.remove(0)
+
+        assert len(ring) == 0
+        assert ring.get_nodes("model", 2) == []
+
+    def test_add_is_idempotent(self):
+        """Повторное добавление узла не меняет кольцо"""
+        ring = make_ring([0, 1])
+        before = [ring.get_nodes(key, 2) for key in KEYS]
+
+        ring.add(1)
+
+        assert [ring.get_nodes(key, 2) for key in KEYS] == before
+
+
+class TestConnectedPool:
+    """Тестовые случаи для подключения к пулу, запущенному другим процессом"""
+
+    @staticmethod
+    def write_manifest(socket_dir, workers: list[int], version: int) -> None:
+        manifest_path = socket_dir / "pool.json"
+        manifest_path.write_text(json.dumps({"pid": 1, "workers": workers}))
+        # Время изменения задаётся явно, чтобы не зависеть от точности часов файловой системы
+        os.utime(manifest_path, ns=(version, version))
+
+    def test_connect_builds_ring_from_manifest(self, tmp_path):
+        """Подключённый процесс строит то же кольцо, что и запустивший пул процесс"""
+        self.write_manifest(tmp_path, [0, 1, 2], version=1)
+        pool = InferencePool(workers=0, replicas=2, socket_dir=str(tmp_path))
+
+        asyncio.run(pool.connect())
+
+        assert pool.running
+        assert pool.workers == 3
+        reference = make_ring([0, 1, 2])
+        assert [pool.get_workers(i) for i in range(100)] == [
+            reference.get_nodes(str(i), 2) for i in range(100)
+        ]
+
+    def test_ring_follows_resize(self, tmp_path):
+        """Изменение количества процессов пула применяется без переподключения"""
+        self.write_manifest(tmp_path, [0, 1, 2], version=1)
+        pool = InferencePool(workers=0, socket_dir=str(tmp_path))
+        asyncio.run(pool.connect())
+
+        self.write_manifest(tmp_path, [0, 1], version=2)
+
+        assert {pool.get_workers(i)[0] for i in range(100)} == {0, 1}
+        assert pool.workers == 2
+
+    def test_ring_kept_while_pool_restarts(self, tmp_path):
+        """Пока пул перезапускается, кольцо не меняется"""
+        self.write_manifest(tmp_path, [0, 1], version=1)
+        pool = InferencePool(workers=0, socket_dir=str(tmp_path))
+        asyncio.run(pool.connect())
+
+        (tmp_path / "pool.json").unlink()
+
+        assert {pool.get_workers(i)[0] for i in range(100)} == {0, 1}
+
+    def test_connect_waits_for_pool(self, tmp_path):
+        """Подключение к незапущенному пулу завершается ошибкой после `start_timeout`"""
+        pool = InferencePool(workers=0, socket_dir=str(tmp_path), start_timeout=0.2)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.connect())
+        assert not pool.running
+
+    def test_stop_disconnects(self, tmp_path):
+        """Отключение от пула не удаляет список процессов запустившего пул процесса"""
+        self.write_manifest(tmp_path, [0], version=1)
+        pool = InferencePool(workers=0, socket_dir=str(tmp_path))
+        asyncio.run(pool.connect())
+
+        asyncio.run(pool.stop())
+
+        assert not pool.running
+        assert (tmp_path / "pool.json").exists()
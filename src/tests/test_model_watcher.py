@@ -0,0 +1,95 @@
+from src.model_watcher import ModelWatcher
+
+
+class FakeModelCache:
+    """Кеш моделей, запоминающий удалённые модели"""
+
+    def __init__(self) -> None:
+        self.evicted: list[str] = []
+
+    def evict(self, name: str) -> None:
+        self.evicted.append(name)
+
+
+def make_watcher(tmp_path) -> ModelWatcher:
+    return ModelWatcher(
+        weights_root=tmp_path, interval=1, model_cache=FakeModelCache()  # type: ignore
+    )
+
+
+class TestModelWatcher:
+    """Тестовые случаи для определения завершённых изменений весов моделей"""
+
+    def test_first_scan_remembers_versions(self, tmp_path):
+        """Первая проверка только запоминает версии"""
+        watcher = make_watcher(tmp_path)
+
+        assert watcher._get_stable_changes({"a": "v1", "b": "v1"}) == []
+        assert watcher._get_stable_changes({"a": "v1", "b": "v1"}) == []
+
+    def test_change_applied_after_two_equal_scans(self, tmp_path):
+        """Изменение применяется, когда версия не менялась между двумя проверками"""
+        watcher = make_watcher(tmp_path)
+        watcher._get_stable_changes({"a": "v1", "b": "v1"})
+
+        assert watcher._get_stable_changes({"a": "v2", "b": "v1"}) == []
+        assert watcher._get_stable_changes({"a": "v2", "b": "v1"}) == ["a"]
+        # Применённое изменение не повторяется
+        assert watcher._get_stable_changes({"a": "v2", "b": "v1"}) == []
+
+    def test_change_in_progress_is_postponed(self, tmp_path):
+        """Изменение, продолжающееся между проверками, откладывается до его завершения"""
+        watcher = make_watcher(tmp_path)
+        watcher._get_stable_changes({"a": "v1"})
+
+        assert watcher._get_stable_changes({"a": "v2"}) == []
+        assert watcher._get_stable_changes({"a": "v3"}) == []
+        assert watcher._get_stable_changes({"a": "v3"}) == ["a"]
+
+    def test_reverted_change_is_ignored(self, tmp_path):
+        """Веса, вернувшиеся к прежней версии до завершения проверки, не считаются изменёнными"""
+        watcher = make_watcher(tmp_path)
+        watcher._get_stable_changes({"a": "v1"})
+
+        assert watcher._get_stable_changes({"a": "v2"}) == []
+        assert watcher._get_stable_changes({"a": "v1"}) == []
+        assert watcher._get_stable_changes({"a": "v1"}) == []
+
+    def test_new_model_is_not_reloaded(self, tmp_path):
+        """Новая модель запоминается без загрузки: её загрузит первый запрос"""
+        watcher = make_watcher(tmp_path)
+        watcher._get_stable_changes({"a": "v1"})
+
+        assert watcher._get_stable_changes({"a": "v1", "b": "v1"}) == []
+        assert watcher._get_stable_changes({"a": "v1", "b": "v1"}) == []
+        assert watcher._versions == {"a": "v1", "b": "v1"}
+        assert watcher._get_stable_changes({"a": "v1", "b": "v2"}) == []
+        assert watcher._get_stable_changes({"a": "v1", "b": "v2"}) == ["b"]
+
+    def test_deleted_weights_evicted(self, tmp_path):
+        """Модель с удалёнными весами удаляется из кеша"""
+        watcher = make_watcher(tmp_path)
+        watcher._get_stable_changes({"a": "v1", "b": "v1"})
+        watcher._get_stable_changes({"a": "v1", "b": "v2"})
+
+        assert watcher._get_stable_changes({"a": "v1"}) == []
+        assert watcher.model_cache.evicted == ["b"]
+        assert watcher._pending == {}
+        # Повторно сохранённая модель считается новой
+        assert watcher._get_stable_changes({"a": "v1", "b": "v3"}) == []
+        assert watcher._get_stable_changes({"a": "v1", "b": "v3"}) == []
+
+    def test_scan_weights(self, tmp_path):
+        """Версии определяются для каталогов весов, служебные файлы и каталоги пропускаются"""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "model.json").write_text("{}")
+        (tmp_path / ".tmp").mkdir()
+        (tmp_path / ".watcher.lock").write_text("")
+        watcher = make_watcher(tmp_path)
+
+        versions = watcher._scan_weights()
+        assert list(versions) == ["a"]
+
+        (tmp_path / "a" / "model.json").write_text('{"nodes": []}')
+        assert watcher._scan_weights()["a"] != versions["a"]
+        assert make_watcher(tmp_path / "missing")._scan_weights() == {}
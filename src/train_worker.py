@@ -0,0 +1,421 @@
+"""
+Обработчик очереди задач обучения моделей.
+
+Обработчик забирает задачи из очереди в базе данных, обучает модель в отдельном процессе, периодически
+подтверждая выполнение задачи и обновляя сообщение о ходе обучения, и регистрирует обученную модель
+в каталоге ML моделей. Обработчики можно запускать одновременно на нескольких машинах с общей базой данных.
+
+Задача, обработчик которой завершился аварийно, возвращается в очередь после истечения срока аренды.
+Если модель прерванной задачи уже была сохранена, то повторный запуск только регистрирует её без обучения.
+Обработчик, потерявший аренду задачи, прерывает её обучение.
+
+Запуск:
+    python -m src.train_worker run --workers 2
+    python -m src.train_worker enqueue boston-housing --timeout 5
+"""
+
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import os
+import socket
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from pathlib import Path
+from queue import Empty
+from typing import Any
+
+from sqlalchemy import select
+
+from . import dependencies
+from .config import config_manager
+from .core.logger import LoggerFactory
+from .database.models import Dataset, MLModel, TrainJob
+from .database.repository import ModelRepository
+from .database.train_queue import TrainJobQueue
+from .utils import read_yaml
+
+WORKER_LOGGER = LoggerFactory.get_logger("TrainWorker")
+
+_progress_queue: Queue | None = None
+""" Очередь сообщений о ходе обучения (задаётся в процессе обучения) """
+
+
+class TrainJobLeaseLost(RuntimeError):
+    """Аренда задачи обучения потеряна: задача передана другому обработчику"""
+
+
+def _report_progress(generation: int, best_metric: float) -> None:
+    """Передача хода поиска решения из процесса обучения в обработчик"""
+    if _progress_queue is not None:
+        _progress_queue.put((generation, best_metric))
+
+
+def _train_job(
+    progress_queue: Queue,
+    result_connection: Connection,
+    data_root: str,
+    save_dir: str,
+    save_name: str,
+    params: dict,
+) -> None:
+    """Обучение модели в процессе обучения с передачей результата или исключения в обработчик"""
+    global _progress_queue
+    _progress_queue = progress_queue
+    try:
+        # Импорт выполняется внутри процесса обучения, чтобы не загружать FEDOT в основной процесс
+        from .core.train import train_from_data_root
+
+        result = train_from_data_root(
+            data_root=data_root,
+            save_dir=save_dir,
+            save_name=save_name,
+            progress_callback=_report_progress,
+            **params,
+        )
+    except Exception as e:
+        try:
+            result_connection.send((False, e))
+        except Exception:
+            # Исключение не сериализуется - передадим его описание
+            result_connection.send((False, RuntimeError(f"({type(e).__name__}) {e}")))
+    else:
+        result_connection.send((True, result))
+    finally:
+        result_connection.close()
+
+
+def _receive_result(result_connection: Connection, process: BaseProcess) -> dict:
+    """Ожидание результата обучения (выполняется в отдельном потоке)"""
+    try:
+        success, result = result_connection.recv()
+    except EOFError:
+        # Процесс завершился, не передав результат (например, из-за нехватки памяти или принудительно)
+        process.join()
+        raise RuntimeError(
+            f"Training process exited unexpectedly with code {process.exitcode}"
+        )
+    finally:
+        result_connection.close()
+    process.join()
+    if not success:
+        raise result
+    return result
+
+
+class TrainWorker:
+    """Обработчик очереди задач обучения"""
+
+    def __init__(self, worker_id: str | None = None) -> None:
+        """
+        Args:
+            worker_id (str, optional): Идентификатор обработчика. По умолчанию формируется из имени хоста
+                и идентификатора процесса
+        """
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.session_builder = dependencies.get_database_session_builder()
+        self.train_config = config_manager.train_config
+        self.storage_config = config_manager.storage_config
+        # Каждая задача обучается в отдельном процессе: основной процесс продолжает подтверждать выполнение
+        # задачи, а аварийное завершение обучения (например, из-за нехватки памяти) не завершает обработчик
+        self.context = multiprocessing.get_context("spawn")
+        self.train_process: BaseProcess | None = None
+
+    def _terminate_training(self) -> None:
+        """Принудительное завершение процесса обучения"""
+        process = self.train_process
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join()
+
+    @staticmethod
+    def _read_progress(progress_queue: Queue) -> tuple[int, float] | None:
+        """Получение последнего сообщения о ходе поиска решения из процесса обучения"""
+        progress = None
+        while True:
+            try:
+                progress = progress_queue.get_nowait()
+            except Empty:
+                return progress
+
+    async def run(self, once: bool = False) -> None:
+        """
+        Обработка задач из очереди
+
+        Args:
+            once (bool): Завершить работу, когда очередь опустеет
+        """
+        WORKER_LOGGER.info(f"Train worker {self.worker_id} started")
+        try:
+            while True:
+                job = await self.claim_job()
+                if job is None:
+                    if once:
+                        break
+                    await asyncio.sleep(self.train_config.job_poll_interval)
+                    continue
+                await self.process_job(job)
+        finally:
+            await self.session_builder.dispose()
+        WORKER_LOGGER.info(f"Train worker {self.worker_id} stopped")
+
+    async def claim_job(self) -> tuple[TrainJob, Dataset] | None:
+        """Возврат в очередь прерванных задач и получение следующей задачи вместе с набором данных"""
+        async with self.session_builder.get_async_session() as session:
+            queue = TrainJobQueue(session)
+            requeued = await queue.requeue_stale(self.train_config.job_lease)
+            if requeued:
+                WORKER_LOGGER.warning(f"Requeued {requeued} stale train jobs")
+            job = await queue.claim(self.worker_id)
+            if job is None:
+                return None
+            dataset = await session.get(Dataset, job.dataset_id)
+            if dataset is None:
+                # Набор данных удаляется вместе с задачами, но мог быть удалён после выбора задачи
+                await queue.fail(job.id, self.worker_id, "Dataset not found")
+                return None
+            if job.model_name is None:
+                # Название модели сохраняется при первом запуске и не меняется при перезапусках задачи
+                job.model_name = (
+                    f"{dataset.name}_{datetime.datetime.now():%Y-%m-%d_%H-%M-%S}"
+                    f"_job{job.id}"
+                )
+                await session.commit()
+                await session.refresh(job)
+                await session.refresh(dataset)
+            return job, dataset
+
+    async def process_job(self, claimed: tuple[TrainJob, Dataset]) -> None:
+        """Выполнение задачи обучения и регистрация обученной модели"""
+        job, dataset = claimed
+        model_name: str = job.model_name  # type: ignore
+        save_model_path = Path(self.storage_config.weights_root, model_name)
+        WORKER_LOGGER.info(
+            f"Start train job {job.id} on dataset '{dataset.name}' (attempt {job.attempts})"
+        )
+        try:
+            if job.attempts > 1 and Path(save_model_path, "metrics.yaml").exists():
+                # Модель сохранена предыдущим запуском, прерванным до регистрации
+                result = {
+                    "metrics": read_yaml(Path(save_model_path, "metrics.yaml")),
+                    "save": True,
+                    "mode": "resumed",
+                }
+                train_info_path = Path(save_model_path, "train_info.yaml")
+                if train_info_path.exists():
+                    result["train_time"] = read_yaml(train_info_path)["train_time"]
+            else:
+                result = await self._train_with_heartbeat(job, dataset, model_name)
+            await self._register_model(job, dataset, model_name, result)
+        except TrainJobLeaseLost:
+            # Задача уже выполняется другим обработчиком - её состояние не изменяется
+            WORKER_LOGGER.warning(
+                f"Train job {job.id} lease was lost, training was stopped"
+            )
+        except Exception as e:
+            WORKER_LOGGER.error(f"Train job {job.id} failed: ({type(e).__name__}) {e}")
+            async with self.session_builder.get_async_session() as session:
+                await TrainJobQueue(session).fail(
+                    job.id, self.worker_id, f"({type(e).__name__}) {e}"
+                )
+
+    async def _train_with_heartbeat(
+        self, job: TrainJob, dataset: Dataset, model_name: str
+    ) -> dict[str, Any]:
+        """
+        Обучение модели с периодическим подтверждением выполнения задачи
+
+        Raises:
+            TrainJobLeaseLost: Если аренда задачи потеряна. Процесс обучения при этом завершается, чтобы не
+                сохранять модель одновременно с обработчиком, получившим задачу
+        """
+        # Очередь создаётся для каждой задачи: завершение процесса во время записи в очередь может её повредить
+        progress_queue = self.context.Queue()
+        result_connection, process_connection = self.context.Pipe(duplex=False)
+        self.train_process = self.context.Process(
+            target=_train_job,
+            args=(
+                progress_queue,
+                process_connection,
+                str(Path(self.storage_config.datasets_root, dataset.name)),
+                self.storage_config.weights_root,
+                model_name,
+                job.params,
+            ),
+            name=f"train-job-{job.id}",
+        )
+        self.train_process.start()
+        # Соединение процесса закрывается в обработчике, чтобы завершение процесса прерывало ожидание результата
+        process_connection.close()
+        future = asyncio.get_running_loop().run_in_executor(
+            None, _receive_result, result_connection, self.train_process
+        )
+        try:
+            started = time.monotonic()
+            timeout = job.params.get("timeout", 5)
+            search_progress = ""
+            while True:
+                done, _ = await asyncio.wait(
+                    {future}, timeout=self.train_config.job_heartbeat_interval
+                )
+                if done:
+                    return future.result()
+                elapsed = (time.monotonic() - started) / 60
+                last_progress = self._read_progress(progress_queue)
+                if last_progress is not None:
+                    generation, best_metric = last_progress
+                    search_progress = (
+                        f", generation {generation}, best metric {best_metric:.4f}"
+                    )
+                async with self.session_builder.get_async_session() as session:
+                    owned = await TrainJobQueue(session).heartbeat(
+                        job.id,
+                        self.worker_id,
+                        progress=f"Training: {elapsed:.1f} of {timeout} min{search_progress}",
+                    )
+                if not owned:
+                    self._terminate_training()
+                    # Ожидание результата прерывается завершением процесса
+                    await asyncio.wait({future})
+                    future.exception()
+                    raise TrainJobLeaseLost(f"Train job {job.id} lease was lost")
+        finally:
+            self._terminate_training()
+            self.train_process = None
+            progress_queue.close()
+
+    async def _register_model(
+        self,
+        job: TrainJob,
+        dataset: Dataset,
+        model_name: str,
+        result: dict[str, Any],
+    ) -> None:
+        """Регистрация обученной модели в каталоге и завершение задачи в одной транзакции"""
+        async with self.session_builder.get_async_session() as session:
+            mlmodel_repo = ModelRepository(model=MLModel, session=session)
+            await mlmodel_repo.upsert(
+                [
+                    {
+                        "name": model_name,
+                        "title": job.title,
+                        "description": job.description,
+                        "dataset_id": dataset.id,
+                        "trained_at": datetime.datetime.now(),
+                    }
+                ],
+                conflict_columns=["name"],
+                auto_commit=False,
+            )
+            mlmodel_id = await session.scalar(
+                select(MLModel.id).where(MLModel.name == model_name)
+            )
+            accepted = await TrainJobQueue(session).complete(
+                job.id, self.worker_id, result=result, mlmodel_id=mlmodel_id
+            )
+        if accepted:
+            WORKER_LOGGER.info(
+                f"Finish train job {job.id}: model '{model_name}' registered "
+                f"with metrics {result.get('metrics')}"
+            )
+        else:
+            WORKER_LOGGER.warning(
+                f"Train job {job.id} result was discarded: the job is no longer owned by worker"
+            )
+
+
+def run_worker(once: bool = False) -> None:
+    """Запуск обработчика очереди в текущем процессе"""
+    asyncio.run(TrainWorker().run(once=once))
+
+
+async def enqueue_job(dataset_name: str, params: dict[str, Any], title: str) -> int:
+    """Постановка задачи обучения в очередь по названию набора данных"""
+    session_builder = dependencies.get_database_session_builder()
+    try:
+        async with session_builder.get_async_session() as session:
+            dataset = await session.scalar(
+                select(Dataset).where(Dataset.name == dataset_name)
+            )
+            if dataset is None:
+                raise ValueError(f"No found Dataset with name '{dataset_name}'")
+            job = await TrainJobQueue(session).enqueue(
+                dataset_id=dataset.id,
+                params=params,
+                title=title,
+                max_attempts=config_manager.train_config.job_max_attempts,
+            )
+            return job.id
+    finally:
+        await session_builder.dispose()
+
+
+def parse_opt():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="process train jobs from the queue")
+    run_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="number of worker processes",
+        default=1,
+    )
+    run_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="stop when the queue is empty",
+    )
+
+    enqueue_parser = subparsers.add_parser(
+        "enqueue", help="add a train job to the queue"
+    )
+    enqueue_parser.add_argument("dataset_name", type=str, help="Dataset system name")
+    enqueue_parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        help="The maximum allowed time (in minutes) to find the optimal solution",
+        default=5,
+    )
+    enqueue_parser.add_argument(
+        "-p",
+        "--preset",
+        dest="composition_preset",
+        type=str,
+        help="The model selection parameter for selecting a solution (see src.core.train)",
+        default=None,
+    )
+    enqueue_parser.add_argument(
+        "--title", type=str, help="human-readable model title", default="Untitled"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    opt = parse_opt()
+
+    if opt.command == "enqueue":
+        params = {"timeout": opt.timeout}
+        if opt.composition_preset is not None:
+            params["composition_preset"] = opt.composition_preset
+        job_id = asyncio.run(enqueue_job(opt.dataset_name, params, title=opt.title))
+        WORKER_LOGGER.info(f"Train job {job_id} enqueued")
+    elif opt.workers <= 1:
+        run_worker(once=opt.once)
+    else:
+        # Каждый процесс - независимый обработчик со своим подключением к базе данных
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=run_worker, kwargs={"once": opt.once})
+            for _ in range(opt.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()